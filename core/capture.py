@@ -0,0 +1,105 @@
+import sys
+import time
+import pathlib
+import cProfile
+import threading
+from collections import Counter
+from typing import Callable, List, Optional
+
+
+DEFAULT_NUM_FRAMES: int = 60
+
+# seconds between two stack samples
+SAMPLE_INTERVAL: float = 0.001
+
+
+def get_frame_name(frame) -> str:
+    """Returns a function's name as used in collapsed stacks, which must not contain semicolons."""
+    code = frame.f_code
+    filename = pathlib.Path(code.co_filename).name
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class FrameCapture:
+    """Profiles a number of frames on request. Nothing is profiled before.
+
+    While active, cProfile profiles the calling thread and a background thread samples its stack. Each sample is
+    prefixed with the engine's current phase, given by get_phase. After the last frame the results are written as
+    a pstats file and as a collapsed stack file, which can be turned into a flamegraph.
+    """
+
+    def __init__(self, get_phase: Callable[[], str], output_dir: pathlib.Path,
+                 sample_interval: float = SAMPLE_INTERVAL):
+        self.get_phase = get_phase
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+
+        self.pending = 0
+        self.remaining = 0
+        self.active = False
+        self.last_files: List[pathlib.Path] = list()
+
+        self.profile: Optional[cProfile.Profile] = None
+        self.samples: Counter = Counter()
+        self.thread_id = 0
+        self.sampler: Optional[threading.Thread] = None
+        self.stop_sampling = threading.Event()
+
+    def request(self, num_frames: int = DEFAULT_NUM_FRAMES) -> None:
+        """Starts capturing with the next frame, unless a capture is already running."""
+        if not self.active:
+            self.pending = num_frames
+
+    def begin(self) -> None:
+        """Starts profiling the calling thread."""
+        self.remaining = self.pending
+        self.pending = 0
+        self.active = True
+
+        self.samples.clear()
+        self.thread_id = threading.get_ident()
+        self.stop_sampling.clear()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def end_frame(self) -> None:
+        """Counts a captured frame and finishes the capture after the last one."""
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.finish()
+
+    def finish(self) -> None:
+        """Stops profiling and writes the results."""
+        self.profile.disable()
+        self.stop_sampling.set()
+        self.sampler.join()
+        self.active = False
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        basename = time.strftime('capture_%Y%m%d_%H%M%S')
+        pstats_path = self.output_dir / f'{basename}.pstats'
+        collapsed_path = self.output_dir / f'{basename}.collapsed'
+
+        self.profile.dump_stats(pstats_path)
+        with open(collapsed_path, 'w') as file:
+            for stack, count in sorted(self.samples.items()):
+                file.write(f'{stack} {count}\n')
+
+        self.profile = None
+        self.last_files = [pstats_path, collapsed_path]
+
+    def sample(self) -> None:
+        """Runs in the background and counts the profiled thread's stacks."""
+        while not self.stop_sampling.wait(self.sample_interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = list()
+            while frame is not None:
+                names.append(get_frame_name(frame))
+                frame = frame.f_back
+
+            names.append(self.get_phase())
+            names.reverse()
+            self.samples[';'.join(names)] += 1
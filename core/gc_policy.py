@@ -0,0 +1,98 @@
+import gc
+from typing import List, Optional, Tuple
+
+from core import profiler
+
+
+# thresholds while frames are running: the young generations are collected as usual, the oldest generation is left
+# to collect_idle()
+FRAME_THRESHOLDS: Tuple[int, int, int] = (700, 10, 1_000_000)
+
+# number of gen-1 collections after which the oldest generation is collected in idle time
+IDLE_COLLECT_COUNT: int = 10
+
+# number of gen-1 collections after which the oldest generation is collected even without idle time
+FORCE_COLLECT_COUNT: int = 100
+
+# minimum idle time in ms left in a frame for collecting the oldest generation
+MIN_IDLE_MS: float = 4.0
+
+
+class GcPolicy:
+    """Keeps full garbage collections out of the frames.
+
+    Objects which are alive after loading (levels, caches, sprite sheets) are frozen, so collections do not traverse
+    them again. While frames are running, the oldest generation is not collected automatically but only in the idle
+    time left before the frame rate limiter sleeps. All collections are reported as pauses.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.monitor = profiler.GcMonitor()
+        self.old_thresholds: Optional[Tuple[int, int, int]] = None
+
+        self.num_collections = [0, 0, 0]
+        self.max_pause_ms = 0.0
+
+    def freeze(self) -> None:
+        """Collects and freezes all objects which are alive. Called after loading."""
+        if not self.enabled:
+            return
+
+        gc.collect()
+        gc.freeze()
+
+    def unfreeze(self) -> None:
+        """Makes frozen objects collectable again, e.g. after the last state was left."""
+        if not self.enabled:
+            return
+
+        gc.unfreeze()
+
+    def refreeze(self) -> None:
+        """Makes frozen objects collectable, then freezes those which are still alive. Called after a state was left
+        while others remain, so only the left state's objects are released.
+        """
+        if not self.enabled:
+            return
+
+        gc.unfreeze()
+        self.freeze()
+
+    def begin(self) -> None:
+        """Applies the frame thresholds and starts reporting collections."""
+        if not self.enabled or self.old_thresholds is not None:
+            return
+
+        self.old_thresholds = gc.get_threshold()
+        gc.set_threshold(*FRAME_THRESHOLDS)
+        self.monitor.install()
+
+    def end(self) -> None:
+        """Restores the previous thresholds."""
+        if self.old_thresholds is None:
+            return
+
+        gc.set_threshold(*self.old_thresholds)
+        self.old_thresholds = None
+        self.monitor.uninstall()
+
+    def collect_idle(self, idle_ms: float) -> None:
+        """Collects the oldest generation if enough gen-1 collections happened and the idle time suffices, or if it
+        was skipped for too long.
+        """
+        if self.old_thresholds is None:
+            return
+
+        pending = gc.get_count()[2]
+        if (pending >= IDLE_COLLECT_COUNT and idle_ms >= MIN_IDLE_MS) or pending >= FORCE_COLLECT_COUNT:
+            gc.collect(2)
+
+    def pop_pauses(self) -> List[Tuple[int, float, int]]:
+        """Returns the collections since the last call as tuples of generation, pause in ms and collected objects."""
+        collections = self.monitor.pop_collections()
+        for generation, duration_ms, _ in collections:
+            self.num_collections[generation] += 1
+            self.max_pause_ms = max(self.max_pause_ms, duration_ms)
+
+        return collections
@@ -7,8 +7,10 @@ Based on
     URL: https://stackoverflow.com/questions/61396799/how-can-i-blit-my-pygame-game-onto-an-opengl-surface
 """
 
+import ctypes
+import numpy
 import pygame
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import imgui
 from imgui.integrations.pygame import PygameRenderer
@@ -16,6 +18,22 @@ from imgui.integrations.pygame import PygameRenderer
 import OpenGL.GL
 
 
+def get_pixel_format(source: pygame.Surface) -> Optional[int]:
+    """Returns the OpenGL format which matches the surface's 32 bit pixels if they are packed as
+    GL_UNSIGNED_INT_8_8_8_8_REV. Returns None if the surface has to be converted before uploading.
+    """
+    if source.get_bytesize() != 4:
+        return None
+
+    masks = source.get_masks()[:3]
+    if masks == (0xff0000, 0x00ff00, 0x0000ff):
+        return OpenGL.GL.GL_BGRA
+    if masks == (0x0000ff, 0x00ff00, 0xff0000):
+        return OpenGL.GL.GL_RGBA
+
+    return None
+
+
 class OpenGlWrapper(object):
     """This wraps to blit onto a pygame.Surface and rendering ImGui onto an OpenGL screen into a single thing.
 
@@ -28,15 +46,32 @@ class OpenGlWrapper(object):
     (6) Render everything onto the OpenGL screen using `render()`
 
     The internal rendering order is: buffer first, imgui second.
+
+    The texture is allocated once per buffer size and updated in place from the surface's pixels. With `use_pbo`
+    the pixels are streamed through two pixel buffer objects, so the texture shows the previous frame's buffer while
+    the current one is transferred. If no further frame is uploaded, `flush_pending()` updates the texture from the
+    last one. Otherwise the upload can be limited to the areas which changed since the last
+    frame.
     """
 
-    def __init__(self, ini_file: Optional[str] = None, log_file: Optional[str] = None):
-        """Initialize OpenGL and ImGui.
+    def __init__(self, ini_file: Optional[str] = None, log_file: Optional[str] = None, use_pbo: bool = False,
+                 init_gl: bool = True):
+        """Initialize OpenGL and ImGui. Without init_gl, no texture, buffers or ImGui context are created, e.g. for
+        tests with a mocked OpenGL.
         """
         self.tex_id = None
+        self.tex_size: Optional[Tuple[int, int]] = None
+        self.use_pbo = use_pbo
+        self.pbo_ids = None
+        self.pbo_index = 0
+        self.pbo_ready = False
+        self.pbo_layout: Optional[Tuple[int, int]] = None
         self.impl = None
         self.io = None
 
+        if not init_gl:
+            return
+
         self.post_init()
 
         self.io.ini_file_name = ini_file
@@ -60,6 +95,17 @@ class OpenGlWrapper(object):
         OpenGL.GL.glHint(OpenGL.GL.GL_PERSPECTIVE_CORRECTION_HINT, OpenGL.GL.GL_NICEST)
         OpenGL.GL.glEnable(OpenGL.GL.GL_BLEND)
         self.tex_id = OpenGL.GL.glGenTextures(1)
+        OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, self.tex_id)
+        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_MAG_FILTER, OpenGL.GL.GL_NEAREST)
+        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_MIN_FILTER, OpenGL.GL.GL_NEAREST)
+        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_WRAP_S, OpenGL.GL.GL_CLAMP)
+        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_WRAP_T, OpenGL.GL.GL_CLAMP)
+        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_MAX_LEVEL, 0)
+        OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, 0)
+        self.tex_size = None
+
+        if self.use_pbo:
+            self.pbo_ids = OpenGL.GL.glGenBuffers(2)
 
         # setup ImGui stuff
         imgui.create_context()
@@ -79,21 +125,124 @@ class OpenGlWrapper(object):
         """
         self.impl.process_event(event)
 
-    def render(self, source: pygame.Surface) -> None:
-        """Transforms the given surface into a texture, renders it and draws ImGui widgets on top.
+    def allocate(self, source: pygame.Surface) -> None:
+        """(Re)allocates the texture and the pixel buffer objects for the source's size.
         """
-        # upload buffer to texture
-        rgb_surface = pygame.image.tostring(source, 'RGB')
+        width, height = source.get_size()
         OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, self.tex_id)
-        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_MAG_FILTER, OpenGL.GL.GL_NEAREST)
-        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_MIN_FILTER, OpenGL.GL.GL_NEAREST)
-        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_WRAP_S, OpenGL.GL.GL_CLAMP)
-        OpenGL.GL.glTexParameteri(OpenGL.GL.GL_TEXTURE_2D, OpenGL.GL.GL_TEXTURE_WRAP_T, OpenGL.GL.GL_CLAMP)
-        OpenGL.GL.glTexImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, OpenGL.GL.GL_RGB, *source.get_size(), 0,
-                               OpenGL.GL.GL_RGB, OpenGL.GL.GL_UNSIGNED_BYTE, rgb_surface)
-        OpenGL.GL.glGenerateMipmap(OpenGL.GL.GL_TEXTURE_2D)
+        OpenGL.GL.glTexImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, OpenGL.GL.GL_RGB8, width, height, 0,
+                               OpenGL.GL.GL_BGRA, OpenGL.GL.GL_UNSIGNED_INT_8_8_8_8_REV, None)
+        OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, 0)
+        self.tex_size = (width, height)
+
+        if self.pbo_ids is not None:
+            for pbo_id in self.pbo_ids:
+                OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, pbo_id)
+                OpenGL.GL.glBufferData(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, source.get_pitch() * height, None,
+                                       OpenGL.GL.GL_STREAM_DRAW)
+            OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, 0)
+            self.pbo_ready = False
+
+    def stream(self, pixels: numpy.ndarray, pixel_format: int, row_length: int) -> None:
+        """Updates the bound texture from the pixel buffer written during the previous call, then writes the given
+        pixels into the other one.
+        """
+        upload_id = self.pbo_ids[self.pbo_index]
+        write_id = self.pbo_ids[1 - self.pbo_index]
+
+        if self.pbo_ready:
+            OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, upload_id)
+            OpenGL.GL.glTexSubImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, 0, 0, *self.tex_size, pixel_format,
+                                      OpenGL.GL.GL_UNSIGNED_INT_8_8_8_8_REV, ctypes.c_void_p(0))
+
+        OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, write_id)
+        # orphan the old storage, so mapping does not wait for a pending transfer
+        OpenGL.GL.glBufferData(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, pixels.nbytes, None, OpenGL.GL.GL_STREAM_DRAW)
+        address = OpenGL.GL.glMapBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, OpenGL.GL.GL_WRITE_ONLY)
+        if address:
+            ctypes.memmove(address, pixels.ctypes.data, pixels.nbytes)
+        OpenGL.GL.glUnmapBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER)
+        OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, 0)
+
+        self.pbo_index = 1 - self.pbo_index
+        self.pbo_ready = True
+        self.pbo_layout = (pixel_format, row_length)
+
+    def flush_pending(self) -> None:
+        """Updates the texture from the last written pixel buffer, if it was not uploaded yet. This is required if no
+        further frame is streamed, e.g. while the buffer is not redrawn.
+        """
+        if not self.pbo_ready:
+            return
+
+        pixel_format, row_length = self.pbo_layout
+        OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, self.tex_id)
+        OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ROW_LENGTH, row_length)
+        OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ALIGNMENT, 4)
+        OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, self.pbo_ids[self.pbo_index])
+        OpenGL.GL.glTexSubImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, 0, 0, *self.tex_size, pixel_format,
+                                  OpenGL.GL.GL_UNSIGNED_INT_8_8_8_8_REV, ctypes.c_void_p(0))
+        OpenGL.GL.glBindBuffer(OpenGL.GL.GL_PIXEL_UNPACK_BUFFER, 0)
+        OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ROW_LENGTH, 0)
+        OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, 0)
+        self.pbo_ready = False
+
+    @staticmethod
+    def upload_rects(pixels: numpy.ndarray, pixel_format: int, rects: List[pygame.Rect]) -> None:
+        """Updates the given areas of the bound texture. The row length needs to be set already.
+        """
+        for rect in rects:
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_SKIP_PIXELS, rect.x)
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_SKIP_ROWS, rect.y)
+            OpenGL.GL.glTexSubImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, rect.x, rect.y, rect.width, rect.height,
+                                      pixel_format, OpenGL.GL.GL_UNSIGNED_INT_8_8_8_8_REV, pixels)
+
+        OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_SKIP_PIXELS, 0)
+        OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_SKIP_ROWS, 0)
+
+    def upload(self, source: pygame.Surface, rects: Optional[List[pygame.Rect]] = None) -> None:
+        """Updates the texture from the given surface. 32 bit surfaces are read directly from their pixel buffer.
+        If rects are given, only these areas are updated, unless the whole texture needs to be written anyway.
+        """
+        # a new texture is written directly, so it does not wait for the next frame to be streamed
+        allocated = source.get_size() != self.tex_size
+        if allocated:
+            self.allocate(source)
+            rects = None
+
+        width, height = self.tex_size
+        pixel_format = get_pixel_format(source)
+        OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, self.tex_id)
+
+        if pixel_format is None:
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ROW_LENGTH, 0)
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ALIGNMENT, 1)
+            rgb_surface = pygame.image.tostring(source, 'RGB')
+            OpenGL.GL.glTexSubImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, 0, 0, width, height, OpenGL.GL.GL_RGB,
+                                      OpenGL.GL.GL_UNSIGNED_BYTE, rgb_surface)
+
+        else:
+            row_length = source.get_pitch() // 4
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ROW_LENGTH, row_length)
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ALIGNMENT, 4)
+            # view onto the surface's pixels, the surface stays locked while it exists
+            pixels = numpy.frombuffer(source.get_buffer(), dtype=numpy.uint8)
+            if self.pbo_ids is not None and not allocated:
+                # the pixel buffers always hold whole frames
+                self.stream(pixels, pixel_format, row_length)
+            elif rects is not None:
+                self.upload_rects(pixels, pixel_format, rects)
+            else:
+                OpenGL.GL.glTexSubImage2D(OpenGL.GL.GL_TEXTURE_2D, 0, 0, 0, width, height, pixel_format,
+                                          OpenGL.GL.GL_UNSIGNED_INT_8_8_8_8_REV, pixels)
+            del pixels
+            OpenGL.GL.glPixelStorei(OpenGL.GL.GL_UNPACK_ROW_LENGTH, 0)
+
         OpenGL.GL.glBindTexture(OpenGL.GL.GL_TEXTURE_2D, 0)
 
+    def present(self) -> None:
+        """Draws the texture onto the OpenGL screen and renders ImGui widgets on top.
+        """
         # clear OpenGL screen
         OpenGL.GL.glClear(OpenGL.GL.GL_COLOR_BUFFER_BIT)
         OpenGL.GL.glLoadIdentity()
@@ -117,6 +266,12 @@ class OpenGlWrapper(object):
         imgui.render()
         self.impl.render(imgui.get_draw_data())
 
+    def render(self, source: pygame.Surface) -> None:
+        """Uploads the given surface to the texture, renders it and draws ImGui widgets on top.
+        """
+        self.upload(source)
+        self.present()
+
 
 if __name__ == "__main__":
     float_val = 0.4
@@ -1,4 +1,4 @@
-from typing import TypeVar, Optional, List
+from typing import TypeVar, Optional, List, Iterable, Set
 
 
 def object_id_generator():
@@ -11,6 +11,27 @@ def object_id_generator():
 T = TypeVar('T')
 
 
+def remove_instances(elements: List[T], instances: Iterable[T]) -> List[T]:
+    """Removes all given instances from the list in place using a single compaction pass. Elements are compared by
+    identity, the order of the remaining elements is kept.
+    Returns the elements which were actually removed.
+    """
+    doomed = {id(instance) for instance in instances}
+    if len(doomed) == 0:
+        return list()
+
+    kept: List[T] = list()
+    removed: List[T] = list()
+    for element in elements:
+        if id(element) in doomed:
+            removed.append(element)
+        else:
+            kept.append(element)
+
+    elements[:] = kept
+    return removed
+
+
 class IdList(List[T]):
     """List of T elements, who are supposed to have a field `object_id: int` each."""
     def get_by_id(self, object_id: int) -> Optional[T]:
@@ -20,3 +41,10 @@ class IdList(List[T]):
             return next(iterator)
         except StopIteration:
             return None
+
+    def remove_by_ids(self, object_ids: Set[int]) -> None:
+        """Removes all elements with one of the given object_ids in place using a single compaction pass."""
+        if len(object_ids) == 0:
+            return
+
+        self[:] = [obj for obj in self if obj.object_id not in object_ids]
@@ -0,0 +1,172 @@
+import numpy
+import pygame
+import imgui
+from typing import Callable, Dict, List, Optional
+
+from core import gc_policy, profiler, resources
+
+
+# about five seconds at 30 FPS
+HISTORY_SIZE: int = 150
+
+TOGGLE_KEY: int = pygame.K_F3
+
+# not part of the frame's work time: the frame limiter, and collector pauses which are already contained in other
+# sections or happen while waiting for the next frame
+EXCLUDED_SECTIONS = ('tick', 'gc')
+
+GRAPH_SIZE = (300, 40)
+SECTION_GRAPH_SIZE = (300, 20)
+
+
+class History:
+    """Ring buffer of the latest values, e.g. one per frame."""
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.values = numpy.zeros(size, dtype=numpy.float32)
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        self.values[self.count % self.values.shape[0]] = value
+        self.count += 1
+
+    def get(self) -> numpy.ndarray:
+        """Returns the values from oldest to latest."""
+        size = self.values.shape[0]
+        if self.count <= size:
+            return self.values[:self.count]
+
+        oldest = self.count % size
+        return numpy.concatenate((self.values[oldest:], self.values[:oldest]))
+
+    def latest(self) -> float:
+        if self.count == 0:
+            return 0.0
+
+        return float(self.values[(self.count - 1) % self.values.shape[0]])
+
+
+def get_work_time(frame_profiler: profiler.Profiler) -> float:
+    """Returns the time in ms the last recorded frame spent on actual work, i.e. its top level sections without the
+    excluded ones. Nested sections are already contained in their parents.
+    """
+    frames = frame_profiler.get_frames()
+    if frames.shape[0] == 0:
+        return 0.0
+
+    return float(sum(frames[-1, column] for name, column in frame_profiler.columns.items()
+                     if '.' not in name and name not in EXCLUDED_SECTIONS))
+
+
+def get_section_time(frame_profiler: profiler.Profiler, name: str) -> float:
+    """Returns the time in ms of the named section during the last recorded frame."""
+    times = frame_profiler.get_times(name)
+    if times.shape[0] == 0:
+        return 0.0
+
+    return float(times[-1])
+
+
+class PerfOverlay:
+    """ImGui window with graphs of the frame time, the profiled sections, entity counts, cache sizes and garbage
+    collector runs over the last frames. It is toggled with F3.
+
+    The profiler is only enabled while the overlay is visible. The frame graph shows the work time of the previous
+    frame, without waiting for the frame limiter. The graphs start empty whenever the overlay is shown. Garbage
+    collections are taken from the engine's GC policy and the profiler's 'gc' section.
+    """
+
+    def __init__(self, frame_profiler: profiler.Profiler, policy: gc_policy.GcPolicy,
+                 cache: Optional[resources.Cache], get_entity_counts: Callable[[], Dict[str, int]]):
+        self.profiler = frame_profiler
+        self.gc_policy = policy
+        self.cache = cache
+        self.get_entity_counts = get_entity_counts
+
+        self.visible = False
+        self.profiler_was_enabled = frame_profiler.enabled
+        # profiler frame which was recorded first since the overlay was shown
+        self.first_frame = 0
+        # the policy's collections per generation when the overlay was shown
+        self.first_collections = list(policy.num_collections)
+
+        self.frame_times = History()
+        self.gc_times = History()
+        self.entity_counts: Dict[str, History] = dict()
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+
+        if self.visible:
+            self.reset()
+            self.profiler_was_enabled = self.profiler.enabled
+            self.profiler.enabled = True
+        else:
+            self.profiler.enabled = self.profiler_was_enabled
+
+    def reset(self) -> None:
+        """Drops the recorded values. The profiler's older frames are kept, but not shown anymore."""
+        self.first_frame = self.profiler.num_frames
+        self.first_collections = list(self.gc_policy.num_collections)
+        self.frame_times = History()
+        self.gc_times = History()
+        self.entity_counts = dict()
+
+    def get_gc_runs(self) -> List[int]:
+        """Returns the number of collections per generation since the overlay was shown."""
+        return [count - first for count, first in zip(self.gc_policy.num_collections, self.first_collections)]
+
+    def process_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+
+    def record(self) -> None:
+        """Adds the current frame's values to the graphs. The profiler's latest frame is the previous one."""
+        if self.profiler.num_frames > self.first_frame:
+            self.frame_times.append(get_work_time(self.profiler))
+            self.gc_times.append(get_section_time(self.profiler, 'gc'))
+
+        for name, count in self.get_entity_counts().items():
+            if name not in self.entity_counts:
+                self.entity_counts[name] = History()
+            self.entity_counts[name].append(count)
+
+    def update(self) -> None:
+        """Records the frame and creates the ImGui window, if visible. Needs to be called during the state's update.
+        """
+        if not self.visible:
+            return
+
+        self.record()
+        num_frames = min(self.profiler.num_frames - self.first_frame, HISTORY_SIZE)
+
+        imgui.set_next_window_size(340, 500, imgui.FIRST_USE_EVER)
+        with imgui.begin('Performance (F3)', closable=True) as window:
+            if not window.opened:
+                self.toggle()
+                return
+
+            if imgui.collapsing_header('Frame', flags=imgui.TREE_NODE_DEFAULT_OPEN)[0]:
+                imgui.plot_lines('##frame', self.frame_times.get(), graph_size=GRAPH_SIZE, scale_min=0.0,
+                                 overlay_text=f'{self.frame_times.latest():.1f} ms')
+
+            if imgui.collapsing_header('Sections')[0] and num_frames > 0:
+                for name in self.profiler.names:
+                    times = self.profiler.get_times(name)[-num_frames:].astype(numpy.float32)
+                    imgui.plot_lines(f'{name}##section', times, graph_size=SECTION_GRAPH_SIZE, scale_min=0.0,
+                                     overlay_text=f'{times[-1]:.2f} ms')
+
+            if imgui.collapsing_header('Entities')[0]:
+                for name, counts in self.entity_counts.items():
+                    imgui.plot_lines(f'{name}##entities', counts.get(), graph_size=SECTION_GRAPH_SIZE,
+                                     scale_min=0.0, overlay_text=f'{int(counts.latest())}')
+
+            if self.cache is not None and imgui.collapsing_header('Cache')[0]:
+                for name, count in self.cache.get_stats().items():
+                    imgui.text(f'{name}: {count}')
+
+            if imgui.collapsing_header('Garbage Collector')[0]:
+                gc_runs = self.get_gc_runs()
+                imgui.text(f'runs per generation: {gc_runs[0]} / {gc_runs[1]} / {gc_runs[2]}')
+                imgui.plot_lines('##gc', self.gc_times.get(), graph_size=GRAPH_SIZE, scale_min=0.0,
+                                 overlay_text=f'{self.gc_policy.max_pause_ms:.2f} ms max pause')
@@ -0,0 +1,30 @@
+from typing import TypeVar, Generic, Callable, List
+
+
+T = TypeVar('T')
+
+
+class Pool(Generic[T]):
+    """Keeps released instances for later reuse, so frequently created objects do not turn into garbage.
+
+    Acquired instances are handed out as they were released. The caller is supposed to reset them on reuse.
+    """
+    def __init__(self, create: Callable[[], T], max_size: int = 256):
+        self.create = create
+        self.max_size = max_size
+        self.free: List[T] = list()
+
+    def acquire(self) -> T:
+        """Returns a released instance if available, else a freshly created one."""
+        if len(self.free) > 0:
+            return self.free.pop()
+
+        return self.create()
+
+    def release(self, instance: T) -> None:
+        """Keeps the instance for reuse. If the pool is full, the instance is dropped."""
+        if len(self.free) < self.max_size:
+            self.free.append(instance)
+
+    def __len__(self) -> int:
+        return len(self.free)
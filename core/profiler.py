@@ -0,0 +1,170 @@
+import gc
+import csv
+import json
+import time
+import numpy
+import pathlib
+from typing import Dict, List, Sequence, Tuple, Any
+
+
+DEFAULT_HISTORY_SIZE: int = 300
+
+DEFAULT_PERCENTILES: Sequence[float] = (50.0, 95.0, 99.0)
+
+
+class Profiler:
+    """Collects the time spent in named sections per frame and keeps the last frames in a ring buffer.
+
+    Usage:
+        start = profiler.begin()
+        ...
+        profiler.end('physics', start)
+        ...
+        profiler.end_frame()
+
+    Sections which are entered several times per frame are summed up. Nested sections are recorded independently.
+    While disabled, begin() and end() return right away.
+    """
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE, enabled: bool = False):
+        self.enabled = enabled
+        self.history_size = history_size
+
+        self.names: List[str] = list()
+        self.columns: Dict[str, int] = dict()
+        # times in ms, rows are frames and columns are sections
+        self.history = numpy.zeros((history_size, 0))
+        self.current: Dict[str, float] = dict()
+        self.num_frames = 0
+
+    def begin(self) -> float:
+        """Returns the start time to be passed to end()."""
+        if not self.enabled:
+            return 0.0
+
+        return time.perf_counter()
+
+    def end(self, name: str, start: float) -> None:
+        """Adds the time since start to the named section of the current frame."""
+        if not self.enabled:
+            return
+
+        self.add(name, (time.perf_counter() - start) * 1000.0)
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        """Adds a time measured elsewhere to the named section of the current frame."""
+        if not self.enabled:
+            return
+
+        self.current[name] = self.current.get(name, 0.0) + elapsed_ms
+
+    def end_frame(self) -> None:
+        """Stores the current frame's times in the ring buffer, overwriting the oldest frame if it is full."""
+        if not self.enabled:
+            return
+
+        new_names = [name for name in self.current if name not in self.columns]
+        if len(new_names) > 0:
+            for name in new_names:
+                self.columns[name] = len(self.names)
+                self.names.append(name)
+            self.history = numpy.hstack((self.history, numpy.zeros((self.history_size, len(new_names)))))
+
+        row = self.history[self.num_frames % self.history_size]
+        row[:] = 0.0
+        for name, elapsed_ms in self.current.items():
+            row[self.columns[name]] = elapsed_ms
+
+        self.current.clear()
+        self.num_frames += 1
+
+    def reset(self) -> None:
+        """Drops all recorded frames and sections."""
+        self.names.clear()
+        self.columns.clear()
+        self.history = numpy.zeros((self.history_size, 0))
+        self.current.clear()
+        self.num_frames = 0
+
+    def get_frames(self) -> numpy.ndarray:
+        """Returns the recorded frames from oldest to latest, with one column per section."""
+        if self.num_frames <= self.history_size:
+            return self.history[:self.num_frames]
+
+        oldest = self.num_frames % self.history_size
+        return numpy.concatenate((self.history[oldest:], self.history[:oldest]))
+
+    def get_times(self, name: str) -> numpy.ndarray:
+        """Returns the recorded times in ms of the given section from oldest to latest frame."""
+        if name not in self.columns:
+            return numpy.zeros(0)
+
+        return self.get_frames()[:, self.columns[name]]
+
+    def get_percentiles(self, name: str, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[float, float]:
+        """Returns the given percentiles of the section's recorded times in ms."""
+        times = self.get_times(name)
+        if times.shape[0] == 0:
+            return {percentile: 0.0 for percentile in percentiles}
+
+        values = numpy.percentile(times, percentiles)
+        return {percentile: float(value) for percentile, value in zip(percentiles, values)}
+
+    def get_summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """Returns mean, max and percentiles of all sections in ms."""
+        summary = dict()
+        for name in self.names:
+            times = self.get_times(name)
+            entry = {'mean': float(times.mean()), 'max': float(times.max())}
+            for percentile, value in self.get_percentiles(name, percentiles).items():
+                entry[f'p{percentile:g}'] = value
+            summary[name] = entry
+
+        return summary
+
+    def to_json(self, path: pathlib.Path) -> None:
+        """Writes the section names, the recorded frames and a summary to a JSON file."""
+        data = {
+            'sections': self.names,
+            'frames': self.get_frames().tolist(),
+            'summary': self.get_summary()
+        }
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=2)
+
+    def to_csv(self, path: pathlib.Path) -> None:
+        """Writes the recorded frames to a CSV file with one column per section."""
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(self.names)
+            writer.writerows(self.get_frames().tolist())
+
+
+class GcMonitor:
+    """Records the garbage collector's runs using gc.callbacks. Each run is stored as a tuple of the collected
+    generation, its duration in ms and the number of collected objects.
+    """
+    def __init__(self):
+        self.start = 0.0
+        self.collections: List[Tuple[int, float, int]] = list()
+
+    def install(self) -> None:
+        if self.on_gc not in gc.callbacks:
+            gc.callbacks.append(self.on_gc)
+
+    def uninstall(self) -> None:
+        if self.on_gc in gc.callbacks:
+            gc.callbacks.remove(self.on_gc)
+
+    def on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == 'start':
+            self.start = time.perf_counter()
+            return
+
+        duration_ms = (time.perf_counter() - self.start) * 1000.0
+        self.collections.append((info['generation'], duration_ms, info['collected']))
+
+    def pop_collections(self) -> List[Tuple[int, float, int]]:
+        """Returns all runs since the last call."""
+        collections = self.collections
+        self.collections = list()
+        return collections
@@ -101,6 +101,7 @@ class Cache(object):
         # hsl-transformed and rotated surfaces
         self.hsl_transforms: Dict[Tuple[pygame.Surface, HSL_TUPLE, Optional[COLOR_TUPLE]]] = dict()
         self.rotated: Dict[Tuple[pygame.Surface, RECT_TUPLE, bool], List[pygame.Surface]] = dict()
+        self.outlined: Dict[Tuple[pygame.Surface, COLOR_TUPLE], pygame.Surface] = dict()
 
     def get_image(self, path: pathlib.Path) -> pygame.Surface:
         """Loads the image via filename. If already loaded, it's taken from the cache. Returns the image's surface."""
@@ -159,3 +160,26 @@ class Cache(object):
                 self.rotated[key] = [pygame.transform.rotate(frame, -alpha) for alpha in range(360)]
 
         return self.rotated[key][int(angle) % 360]
+
+    def get_outlined_surface(self, surface: pygame.Surface, color: pygame.Color) -> pygame.Surface:
+        """Returns a copy of the surface with an outline of the given color, see add_outline(). The copy is created
+        once per surface and color.
+        """
+        key = (surface, tuple(color))
+        if key not in self.outlined:
+            outlined = surface.copy()
+            add_outline(outlined, color)
+            self.outlined[key] = outlined
+
+        return self.outlined[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns the number of cached entries per kind of resource."""
+        return {
+            'images': len(self.images),
+            'fonts': len(self.fonts),
+            'sprites': len(self.sprites),
+            'hsl_transforms': len(self.hsl_transforms),
+            'rotated': len(self.rotated),
+            'outlined': len(self.outlined)
+        }
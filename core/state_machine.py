@@ -1,13 +1,18 @@
+import os
+import time
 import pygame
 import imgui
 import pathlib
 from abc import abstractmethod, ABC
-from typing import Tuple
+from typing import Tuple, List, Optional
 
-from core import paths, translate, constants
+from core import paths, translate, constants, profiler, capture, gc_policy
 from core.imgui_wrapper import OpenGlWrapper
 
 
+CAPTURE_KEY: int = pygame.K_F9
+
+
 class Engine(object):
     def __init__(self, screen_width: int, screen_height: int):
         """Creates an OpenGL screen and a SDL surface buffer. The OpenGL screen is used for ImGui rendering.
@@ -17,16 +22,16 @@ class Engine(object):
 
         self.paths = paths.DataPath(pathlib.Path.cwd() / 'data')
         self.translate = translate.Match()
+        self.profiler = profiler.Profiler()
+        # name of the frame's current phase, used to mark captured stacks
+        self.phase = ''
+        self.capture = capture.FrameCapture(lambda: self.phase, pathlib.Path.cwd() / 'captures')
+        self.gc_policy = gc_policy.GcPolicy()
 
-        buffer_size = (screen_width, screen_height)
-        if constants.SCALE_2X:
-            screen_size = (screen_width * 2, screen_height * 2)
-        else:
-            screen_size = buffer_size
-        pygame.display.set_mode(screen_size, OpenGlWrapper.get_display_flags())
-        self.buffer = pygame.Surface(buffer_size)
-        self.wrapper = OpenGlWrapper()
+        self.wrapper: Optional[OpenGlWrapper] = None
+        self.buffer = self.create_display((screen_width, screen_height))
         self.clock = pygame.time.Clock()
+        self.last_tick = time.perf_counter()
 
         self.running = False
         self.is_active = True
@@ -34,10 +39,27 @@ class Engine(object):
         self.max_fps = 30
         self.num_fps = 0
         self.queue = list()
+        self.redraw_needed = True
 
     def __del__(self):
         pygame.quit()
 
+    def create_display(self, buffer_size: Tuple[int, int]) -> pygame.Surface:
+        """Opens the OpenGL window and returns the buffer to draw on.
+        """
+        if constants.SCALE_2X:
+            screen_size = (buffer_size[0] * 2, buffer_size[1] * 2)
+        else:
+            screen_size = buffer_size
+        pygame.display.set_mode(screen_size, OpenGlWrapper.get_display_flags())
+        self.wrapper = OpenGlWrapper()
+        return pygame.Surface(buffer_size)
+
+    def request_redraw(self) -> None:
+        """Makes the current frame being drawn and uploaded, even if the state only redraws on demand.
+        """
+        self.redraw_needed = True
+
     def push(self, state) -> None:
         """Adds a state to the queue. The latest state is handled first (LIFO).
         """
@@ -45,54 +67,226 @@ class Engine(object):
             self.queue[-1].sleep()
 
         self.queue.append(state)
+        self.request_redraw()
+
+        # the state has loaded its resources by now
+        self.gc_policy.freeze()
 
     def pop(self) -> None:
         """Removes the latest state, which is currently handled (LIFO).
         This may throw an IndexError if the queue is empty.
         """
         self.queue.pop()
+        self.request_redraw()
 
         if len(self.queue) > 0:
+            # the remaining states' objects stay frozen
+            self.gc_policy.refreeze()
             self.queue[-1].reinit()
+        else:
+            self.gc_policy.unfreeze()
+
+    def start_capture(self, num_frames: int = capture.DEFAULT_NUM_FRAMES) -> None:
+        """Profiles the next frames and writes the results into the captures directory.
+        """
+        self.capture.request(num_frames)
+
+    def process_events(self, state) -> None:
+        """Forwards all pending events to ImGui and the state. The capture hotkey starts a capture.
+        """
+        start = self.profiler.begin()
+        for event in pygame.event.get():
+            if event.type == pygame.KEYDOWN and event.key == CAPTURE_KEY:
+                self.start_capture()
+
+            self.wrapper.process_event(event)
+            state.process_event(event)
+        self.profiler.end('events', start)
+
+    def begin_frame(self) -> None:
+        """Starts a new ImGui frame, so the state can create its widgets during update.
+        """
+        imgui.new_frame()
+
+    def draw(self, state) -> None:
+        """Draws the state onto the buffer and uploads it, unless the state waits for a redraw request and the last
+        frame is still valid. If the state restores the buffer itself, only the areas it reports are uploaded.
+        """
+        if self.redraw_needed or not state.redraw_on_demand:
+            start = self.profiler.begin()
+            if not state.restores_buffer:
+                self.buffer.fill(self.fill_color)
+            changed = state.draw()
+            if not state.restores_buffer:
+                changed = None
+            self.profiler.end('draw', start)
+
+            self.phase = 'upload'
+            start = self.profiler.begin()
+            self.wrapper.upload(self.buffer, changed)
+            self.profiler.end('upload', start)
+            self.redraw_needed = False
+
+        else:
+            # the last frame may still wait in a pixel buffer
+            self.phase = 'upload'
+            start = self.profiler.begin()
+            self.wrapper.flush_pending()
+            self.profiler.end('upload', start)
+
+    def present(self) -> None:
+        """Renders the uploaded buffer and ImGui onto the OpenGL window.
+        """
+        start = self.profiler.begin()
+        self.wrapper.present()
+        self.profiler.end('present', start)
+
+        start = self.profiler.begin()
+        pygame.display.flip()
+        self.profiler.end('flip', start)
+
+    def tick(self) -> int:
+        """Limits the frame rate and returns the elapsed time in ms. This finishes the profiler's and capture's frame.
+        """
+        self.phase = 'tick'
+        start = self.profiler.begin()
+        idle_ms = 0.0
+        if self.max_fps > 0:
+            idle_ms = 1000.0 / self.max_fps - (time.perf_counter() - self.last_tick) * 1000.0
+        self.gc_policy.collect_idle(idle_ms)
+
+        elapsed = self.clock.tick(self.max_fps)
+        self.last_tick = time.perf_counter()
+        self.num_fps = self.clock.get_fps()
+        self.profiler.end('tick', start)
+
+        for _, pause_ms, _ in self.gc_policy.pop_pauses():
+            self.profiler.add('gc', pause_ms)
+        self.profiler.end_frame()
+        if self.capture.active:
+            self.capture.end_frame()
+        return elapsed
+
+    def step(self, elapsed_ms: int) -> bool:
+        """Runs a single frame of the latest state. Returns False if no state is left.
+        """
+        if len(self.queue) == 0:
+            return False
+
+        if self.capture.pending > 0:
+            self.capture.begin()
+
+        state = self.queue[-1]
+        self.phase = 'events'
+        self.process_events(state)
+        self.begin_frame()
+
+        self.phase = 'update'
+        start = self.profiler.begin()
+        state.update(elapsed_ms)
+        self.profiler.end('update', start)
+
+        self.phase = 'draw'
+        self.draw(state)
+        self.phase = 'present'
+        self.present()
+        return True
 
     def run(self) -> None:
         """Runs the latest state until the app is shutdown by the user input or no state is left.
         """
         self.running = True
+        self.gc_policy.begin()
 
         elapsed = 0
-        while self.running:
-            # grab latest state
-            if len(self.queue) == 0:
-                return
+        while self.running and self.step(elapsed):
+            elapsed = self.tick()
+
+        self.gc_policy.end()
+        if self.capture.active:
+            self.capture.finish()
+
 
-            state = self.queue[-1]
+class HeadlessEngine(Engine):
+    """Runs the state stack without a window, OpenGL or ImGui, e.g. for benchmarks or batch runs on a server.
+    States which create ImGui widgets or query the wrapper cannot be run.
 
-            # handle all events
-            for event in pygame.event.get():
-                self.wrapper.process_event(event)
-                state.process_event(event)
+    The frame rate is not limited. If step_ms is given, each frame simulates that much time instead of the measured
+    time. If capture_interval is positive, a copy of every nth frame's buffer is appended to `frames`.
+    """
 
-            # update
-            imgui.new_frame()
-            state.update(elapsed)
+    def __init__(self, screen_width: int, screen_height: int, step_ms: Optional[int] = None,
+                 capture_interval: int = 0):
+        # needs to be set before the display is initialized
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
 
-            # draw state
+        self.step_ms = step_ms
+        self.capture_interval = capture_interval
+        self.frames: List[pygame.Surface] = list()
+        self.num_frames = 0
+
+        super().__init__(screen_width, screen_height)
+        self.max_fps = 0
+
+    def create_display(self, buffer_size: Tuple[int, int]) -> pygame.Surface:
+        """Sets up a display using the dummy driver, so images can be converted, and returns the buffer.
+        """
+        pygame.display.set_mode(buffer_size)
+        return pygame.Surface(buffer_size)
+
+    def process_events(self, state) -> None:
+        start = self.profiler.begin()
+        for event in pygame.event.get():
+            state.process_event(event)
+        self.profiler.end('events', start)
+
+    def begin_frame(self) -> None:
+        pass
+
+    def draw(self, state) -> None:
+        start = self.profiler.begin()
+        if not state.restores_buffer:
             self.buffer.fill(self.fill_color)
-            state.draw()
+        state.draw()
+        self.profiler.end('draw', start)
+
+        if self.capture_interval > 0 and self.num_frames % self.capture_interval == 0:
+            self.frames.append(self.buffer.copy())
+        self.num_frames += 1
 
-            # render onto OpenGL window
-            self.wrapper.render(self.buffer)
-            pygame.display.flip()
+    def present(self) -> None:
+        pass
+
+    def tick(self) -> int:
+        elapsed = super().tick()
+        return elapsed if self.step_ms is None else self.step_ms
+
+    def run(self, max_frames: Optional[int] = None) -> None:
+        """Runs the latest state until it stops, no state is left or max_frames were run.
+        """
+        self.running = True
+        self.gc_policy.begin()
+
+        elapsed = 0
+        num_frames = 0
+        while self.running and (max_frames is None or num_frames < max_frames) and self.step(elapsed):
+            elapsed = self.tick()
+            num_frames += 1
 
-            # limit fps
-            elapsed = self.clock.tick(self.max_fps)
-            self.num_fps = self.clock.get_fps()
+        self.gc_policy.end()
+        if self.capture.active:
+            self.capture.finish()
 
 
 class State(ABC):
     def __init__(self, engine: Engine):
         self.engine = engine
+        # if True, draw() is only called after engine.request_redraw() while ImGui is still rendered every frame
+        self.redraw_on_demand = False
+        # if True, the buffer is not cleared before draw(), which returns the changed areas or None if everything
+        # changed
+        self.restores_buffer = False
 
     @abstractmethod
     def process_event(self, event: pygame.event.Event) -> None:
@@ -111,5 +305,5 @@ class State(ABC):
         pass
 
     @abstractmethod
-    def draw(self) -> None:
+    def draw(self) -> Optional[List[pygame.Rect]]:
         pass
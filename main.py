@@ -1,5 +1,6 @@
 import sys
 import pygame
+import pathlib
 
 from core import constants, state_machine
 from platformer import editor, game
@@ -16,9 +17,15 @@ if __name__ == '__main__':
     game_engine = state_machine.Engine(constants.RESOLUTION_X, constants.RESOLUTION_Y)
     pygame.display.set_caption('Prehistoric Guy')
 
+    if '--profile' in args:
+        game_engine.profiler.enabled = True
+
     if '--editor' in args:
         game_engine.push(editor.EditorState(game_engine))
     else:
         game_engine.push(game.GameState(game_engine))
 
     game_engine.run()
+
+    if '--profile' in args:
+        game_engine.profiler.to_json(pathlib.Path('profile.json'))
@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+from typing import Set
 
-from core import objectids
+from core import objectids, pools
 
 from . import actions, frames, oscillation, hover
 from platformer import physics
@@ -25,16 +26,26 @@ class Context:
         self.actors = objectids.IdList[Actor]()
         self.projectiles = objectids.IdList[Projectile]()
 
+        # removed projectiles are reused by the next create_projectile call
+        self.projectile_pool = pools.Pool(lambda: Projectile(object_id=0))
+
     def create_actor(self, object_id: int) -> Actor:
         a = Actor(object_id=object_id)
         self.actors.append(a)
         return a
 
     def create_projectile(self, object_id: int) -> Projectile:
-        p = Projectile(object_id=object_id)
+        p = self.projectile_pool.acquire()
+        p.object_id = object_id
         self.projectiles.append(p)
         return p
 
+    def remove_projectiles(self, object_ids: Set[int]) -> None:
+        """Removes all projectiles with the given object ids. Removed projectiles are kept for reuse."""
+        doomed = [proj for proj in self.projectiles if proj.object_id in object_ids]
+        for proj in objectids.remove_instances(self.projectiles, doomed):
+            self.projectile_pool.release(proj)
+
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -83,7 +94,9 @@ class AnimationSystem(object):
             return
 
         platform.pos += platform.hover.delta
-        hover.update_actors(platform, self.physics_context.actors)
+        self.physics_context.update_bounds(platform)
+        for actor in hover.update_actors(platform, self.physics_context.actors):
+            self.physics_context.update_bounds(actor)
 
     def update(self, elapsed_ms: int) -> None:
         """Updates all animations' frame durations. It automatically switches frames and loops/returns/freezes the
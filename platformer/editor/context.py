@@ -59,10 +59,8 @@ class Context:
         self.file_status.filename = ''
         self.file_status.unsaved_changes = True
 
-        # replace platforms, ladders and objects
-        self.ctx.platforms.clear()
-        self.ctx.ladders.clear()
-        self.ctx.objects.clear()
+        # remove platforms, ladders, objects and triggers
+        self.ctx.clear_level()
 
         # reset camera
         self.cam.reset_pos()
@@ -214,10 +212,13 @@ class Context:
                                                   self.translate.editor.hover, self.translate.editor.amplitude)
 
             if imgui.button(self.translate.editor.delete):
-                self.ctx.platforms.remove(self.selected_platform)
+                self.ctx.remove_platform(self.selected_platform)
                 self.selected_platform = None
                 has_changed = True
 
+            elif has_changed:
+                self.ctx.mark_changed(self.selected_platform)
+
         if has_changed:
             self.file_status.unsaved_changes = True
 
@@ -228,10 +229,13 @@ class Context:
                                                 self.translate.editor.height)
 
             if imgui.button(self.translate.editor.delete):
-                self.ctx.ladders.remove(self.selected_ladder)
+                self.ctx.remove_ladder(self.selected_ladder)
                 self.selected_ladder = None
                 has_changed = True
 
+            elif has_changed:
+                self.ctx.mark_changed(self.selected_ladder)
+
         if has_changed:
             self.file_status.unsaved_changes = True
 
@@ -242,9 +246,12 @@ class Context:
                                                 self.translate.editor.type)
 
             if imgui.button(self.translate.editor.delete):
-                self.ctx.objects.remove(self.selected_object)
+                self.ctx.remove_objects([self.selected_object])
                 self.selected_object = None
                 has_changed = True
+
+            elif has_changed:
+                self.ctx.mark_changed(self.selected_object)
         
         if has_changed:
             self.file_status.unsaved_changes = True
@@ -267,9 +274,10 @@ class Context:
 
         if self.mode == EditorMode.SELECT:
             # query hovered elements
-            self.hovered_platforms = [platform for platform in self.ctx.platforms if self.mouse_over_platform(platform)]
-            self.hovered_ladders = [ladder for ladder in self.ctx.ladders if ladder.is_in_reach_of(self.mouse_pos)]
-            self.hovered_objects = [obj for obj in self.ctx.objects if obj.get_circ().collidecirc(circ)]
+            region = self.ctx.query_circle(self.mouse_pos.x, self.mouse_pos.y, MOUSE_SELECT_RADIUS)
+            self.hovered_platforms = [platform for platform in region.platforms if self.mouse_over_platform(platform)]
+            self.hovered_ladders = [ladder for ladder in region.ladders if ladder.is_in_reach_of(self.mouse_pos)]
+            self.hovered_objects = [obj for obj in region.objects if obj.get_circ().collidecirc(circ)]
             self.preview_platform = None
             self.preview_ladder = None
             self.preview_object = None
@@ -333,25 +341,29 @@ class Context:
 
                 self.object_tooltip(self.preview_object)
 
-    def draw(self, render_api: renderer.Renderer) -> None:
-        """Draw additional things on top."""
+    def draw(self, render_api: renderer.Renderer) -> List[Optional[pygame.Rect]]:
+        """Draw additional things on top. Returns the changed areas."""
+        changed = list()
+
         # redraw hovered objects
         for platform in self.hovered_platforms:
-            render_api.draw_platform(platform, add_outline=True)
+            changed.append(render_api.draw_platform(platform, add_outline=True))
         for ladder in self.hovered_ladders:
-            render_api.draw_ladder(ladder, add_outline=True)
+            changed.append(render_api.draw_ladder(ladder, add_outline=True))
         for obj in self.hovered_objects:
-            render_api.draw_object(obj, add_outline=True)
+            changed.append(render_api.draw_object(obj, add_outline=True))
 
         # redraw preview objects
         if self.preview_platform is not None:
-            render_api.draw_platform(self.preview_platform)
+            changed.append(render_api.draw_platform(self.preview_platform))
         if self.preview_ladder is not None:
-            render_api.draw_ladder(self.preview_ladder)
+            changed.append(render_api.draw_ladder(self.preview_ladder))
         if self.preview_object is not None:
-            render_api.draw_object(self.preview_object)
+            changed.append(render_api.draw_object(self.preview_object))
 
         if self.selected_platform is not None and self.selected_platform.hover.does_move() and \
                 hasattr(self.selected_platform, 'original_pos'):
-            render_api.draw_position(self.selected_platform.original_pos)
-            render_api.draw_line(self.selected_platform.original_pos, self.selected_platform.pos)
+            changed.append(render_api.draw_position(self.selected_platform.original_pos))
+            changed.append(render_api.draw_line(self.selected_platform.original_pos, self.selected_platform.pos))
+
+        return changed
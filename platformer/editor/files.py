@@ -25,10 +25,8 @@ class FileStatus:
 
 
 def apply_context(target: physics.Context, tmp: physics.Context):
-    # replace platforms, ladders and objects
-    target.platforms = tmp.platforms
-    target.ladders = tmp.ladders
-    target.objects = tmp.objects
+    # replace platforms, ladders, objects and triggers
+    target.apply_level(tmp)
 
 
 def to_xml(ctx: physics.Context) -> et.Element:
@@ -64,6 +62,14 @@ def to_xml(ctx: physics.Context) -> et.Element:
         elem.set('y', str(obj.pos.y))
         elem.set('object_type', obj.object_type.name.lower())
 
+    for trigger in ctx.triggers:
+        elem = et.SubElement(root, 'trigger')
+        elem.set('x', str(trigger.pos.x))
+        elem.set('y', str(trigger.pos.y))
+        elem.set('width', str(trigger.width))
+        elem.set('height', str(trigger.height))
+        elem.set('trigger_type', trigger.trigger_type.name.lower())
+
     return root
 
 
@@ -95,6 +101,12 @@ def from_xml(root: et.Element) -> physics.Context:
             object_type = constants.ObjectType.__members__[child.attrib['object_type'].upper()]
             ctx.create_object(x=x, y=y, object_type=object_type)
 
+        elif child.tag == 'trigger':
+            width = float(child.attrib['width'])
+            height = float(child.attrib['height'])
+            trigger_type = physics.TriggerType.__members__[child.attrib['trigger_type'].upper()]
+            ctx.create_trigger(x=x, y=y, width=width, height=height, trigger_type=trigger_type)
+
     return ctx
 
 
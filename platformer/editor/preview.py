@@ -1,5 +1,5 @@
 import pygame
-from typing import Optional
+from typing import Optional, Union
 
 from core import constants, resources, state_machine
 
@@ -35,6 +35,7 @@ class PreviewState(state_machine.State, factory.EventListener):
 
         # load level
         files.apply_context(self.physics_ctx, src)
+        self.physics_ctx.build_tile_grid()
 
         # create player
         guy_path = self.engine.paths.sprite('guy')
@@ -61,6 +62,12 @@ class PreviewState(state_machine.State, factory.EventListener):
     def on_collision(self, actor: physics.Actor, platform: physics.Platform) -> None:
         pass
 
+    def on_contact_begin(self, phys_actor: physics.Actor, other: Union[physics.Object, physics.Actor]) -> None:
+        pass
+
+    def on_contact_end(self, phys_actor: physics.Actor, other: Union[physics.Object, physics.Actor]) -> None:
+        pass
+
     def on_touch_object(self, phys_actor: physics.Actor, obj: physics.Object) -> None:
         pass
 
@@ -73,6 +80,12 @@ class PreviewState(state_machine.State, factory.EventListener):
     def on_touch_actor(self, proj: physics.Projectile, phys_actor: physics.Actor) -> None:
         pass
 
+    def on_enter(self, phys_actor: physics.Actor, trigger: physics.Trigger) -> None:
+        pass
+
+    def on_exit(self, phys_actor: physics.Actor, trigger: physics.Trigger) -> None:
+        pass
+
     def on_animation_finish(self, ani_actor: animations.Actor) -> None:
         pass
 
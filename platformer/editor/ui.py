@@ -1,7 +1,8 @@
 import pygame
 import imgui
+from typing import List, Optional, Tuple
 
-from core import constants, state_machine, resources
+from core import constants, state_machine, resources, perf_overlay
 from platformer import animations, renderer
 
 from . import preview, context, files
@@ -26,14 +27,23 @@ class EditorState(state_machine.State, animations.EventListener):
 
         self.font = self.cache.get_font()
         self.quit = False
+        self.overlay = perf_overlay.PerfOverlay(engine.profiler, engine.gc_policy, self.cache,
+                                                self.context.ctx.get_counts)
         self.engine.fill_color = self.parallax.get_fill_color()
 
+        # most frames are identical while nobody interacts with the editor
+        self.redraw_on_demand = True
+        # the background is kept while the camera does not move
+        self.restores_buffer = True
+        self.dirty = renderer.DirtyRects(engine.buffer)
+
     def __del__(self):
         pass
 
     def reinit(self) -> None:
         # pygame.event.set_grab(True)
-        pass
+        # the preview has drawn onto the buffer
+        self.dirty.invalidate()
 
     def sleep(self) -> None:
         # pygame.event.set_grab(False)
@@ -237,6 +247,9 @@ class EditorState(state_machine.State, animations.EventListener):
 
     def process_event(self, event: pygame.event.Event) -> None:
         """Handles pygame events."""
+        # any input may change hovered, previewed or edited elements
+        self.engine.request_redraw()
+
         if event.type == pygame.QUIT:
             self.quit = True
 
@@ -250,6 +263,7 @@ class EditorState(state_machine.State, animations.EventListener):
                     self.context.on_right_click(event)
 
         if not self.engine.wrapper.io.want_capture_keyboard:
+            self.overlay.process_event(event)
             if event.type == pygame.KEYDOWN:
                 self.context.on_key_pressed(event.key)
 
@@ -275,18 +289,29 @@ class EditorState(state_machine.State, animations.EventListener):
         keys = pygame.key.get_pressed()
         if keys[pygame.K_LEFT]:
             self.context.cam.topleft.x -= 0.01 * elapsed_ms
+            self.engine.request_redraw()
         if keys[pygame.K_RIGHT]:
             self.context.cam.topleft.x += 0.01 * elapsed_ms
+            self.engine.request_redraw()
+
+    def has_moving_platforms(self) -> bool:
+        """Returns True if any hovering platform changes its position every frame."""
+        return any(platform.hover.does_move() for platform in self.context.ctx.platforms)
 
     def update(self, elapsed_ms: int) -> None:
         """Update various things."""
-        self.animations.update(elapsed_ms)
-        self.parallax.update(elapsed_ms)
-        self.renderer.update(elapsed_ms)
-
         if not self.engine.wrapper.io.want_capture_keyboard:
             self.update_cam_move(elapsed_ms)
 
+        if self.has_moving_platforms():
+            self.engine.request_redraw()
+
+        self.animations.update(elapsed_ms)
+        # clouds only move while the scene is redrawn anyway
+        if self.engine.redraw_needed:
+            self.parallax.update(elapsed_ms)
+        self.renderer.update(elapsed_ms)
+
         if not self.engine.wrapper.io.want_capture_mouse:
             pos = pygame.math.Vector2(pygame.mouse.get_pos())
             self.context.mouse_pos = self.renderer.to_world_coord(pos)
@@ -298,11 +323,24 @@ class EditorState(state_machine.State, animations.EventListener):
         # handle imgui
         self.main_menu()
         self.popups()
-
-    def draw(self) -> None:
-        """Draw scene and things the like."""
-        self.parallax.draw()
-        self.renderer.draw()
-        self.context.draw(self.renderer)
+        self.overlay.update()
 
         pygame.display.set_caption(f'Editor - {int(self.engine.num_fps):02d} FPS')
+
+    def get_background_key(self) -> Tuple:
+        """Returns what the background depends on: the camera, the parallax layers and the baked static layer."""
+        self.renderer.static_layer.sync()
+        return (self.context.cam.topleft.x, self.context.cam.topleft.y, tuple(self.parallax.get_layer_positions()),
+                self.renderer.static_layer.generation)
+
+    def draw(self) -> Optional[List[pygame.Rect]]:
+        """Draw scene and things the like. Returns the changed areas."""
+        if self.dirty.restore(self.get_background_key()):
+            self.engine.buffer.fill(self.parallax.get_fill_color())
+            self.parallax.draw()
+            self.renderer.draw_static()
+            self.dirty.store()
+
+        self.dirty.add_all(self.renderer.draw_dynamic())
+        self.dirty.add_all(self.context.draw(self.renderer))
+        return self.dirty.get_rects()
@@ -0,0 +1,145 @@
+import pathlib
+import random
+import numpy
+import xml.etree.ElementTree as et
+from typing import List, Optional, Iterable, Tuple
+
+from platformer import controls, factory, rules
+from platformer.editor import files
+
+
+# buttons per world within the action array
+LEFT: int = 0
+RIGHT: int = 1
+UP: int = 2
+DOWN: int = 3
+ATTACK: int = 4
+THROW: int = 5
+NUM_BUTTONS: int = 6
+
+# enemies beyond this number are not observed
+MAX_OBSERVED_ENEMIES: int = 4
+
+# x, y, force x, force y, face x, hit points, number of axes, on ground
+PLAYER_FEATURES: int = 8
+# dx, dy, hit points, alive
+ENEMY_FEATURES: int = 4
+OBSERVATION_SIZE: int = PLAYER_FEATURES + MAX_OBSERVED_ENEMIES * ENEMY_FEATURES
+
+# simulated time per step, matches the engine's 30 FPS
+DEFAULT_STEP_MS: int = 33
+
+
+class World(rules.GameRules):
+    """Headless instance of the demo scene, controlled by an array of pressed buttons instead of the keyboard. All
+    randomness is drawn from the given generator.
+    """
+
+    def __init__(self, level: et.Element, rng: Optional[random.Random] = None):
+        self.factory = factory.Factory(self, None, None, rng=rng)
+        files.apply_context(self.factory.ctx.physics, files.from_xml(level))
+        self.factory.ctx.physics.build_tile_grid()
+        self.create_kill_zone()
+        self.player_char = rules.create_demo_scene(self.factory, None)
+
+        self.done = False
+        self.buttons = numpy.zeros(NUM_BUTTONS, dtype=bool)
+
+        player = self.factory.ctx.players.actors.get_by_id(self.player_char.object_id)
+        keys = player.keys
+        self.button_by_key = {keys.left_key: LEFT, keys.right_key: RIGHT, keys.up_key: UP, keys.down_key: DOWN,
+                              keys.attack_key: ATTACK, keys.throw_key: THROW}
+        self.factory.ctx.players.query = self.query
+
+    def query(self, key: int) -> bool:
+        """Replaces the keyboard query of the players context."""
+        index = self.button_by_key.get(key)
+        return index is not None and bool(self.buttons[index])
+
+    def on_player_killed(self, player: controls.Player) -> None:
+        """Triggered when a player entered a kill zone."""
+        self.done = True
+
+    def step(self, buttons: numpy.ndarray, elapsed_ms: int) -> None:
+        """Simulates a single frame using the given pressed buttons."""
+        self.buttons[:] = buttons
+        self.factory.update(elapsed_ms)
+        if self.player_char.hit_points <= 0:
+            self.done = True
+
+    def observe(self, out: numpy.ndarray) -> None:
+        """Writes the world's observation into the given array of OBSERVATION_SIZE."""
+        phys_ctx = self.factory.ctx.physics
+        phys_player = phys_ctx.actors.get_by_id(self.player_char.object_id)
+
+        out[0] = phys_player.pos.x
+        out[1] = phys_player.pos.y
+        out[2] = phys_player.move.force.x
+        out[3] = phys_player.move.force.y
+        out[4] = phys_player.move.face_x
+        out[5] = self.player_char.hit_points.value
+        out[6] = self.player_char.num_axes.value
+        out[7] = phys_player.on_platform is not None or phys_player.on_ladder is not None
+
+        out[PLAYER_FEATURES:] = 0.0
+        offset = PLAYER_FEATURES
+        for enemy in self.factory.ctx.enemies.actors[:MAX_OBSERVED_ENEMIES]:
+            phys_enemy = phys_ctx.actors.get_by_id(enemy.object_id)
+            char_enemy = self.factory.ctx.characters.actors.get_by_id(enemy.object_id)
+            if phys_enemy is None or char_enemy is None:
+                continue
+
+            out[offset] = phys_enemy.pos.x - phys_player.pos.x
+            out[offset + 1] = phys_enemy.pos.y - phys_player.pos.y
+            out[offset + 2] = char_enemy.hit_points.value
+            out[offset + 3] = 1.0
+            offset += ENEMY_FEATURES
+
+
+class Environment:
+    """Steps a number of independent worlds in lockstep. Actions are passed as an array of pressed buttons per world
+    with shape (num_worlds, NUM_BUTTONS). Observations are returned as an array with shape
+    (num_worlds, OBSERVATION_SIZE), together with a boolean array telling which worlds are done.
+
+    Done worlds are not simulated anymore until they are reset. The returned arrays are reused by the next call.
+
+    With a seed, each world gets its own random generator seeded from it, so runs can be reproduced.
+    """
+
+    def __init__(self, num_worlds: int, level_path: pathlib.Path, step_ms: int = DEFAULT_STEP_MS,
+                 seed: Optional[int] = None):
+        self.level = files.from_file(level_path)
+        self.step_ms = step_ms
+        self.rng = random.Random(seed)
+        self.worlds: List[World] = [self.create_world() for _ in range(num_worlds)]
+
+        self.observations = numpy.zeros((num_worlds, OBSERVATION_SIZE), dtype=numpy.float32)
+        self.dones = numpy.zeros(num_worlds, dtype=bool)
+
+    def create_world(self) -> World:
+        return World(self.level, random.Random(self.rng.getrandbits(64)))
+
+    def observe(self) -> None:
+        for index, world in enumerate(self.worlds):
+            world.observe(self.observations[index])
+            self.dones[index] = world.done
+
+    def reset(self, indices: Optional[Iterable[int]] = None) -> numpy.ndarray:
+        """Recreates the given worlds, or all worlds if no indices are given. Returns the observations."""
+        if indices is None:
+            indices = range(len(self.worlds))
+        for index in indices:
+            self.worlds[index] = self.create_world()
+
+        self.observe()
+        return self.observations
+
+    def step(self, actions: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Simulates one frame in all worlds which are not done yet. Returns the observations and done flags."""
+        actions = numpy.asarray(actions, dtype=bool).reshape(len(self.worlds), NUM_BUTTONS)
+        for index, world in enumerate(self.worlds):
+            if not world.done:
+                world.step(actions[index], self.step_ms)
+
+        self.observe()
+        return self.observations, self.dones
@@ -2,11 +2,11 @@ from abc import ABCMeta
 
 import pygame
 import random
-from typing import Optional
+from typing import Optional, Dict, Set, Tuple
 
-from core import constants, resources, objectids
+from core import constants, resources, objectids, profiler
 
-from . import physics, animations, renderer, characters, controls, interface
+from . import physics, animations, particles, renderer, characters, controls, interface
 
 
 class EventListener(physics.EventListener, animations.EventListener, characters.EventListener, metaclass=ABCMeta):
@@ -14,10 +14,11 @@ class EventListener(physics.EventListener, animations.EventListener, characters.
 
 
 class MainContext:
-    def __init__(self):
+    def __init__(self, particle_capacity: int = particles.MAX_PARTICLES, particle_seed: Optional[int] = None):
         self.id_generator = objectids.object_id_generator()
         self.physics = physics.Context()
         self.animations = animations.Context()
+        self.particles = particles.Context(capacity=particle_capacity, seed=particle_seed)
         self.renderer = renderer.Context()
         self.characters = characters.Context()
         self.players = controls.PlayersContext()
@@ -27,31 +28,92 @@ class MainContext:
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+class DestroyQueue:
+    """Collects entities which are removed at the end of the tick. Event handlers are called while the systems iterate
+    their lists, so removing entities right away would alter those lists.
+    """
+    def __init__(self):
+        # keyed by id(), because the physics dataclasses are not hashable
+        self.objects: Dict[int, physics.Object] = dict()
+        self.projectiles: Dict[int, physics.Projectile] = dict()
+
+        # object ids whose components are removed from all contexts
+        self.actor_ids: Set[int] = set()
+        # object ids whose character and controls components are removed, the actor itself is kept
+        self.character_ids: Set[int] = set()
+
+    def is_empty(self) -> bool:
+        return len(self.objects) == 0 and len(self.projectiles) == 0 and len(self.actor_ids) == 0 and \
+            len(self.character_ids) == 0
+
+    def contains(self, entity: object) -> bool:
+        """Returns True if the object or projectile is about to be removed."""
+        return id(entity) in self.objects or id(entity) in self.projectiles
+
+    def clear(self) -> None:
+        self.objects.clear()
+        self.projectiles.clear()
+        self.actor_ids.clear()
+        self.character_ids.clear()
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 class Factory:
-    """Factory for creating game objects. Creation and deletion of objects considers all relevant systems."""
-    def __init__(self, listener: EventListener, cache: resources.Cache, target: pygame.Surface):
-        self.ctx = MainContext()
+    """Factory for creating game objects. Creation and deletion of objects considers all relevant systems.
+
+    Without a cache and target, the factory is headless: nothing is rendered and particle effects are dropped.
+    Each system's update and draw is timed by the given profiler. Random objects and particles are drawn from the given
+    random generator, so a seeded generator makes a world reproducible.
+
+    While the camera does not move, the background (parallax layers and static platforms) is kept and only the areas
+    of dynamic elements are redrawn, see `dirty`.
+    """
+    def __init__(self, listener: EventListener, cache: Optional[resources.Cache], target: Optional[pygame.Surface],
+                 frame_profiler: Optional[profiler.Profiler] = None, rng: Optional[random.Random] = None):
+        self.headless = target is None
+        self.target = target
+        self.profiler = frame_profiler if frame_profiler is not None else profiler.Profiler()
+        self.rng = rng if rng is not None else random.Random()
+        self.ctx = MainContext(particle_capacity=0 if self.headless else particles.MAX_PARTICLES,
+                               particle_seed=self.rng.getrandbits(64))
+        self.destroy_queue = DestroyQueue()
 
         self.physics = physics.System(listener, self.ctx.physics)
         self.animation = animations.AnimationSystem(listener, self.ctx.animations, self.ctx.physics)
-        self.camera = renderer.Camera()
-        self.renderer = renderer.Renderer(self.camera, target, self.ctx.physics, self.ctx.animations,
-                                          self.ctx.renderer, cache)
-        self.parallax = renderer.ParallaxRenderer(self.camera, target, cache)
+        self.camera = renderer.Camera() if not self.headless else \
+            renderer.Camera(size=(constants.RESOLUTION_X, constants.RESOLUTION_Y))
+        self.particles = particles.ParticleSystem(self.ctx.particles)
         self.characters = characters.CharacterSystem(listener, self.ctx.characters, self.ctx.animations)
         self.players = controls.PlayersSystem(self.ctx.players, self.ctx.physics, self.ctx.animations)
         self.enemies = controls.EnemiesSystem(self.ctx.enemies, self.ctx.physics, self.ctx.animations,
                                               self.ctx.characters)
-        self.huds = interface.HudSystem(self.ctx.players, self.ctx.physics, self.ctx.characters, target, cache,
-                                        self.camera)
+
+        # named systems in update order
+        self.update_systems = [('physics', self.physics), ('animation', self.animation)]
+
+        if not self.headless:
+            self.renderer = renderer.Renderer(self.camera, target, self.ctx.physics, self.ctx.animations,
+                                              self.ctx.renderer, cache)
+            self.parallax = renderer.ParallaxRenderer(self.camera, target, cache)
+            self.particle_renderer = renderer.ParticleRenderer(self.camera, target, self.ctx.particles)
+            self.huds = interface.HudSystem(self.ctx.players, self.ctx.physics, self.ctx.characters, target, cache,
+                                            self.camera)
+            self.dirty = renderer.DirtyRects(target)
+
+            self.update_systems += [('particles', self.particles), ('parallax', self.parallax),
+                                    ('renderer', self.renderer)]
+
+        self.update_systems += [('characters', self.characters), ('players', self.players), ('enemies', self.enemies)]
 
     def create_random_object(self) -> None:
         # pick random position on random platform
-        p = random.choice(self.ctx.physics.platforms)
-        x = random.randrange(p.width)
+        p = self.rng.choice(self.ctx.physics.platforms)
+        x = self.rng.randrange(p.width)
 
         self.ctx.physics.create_object(x=p.pos.x + x, y=p.pos.y + 0.5,
-                                       object_type=random.choice(list(constants.ObjectType)))
+                                       object_type=self.rng.choice(list(constants.ObjectType)))
 
     def create_projectile(self, x: float, y: float, from_actor: Optional[physics.Actor], speed: float,
                           object_type: constants.ObjectType) -> physics.Projectile:
@@ -63,7 +125,19 @@ class Factory:
 
         return physics_proj
 
-    def create_actor(self, sprite_sheet: pygame.Surface, **kwargs) -> int:
+    def destroy_object(self, obj: physics.Object) -> None:
+        """Schedule removing an object at the end of the tick."""
+        self.destroy_queue.objects[id(obj)] = obj
+
+    def destroy_projectile(self, proj: physics.Projectile) -> None:
+        """Schedule removing a projectile (with all components) at the end of the tick."""
+        self.destroy_queue.projectiles[id(proj)] = proj
+
+    def is_destroyed(self, entity: object) -> bool:
+        """Returns True if the object or projectile was already scheduled for removal during this tick."""
+        return self.destroy_queue.contains(entity)
+
+    def create_actor(self, sprite_sheet: Optional[pygame.Surface], **kwargs) -> int:
         """Create an actor object such as player or enemy characters. Returns the object id."""
         object_id = next(self.ctx.id_generator)
 
@@ -78,16 +152,11 @@ class Factory:
         return object_id
 
     def destroy_actor_by_id(self, object_id: int) -> None:
-        """Remove an actor (with all components) using the object id."""
-        phys_actor = self.ctx.physics.actors.get_by_id(object_id)
-        ani_actor = self.ctx.animations.actors.get_by_id(object_id)
-        render_actor = self.ctx.renderer.actors.get_by_id(object_id)
-        self.ctx.physics.actors.remove(phys_actor)
-        self.ctx.animations.actors.remove(ani_actor)
-        self.ctx.renderer.actors.remove(render_actor)
-
-    def create_character(self, sprite_sheet: pygame.Surface, x: float, y: float, max_hit_points: int, num_axes: int) \
-            -> characters.Actor:
+        """Schedule removing an actor (with all components) using the object id."""
+        self.destroy_queue.actor_ids.add(object_id)
+
+    def create_character(self, sprite_sheet: Optional[pygame.Surface], x: float, y: float,
+                         max_hit_points: int, num_axes: int) -> characters.Actor:
         """Creates and returns a character """
         object_id = self.create_actor(sprite_sheet, x=x, y=y)
         character = self.ctx.characters.create_actor(object_id, max_hit_points=max_hit_points,
@@ -95,16 +164,16 @@ class Factory:
         return character
 
     def destroy_character(self, character: characters.Actor, keep_components: bool = False) -> None:
-        """Remove a character. If keep_components is True, the underlying actor remains intact."""
+        """Schedule removing a character. If keep_components is True, the underlying actor remains intact."""
         if keep_components:
             # stop movement and make unable to collide anymore
             phys_actor = self.ctx.physics.actors.get_by_id(character.object_id)
-            phys_actor.force_x = 0.0
+            phys_actor.move.force.x = 0.0
             phys_actor.can_collide = False
+            self.destroy_queue.character_ids.add(character.object_id)
         else:
             # remove other actor components
             self.destroy_actor_by_id(character.object_id)
-        self.ctx.characters.actors.remove(character)
 
     def create_player(self, character: characters.Actor, keys: controls.Keybinding) -> controls.Player:
         """Create a player for an existing character actor. Returns the player actor."""
@@ -112,31 +181,101 @@ class Factory:
         actor.keys = keys
         return actor
 
-    def create_enemy(self, sprite_sheet: pygame.Surface, x: float, y: float, max_hit_points: int, num_axes: int) \
-            -> characters.Actor:
+    def create_enemy(self, sprite_sheet: Optional[pygame.Surface], x: float, y: float,
+                     max_hit_points: int, num_axes: int) -> characters.Actor:
         enemy_char = self.create_character(sprite_sheet, x, y, max_hit_points, num_axes)
         self.ctx.enemies.create_actor(enemy_char.object_id)
 
+        # enemies neither touch each other nor pick up objects
+        phys_actor = self.ctx.physics.actors.get_by_id(enemy_char.object_id)
+        phys_actor.category = physics.CollisionCategory.ENEMY
+        phys_actor.mask = physics.collision.ENEMY_MASK
+
         return enemy_char
 
     def destroy_enemy(self, character: characters.Actor, keep_components: bool = False) -> None:
-        enemy = self.ctx.enemies.actors.get_by_id(character.object_id)
-        if enemy is not None:
-            self.ctx.enemies.actors.remove()
+        """Schedule removing an enemy. The enemy component is removed together with the character."""
         self.destroy_character(character, keep_components)
 
+    def flush(self) -> None:
+        """Removes all scheduled entities. Each affected list is compacted once, no matter how many of its entities
+        are removed.
+        """
+        queue = self.destroy_queue
+        if queue.is_empty():
+            return
+
+        removed_actors = [actor for actor in self.ctx.physics.actors if actor.object_id in queue.actor_ids]
+        self.physics.discard_contacts(removed_actors + list(queue.objects.values()))
+
+        self.ctx.physics.remove_objects(queue.objects.values())
+        self.ctx.physics.remove_projectiles(queue.projectiles.values())
+        self.ctx.animations.remove_projectiles({proj.object_id for proj in queue.projectiles.values()})
+
+        self.ctx.physics.remove_actors(queue.actor_ids)
+        self.ctx.animations.actors.remove_by_ids(queue.actor_ids)
+        self.ctx.renderer.actors.remove_by_ids(queue.actor_ids)
+
+        character_ids = queue.actor_ids | queue.character_ids
+        self.ctx.characters.actors.remove_by_ids(character_ids)
+        self.ctx.players.actors.remove_by_ids(character_ids)
+        self.ctx.enemies.actors.remove_by_ids(character_ids)
+
+        queue.clear()
+
+    def get_entity_counts(self) -> Dict[str, int]:
+        """Returns the number of physics elements per kind and the number of particles."""
+        counts = self.ctx.physics.get_counts()
+        counts['particles'] = self.ctx.particles.count
+        return counts
+
     def update(self, elapsed_ms: int) -> None:
-        """Update all related systems."""
-        self.physics.update(elapsed_ms)
-        self.animation.update(elapsed_ms)
-        self.parallax.update(elapsed_ms)
-        self.renderer.update(elapsed_ms)
-        self.characters.update(elapsed_ms)
-        self.players.update(elapsed_ms)
-        self.enemies.update(elapsed_ms)
+        """Update all related systems. Entities scheduled for removal are removed afterwards."""
+        for name, system in self.update_systems:
+            start = self.profiler.begin()
+            system.update(elapsed_ms)
+            self.profiler.end(f'update.{name}', start)
+
+        start = self.profiler.begin()
+        self.flush()
+        self.profiler.end('update.flush', start)
+
+    def get_background_key(self) -> Tuple:
+        """Returns what the background depends on: the camera, the parallax layers and the baked static layer."""
+        self.renderer.static_layer.sync()
+        return (self.camera.topleft.x, self.camera.topleft.y, tuple(self.parallax.get_layer_positions()),
+                self.renderer.static_layer.generation)
 
     def draw(self) -> None:
-        """Draw scene and HUD."""
-        self.parallax.draw()
-        self.renderer.draw()
-        self.huds.draw()
+        """Draw scene and HUD. Nothing is drawn if headless.
+
+        The background is only drawn if it changed since the last frame, otherwise the last frame's dynamic elements
+        are erased using the stored background. The changed areas are returned by `dirty.get_rects()` afterwards.
+        """
+        if self.headless:
+            return
+
+        if self.dirty.restore(self.get_background_key()):
+            self.target.fill(self.parallax.get_fill_color())
+
+            start = self.profiler.begin()
+            self.parallax.draw()
+            self.profiler.end('draw.parallax', start)
+
+            start = self.profiler.begin()
+            self.renderer.draw_static()
+            self.profiler.end('draw.static', start)
+
+            self.dirty.store()
+
+        start = self.profiler.begin()
+        self.dirty.add_all(self.renderer.draw_dynamic())
+        self.profiler.end('draw.dynamic', start)
+
+        start = self.profiler.begin()
+        self.dirty.add_all(self.particle_renderer.draw())
+        self.profiler.end('draw.particles', start)
+
+        start = self.profiler.begin()
+        self.dirty.add_all(self.huds.draw())
+        self.profiler.end('draw.huds', start)
@@ -1,5 +1,6 @@
 import pygame
 from enum import IntEnum
+from typing import List
 
 from core import constants, resources, ui
 from platformer import physics, characters, renderer, controls
@@ -26,22 +27,28 @@ class HudSystem:
         hud_path = cache.paths('hud', 'png')
         self.tileset = cache.get_image(hud_path)
 
-    def draw_icons(self, actor: characters.Actor) -> None:
+    def draw_icons(self, actor: characters.Actor) -> List[pygame.Rect]:
+        """Draws the actor's hit points and axes. Returns the changed areas."""
+        changed = list()
+
         # draw heart icon per hit point
         hud_clip = pygame.Rect(0 * constants.OBJECT_SCALE, HudType.HEART * constants.OBJECT_SCALE,
                                constants.OBJECT_SCALE, constants.OBJECT_SCALE)
         for i in range(actor.hit_points.value):
-            self.target.blit(self.tileset, (i * constants.OBJECT_SCALE, 0), hud_clip)
+            changed.append(self.target.blit(self.tileset, (i * constants.OBJECT_SCALE, 0), hud_clip))
 
         # draw weapon icon per axe
         weapon_clip = pygame.Rect(0 * constants.OBJECT_SCALE, HudType.WEAPON * constants.OBJECT_SCALE,
                                   constants.OBJECT_SCALE, constants.OBJECT_SCALE)
         for i in range(actor.num_axes.value):
-            self.target.blit(self.tileset, (i * constants.OBJECT_SCALE, constants.OBJECT_SCALE), weapon_clip)
+            changed.append(self.target.blit(self.tileset, (i * constants.OBJECT_SCALE, constants.OBJECT_SCALE),
+                                            weapon_clip))
+
+        return changed
 
-    def draw_hud(self, actor: controls.Player):
+    def draw_hud(self, actor: controls.Player) -> List[pygame.Rect]:
         char_actor = self.characters_context.actors.get_by_id(actor.object_id)
-        self.draw_icons(char_actor)
+        changed = self.draw_icons(char_actor)
 
         phys_actor = self.physics_context.actors.get_by_id(actor.object_id)
 
@@ -49,6 +56,11 @@ class HudSystem:
         screen_pos = self.camera.from_world_coord(phys_actor.pos)
         screen_pos *= constants.WORLD_SCALE
 
-    def draw(self):
+        return changed
+
+    def draw(self) -> List[pygame.Rect]:
+        """Draws the HUD of all players. Returns the changed areas."""
+        changed = list()
         for actor in self.players_context.actors:
-            self.draw_hud(actor)
+            changed += self.draw_hud(actor)
+        return changed
@@ -0,0 +1 @@
+from .context import Context, ParticleSystem, MAX_PARTICLES
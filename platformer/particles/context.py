@@ -0,0 +1,122 @@
+import numpy
+import math
+from typing import List
+
+from core import constants
+from platformer import physics
+
+
+MAX_PARTICLES: int = 10000
+
+# world units per second^2
+PARTICLE_GRAVITY: float = 9.81
+
+# colors used by the presets, indexed by the particles' color array
+PALETTE: List[str] = ['#c8b48c', '#fff08a', '#ff9b21', '#834222']
+DUST_COLOR: int = 0
+SPARK_COLOR: int = 1
+SPARK_ALT_COLOR: int = 2
+CRUMB_COLOR: int = 3
+
+
+class Context:
+    """Stores all particles in preallocated arrays. Only the first `count` entries are alive."""
+
+    def __init__(self, capacity: int = MAX_PARTICLES, seed=None):
+        self.capacity = capacity
+        self.count = 0
+
+        self.pos = numpy.zeros((capacity, 2), dtype=numpy.float32)
+        self.vel = numpy.zeros((capacity, 2), dtype=numpy.float32)
+        self.ttl = numpy.zeros(capacity, dtype=numpy.float32)
+        self.color = numpy.zeros(capacity, dtype=numpy.uint8)
+
+        self.rng = numpy.random.default_rng(seed)
+
+    def emit(self, x: float, y: float, num: int, color: int, speed: float, ttl_ms: int,
+             angle: float = math.pi / 2, spread: float = math.pi) -> int:
+        """Emits particles at the given world position. The particles move into the direction of the given angle
+        (radians, counterclockwise with 0 being right), randomly spread by the given range. Speed and lifetime are
+        randomized by up to 50%. Particles exceeding the capacity are dropped.
+        Returns the number of particles actually emitted.
+        """
+        num = min(num, self.capacity - self.count)
+        if num <= 0:
+            return 0
+
+        first = self.count
+        last = first + num
+
+        angles = angle + self.rng.uniform(-spread / 2, spread / 2, num)
+        speeds = speed * self.rng.uniform(0.5, 1.0, num)
+
+        self.pos[first:last, 0] = x
+        self.pos[first:last, 1] = y
+        self.vel[first:last, 0] = numpy.cos(angles) * speeds
+        self.vel[first:last, 1] = numpy.sin(angles) * speeds
+        self.ttl[first:last] = ttl_ms * self.rng.uniform(0.5, 1.0, num)
+        self.color[first:last] = color
+
+        self.count = last
+        return num
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def update(self, elapsed_ms: int) -> None:
+        """Moves all particles using a single vectorized step and drops the expired ones."""
+        n = self.count
+        if n == 0:
+            return
+
+        delta = elapsed_ms / 1000.0
+        self.vel[:n, 1] -= PARTICLE_GRAVITY * delta
+        self.pos[:n] += self.vel[:n] * delta
+        self.ttl[:n] -= elapsed_ms
+
+        alive = self.ttl[:n] > 0
+        num_alive = int(numpy.count_nonzero(alive))
+        if num_alive == n:
+            return
+
+        # move all alive particles to the front
+        self.pos[:num_alive] = self.pos[:n][alive]
+        self.vel[:num_alive] = self.vel[:n][alive]
+        self.ttl[:num_alive] = self.ttl[:n][alive]
+        self.color[:num_alive] = self.color[:n][alive]
+        self.count = num_alive
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+class ParticleSystem:
+    """Emits particles as visual feedback to physics events."""
+
+    def __init__(self, context: Context):
+        self.context = context
+
+    def on_landing(self, actor: physics.Actor) -> None:
+        """Kicks up dust at both sides of the actor's feet."""
+        self.context.emit(actor.pos.x, actor.pos.y, 12, DUST_COLOR, speed=1.5, ttl_ms=300, angle=0.0,
+                          spread=math.pi / 4)
+        self.context.emit(actor.pos.x, actor.pos.y, 12, DUST_COLOR, speed=1.5, ttl_ms=300, angle=math.pi,
+                          spread=math.pi / 4)
+
+    def on_impact_platform(self, proj: physics.Projectile, platform: physics.Platform) -> None:
+        """Axes cause sparks when hitting the ground."""
+        if proj.object_type != constants.ObjectType.WEAPON:
+            return
+
+        self.context.emit(proj.pos.x, proj.pos.y, 16, SPARK_COLOR, speed=4.0, ttl_ms=250)
+        self.context.emit(proj.pos.x, proj.pos.y, 8, SPARK_ALT_COLOR, speed=3.0, ttl_ms=200)
+
+    def on_touch_object(self, actor: physics.Actor, obj: physics.Object) -> None:
+        """Food crumbles when picked up."""
+        if obj.object_type != constants.ObjectType.FOOD:
+            return
+
+        self.context.emit(obj.pos.x, obj.pos.y, 20, CRUMB_COLOR, speed=2.0, ttl_ms=400)
+
+    def update(self, elapsed_ms: int) -> None:
+        self.context.update(elapsed_ms)
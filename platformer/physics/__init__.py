@@ -2,7 +2,11 @@ from .platforms import HoverType, Hovering, Platform
 from .ladders import Ladder
 from .objects import Object
 from .movement import FaceDirection
+from .collision import CollisionCategory
 from .actors import Actor
 from .projectiles import Projectile
+from .triggers import TriggerType, Trigger
+from .raycast import RayHit, Raycaster
+from .regions import Region
 from .context import Context, EventListener
 from .systems import System
@@ -4,7 +4,7 @@ from typing import Optional, Sequence, List
 
 from core import shapes
 
-from . import ladders, platforms, movement
+from . import ladders, platforms, movement, collision
 
 
 @dataclass
@@ -19,6 +19,10 @@ class Actor:
     can_climb: bool = True
     can_collide: bool = True
 
+    # collision filtering, see collision.is_relevant_pair
+    category: int = collision.CollisionCategory.PLAYER
+    mask: int = collision.ACTOR_MASK
+
     def can_fall(self) -> bool:
         """Returns True if the actor is neither at a ladder nor on a platform, else False."""
         return self.on_ladder is None and self.on_platform is None
@@ -0,0 +1,64 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from . import spatial
+
+
+# number of changes kept, older changes require a full rebuild
+MAX_CHANGES: int = 1024
+
+
+@dataclass
+class Change:
+    version: int
+    element: object
+    bounds: spatial.Bounds  # covers the element's old and new location
+
+
+def get_union(first: spatial.Bounds, second: spatial.Bounds) -> spatial.Bounds:
+    return min(first[0], second[0]), min(first[1], second[1]), max(first[2], second[2]), max(first[3], second[3])
+
+
+class ChangeLog:
+    """Records which elements changed since a given version.
+
+    Each recorded change increases the version. Consumers remember the version they are up to date with and ask for
+    all changes since then. If those changes are not available anymore, they need to rebuild from scratch.
+    """
+
+    def __init__(self, max_size: int = MAX_CHANGES):
+        self.version = 0
+        # all changes after this version are available
+        self.oldest_version = 0
+        self.changes: Deque[Change] = deque()
+        self.max_size = max_size
+
+    def record(self, element: object, bounds: spatial.Bounds) -> int:
+        """Records a change of the element within the bounds. Returns the new version."""
+        self.version += 1
+        self.changes.append(Change(version=self.version, element=element, bounds=bounds))
+        if len(self.changes) > self.max_size:
+            self.changes.popleft()
+            self.oldest_version = self.changes[0].version - 1
+        return self.version
+
+    def reset(self) -> int:
+        """Drops all changes, e.g. after everything was replaced. Returns the new version."""
+        self.version += 1
+        self.changes.clear()
+        self.oldest_version = self.version
+        return self.version
+
+    def since(self, version: int) -> Optional[List[Change]]:
+        """Returns all changes after the given version in order, or None if they are not available anymore."""
+        if version < self.oldest_version:
+            return None
+
+        result = list()
+        for change in reversed(self.changes):
+            if change.version <= version:
+                break
+            result.append(change)
+        result.reverse()
+        return result
@@ -0,0 +1,24 @@
+from enum import IntFlag
+
+
+class CollisionCategory(IntFlag):
+    NONE = 0
+    PLAYER = 1
+    ENEMY = 2
+    OBJECT = 4
+    PROJECTILE = 8
+    ALL = PLAYER | ENEMY | OBJECT | PROJECTILE
+
+
+# default masks: which categories an entity wants to collide with
+ACTOR_MASK: int = CollisionCategory.ALL
+ENEMY_MASK: int = CollisionCategory.PLAYER | CollisionCategory.PROJECTILE
+OBJECT_MASK: int = CollisionCategory.PLAYER
+PROJECTILE_MASK: int = CollisionCategory.PLAYER | CollisionCategory.ENEMY
+
+
+def is_relevant_pair(first, second) -> bool:
+    """Returns True if both entities' categories are within each other's masks, hence the pair needs to be tested.
+    Both entities are supposed to have the fields `category: int` and `mask: int`.
+    """
+    return first.category & second.mask != 0 and second.category & first.mask != 0
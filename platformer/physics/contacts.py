@@ -0,0 +1,52 @@
+from typing import Dict, Tuple, List, Set, Iterable
+
+
+Pair = Tuple[object, object]
+
+
+class ContactCache:
+    """Persistent set of overlapping (first, second) pairs, tracked by identity. Pairs are directed, unless they are
+    touched as unordered: then (first, second) and (second, first) are the same contact, which keeps the order it was
+    first touched in.
+
+    During an update, every overlapping pair is reported via touch(). Pairs which were not touched anymore are
+    returned by end_update().
+    """
+
+    def __init__(self):
+        self.pairs: Dict[Tuple[int, int], Pair] = dict()
+        self.touched: Set[Tuple[int, int]] = set()
+
+    def touch(self, first: object, second: object, unordered: bool = False) -> bool:
+        """Reports that both overlap. Returns True if the contact just began."""
+        key = (id(first), id(second))
+        if unordered and key[1] < key[0]:
+            key = (key[1], key[0])
+        self.touched.add(key)
+        if key in self.pairs:
+            return False
+
+        self.pairs[key] = (first, second)
+        return True
+
+    def end_update(self) -> List[Pair]:
+        """Returns all pairs which stopped overlapping during this update and forgets about them."""
+        ended = list()
+        if len(self.touched) < len(self.pairs):
+            for key in [key for key in self.pairs if key not in self.touched]:
+                ended.append(self.pairs.pop(key))
+        self.touched.clear()
+        return ended
+
+    def discard(self, elements: Iterable[object]) -> None:
+        """Forgets all pairs containing any of the elements, without reporting them as ended."""
+        doomed = {id(element) for element in elements}
+        if len(doomed) == 0:
+            return
+
+        for key in [key for key in self.pairs if key[0] in doomed or key[1] in doomed]:
+            del self.pairs[key]
+            self.touched.discard(key)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
@@ -1,10 +1,14 @@
 import pygame
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Iterable, Set, Tuple, Union, Dict
 
-from core import constants, objectids
-from . import platforms, ladders, objects, actors, projectiles
+from core import constants, objectids, pools
+from . import platforms, ladders, objects, actors, projectiles, tiles, triggers, spatial, raycast, regions, changes
+
+
+# larger triggers are tested for every position instead of being stored in the trigger lookup's cells
+MAX_TRIGGER_CELLS: int = 1024
 
 
 class Context:
@@ -14,38 +18,296 @@ class Context:
         self.objects: List[objects.Object] = list()
         self.actors = objectids.IdList[actors.Actor]()
         self.projectiles: List[projectiles.Projectile] = list()
+        self.triggers: List[triggers.Trigger] = list()
+
+        # lookup of the triggers which may contain a position
+        self.trigger_index = spatial.SpatialGrid[triggers.Trigger](max_cells=MAX_TRIGGER_CELLS)
+
+        # lookup for region queries, kept up to date by the create_*, remove_* and update_bounds() methods
+        self.platform_index = spatial.SpatialGrid[platforms.Platform]()
+        self.ladder_index = spatial.SpatialGrid[ladders.Ladder]()
+        self.object_index = spatial.SpatialGrid[objects.Object]()
+        self.actor_index = spatial.SpatialGrid[actors.Actor]()
+        self.projectile_index = spatial.SpatialGrid[projectiles.Projectile]()
+
+        # changes of platforms, ladders, objects and triggers, see changes_since()
+        self.change_log = changes.ChangeLog()
+
+        # optional collision layer for grid-aligned platforms, see build_tile_grid()
+        self.tile_grid: Optional[tiles.TileGrid] = None
+        # built on demand by get_raycaster()
+        self.raycaster: Optional[raycast.Raycaster] = None
+
+        # removed objects and projectiles are reused by the next create_* call
+        self.object_pool = pools.Pool(lambda: objects.Object(pos=pygame.math.Vector2(),
+                                                             object_type=constants.ObjectType.FOOD))
+        self.projectile_pool = pools.Pool(lambda: projectiles.Projectile(object_id=0, pos=pygame.math.Vector2()))
 
     def create_platform(self, x: float, y: float, width: int, height: int = 0) -> platforms.Platform:
         p = platforms.Platform(pos=pygame.math.Vector2(x, y), width=width, height=height)
         self.platforms.append(p)
+        self.platform_index.insert(p, regions.get_platform_bounds(p))
+        self._record_change(p, regions.get_platform_bounds(p))
         return p
 
     def create_ladder(self, x: float, y: float, height: int) -> ladders.Ladder:
         ladder = ladders.Ladder(pos=pygame.math.Vector2(x, y), height=height)
         self.ladders.append(ladder)
+        self.ladder_index.insert(ladder, regions.get_ladder_bounds(ladder))
+        self._record_change(ladder, regions.get_ladder_bounds(ladder))
         return ladder
 
     def create_object(self, x: float, y: float, object_type: constants.ObjectType) -> objects.Object:
-        o = objects.Object(pos=pygame.math.Vector2(x, y), object_type=object_type)
+        o = self.object_pool.acquire()
+        o.reset(x, y, object_type)
         self.objects.append(o)
+        self.object_index.insert(o, regions.get_object_bounds(o))
+        self._record_change(o, regions.get_object_bounds(o))
         return o
 
     def create_actor(self, object_id: int, x: float, y: float) -> actors.Actor:
         a = actors.Actor(object_id=object_id, pos=pygame.math.Vector2(x, y))
         self.actors.append(a)
+        self.actor_index.insert(a, regions.get_actor_bounds(a))
         return a
 
     def create_projectile(self, object_id: int, x: float, y: float,
                           object_type: constants.ObjectType = constants.ObjectType.WEAPON,
                           from_actor: Optional[actors.Actor] = None) -> projectiles.Projectile:
-        p = projectiles.Projectile(object_id=object_id, pos=pygame.math.Vector2(x, y), object_type=object_type,
-                                   from_actor=from_actor)
+        p = self.projectile_pool.acquire()
+        p.reset(object_id, x, y, object_type, from_actor)
         self.projectiles.append(p)
         if from_actor is not None:
             p.move.face_x = from_actor.move.face_x
             p.move.force.x = p.move.face_x
+        self.projectile_index.insert(p, regions.get_projectile_bounds(p))
         return p
 
+    def create_trigger(self, x: float, y: float, width: float, height: float,
+                       trigger_type: triggers.TriggerType = triggers.TriggerType.CHECKPOINT) -> triggers.Trigger:
+        t = triggers.Trigger(pos=pygame.math.Vector2(x, y), width=width, height=height, trigger_type=trigger_type)
+        self.triggers.append(t)
+        self.trigger_index.insert(t, t.get_bounds())
+        self._record_change(t, t.get_bounds())
+        return t
+
+    def remove_trigger(self, trigger: triggers.Trigger) -> None:
+        objectids.remove_instances(self.triggers, [trigger])
+        self._remove_from_index(self.trigger_index, trigger)
+
+    def get_triggers_at(self, pos: pygame.math.Vector2) -> List[triggers.Trigger]:
+        """Returns all triggers which contain the position, in creation order."""
+        candidates = self.trigger_index.query((pos.x, pos.y, pos.x, pos.y))
+        return [trigger for trigger in candidates if trigger.contains_point(pos)]
+
+    def build_tile_grid(self) -> None:
+        """Builds the collision layer for all grid-aligned platforms. Support and landing queries use it until the
+        next platform change is recorded, see mark_changed().
+        """
+        self.tile_grid = tiles.TileGrid(self.platforms)
+
+    def get_support_platform(self, pos: pygame.math.Vector2) -> Optional[platforms.Platform]:
+        """Returns any platform whose top edges the point is located, or None."""
+        if self.tile_grid is None:
+            return platforms.get_support_platform(pos, self.platforms)
+
+        platform = self.tile_grid.get_support_platform(pos)
+        if platform is not None:
+            return platform
+
+        return platforms.get_support_platform(pos, self.tile_grid.free_platforms)
+
+    def get_landing_platform(self, start_point: pygame.math.Vector2, end_point: pygame.math.Vector2) \
+            -> Optional[platforms.Platform]:
+        """Returns the closest platform that was traversed from above, or None."""
+        if self.tile_grid is None:
+            return platforms.get_landing_platform(start_point, end_point, self.platforms)
+
+        if start_point.y == end_point.y:
+            return None
+
+        candidates = self.tile_grid.get_landing_candidates(start_point, end_point)
+        platform = platforms.get_landing_platform(start_point, end_point, self.tile_grid.free_platforms)
+        if platform is not None:
+            candidates.append(platform)
+
+        # pick closest
+        return platforms.get_landing_platform(start_point, end_point, candidates)
+
+    def get_raycaster(self) -> raycast.Raycaster:
+        """Returns the raycaster for the current platforms. It is rebuilt after a platform change was recorded, see
+        mark_changed().
+        """
+        if self.raycaster is None:
+            self.raycaster = raycast.Raycaster(self.platforms)
+        return self.raycaster
+
+    def raycast(self, origin: pygame.math.Vector2, direction: pygame.math.Vector2,
+                max_distance: float = raycast.DEFAULT_MAX_DISTANCE) -> Optional[raycast.RayHit]:
+        """Returns the closest platform hit by the ray, or None."""
+        return self.get_raycaster().cast(origin, direction, max_distance)
+
+    def line_of_sight(self, start: pygame.math.Vector2, end: pygame.math.Vector2) -> bool:
+        """Returns True if no platform blocks the line between both positions."""
+        return self.get_raycaster().line_of_sight(start, end)
+
+    def remove_platform(self, platform: platforms.Platform) -> None:
+        objectids.remove_instances(self.platforms, [platform])
+        self._remove_from_index(self.platform_index, platform)
+
+    def remove_ladder(self, ladder: ladders.Ladder) -> None:
+        objectids.remove_instances(self.ladders, [ladder])
+        self._remove_from_index(self.ladder_index, ladder)
+
+    def remove_objects(self, doomed: Iterable[objects.Object]) -> None:
+        """Removes all given objects using a single pass over the list. Removed objects are kept for reuse."""
+        for obj in objectids.remove_instances(self.objects, doomed):
+            self._remove_from_index(self.object_index, obj)
+            self.object_pool.release(obj)
+
+    def remove_actors(self, object_ids: Set[int]) -> None:
+        """Removes all actors with the given object ids."""
+        for actor in self.actors:
+            if actor.object_id in object_ids:
+                self.actor_index.remove(actor)
+        self.actors.remove_by_ids(object_ids)
+
+    def remove_projectiles(self, doomed: Iterable[projectiles.Projectile]) -> None:
+        """Removes all given projectiles using a single pass over the list. Removed projectiles are kept for reuse."""
+        for proj in objectids.remove_instances(self.projectiles, doomed):
+            self.projectile_index.remove(proj)
+            self.projectile_pool.release(proj)
+
+    def clear_level(self) -> None:
+        """Removes all platforms, ladders, objects and triggers."""
+        for index in [self.platform_index, self.ladder_index, self.object_index, self.trigger_index]:
+            index.clear()
+        self.platforms.clear()
+        self.ladders.clear()
+        self.objects.clear()
+        self.triggers.clear()
+        self._reset_changes()
+
+    def apply_level(self, other: 'Context') -> None:
+        """Takes over the other context's platforms, ladders, objects and triggers, including their lookups."""
+        self.platforms = other.platforms
+        self.ladders = other.ladders
+        self.objects = other.objects
+        self.triggers = other.triggers
+        self.platform_index = other.platform_index
+        self.ladder_index = other.ladder_index
+        self.object_index = other.object_index
+        self.trigger_index = other.trigger_index
+        self._reset_changes()
+
+    def _get_index_and_bounds(self, element: object) -> Optional[Tuple[spatial.SpatialGrid, spatial.Bounds]]:
+        """Returns the lookup responsible for the element and the element's current bounds."""
+        if isinstance(element, actors.Actor):
+            return self.actor_index, regions.get_actor_bounds(element)
+        if isinstance(element, projectiles.Projectile):
+            return self.projectile_index, regions.get_projectile_bounds(element)
+        if isinstance(element, platforms.Platform):
+            return self.platform_index, regions.get_platform_bounds(element)
+        if isinstance(element, ladders.Ladder):
+            return self.ladder_index, regions.get_ladder_bounds(element)
+        if isinstance(element, objects.Object):
+            return self.object_index, regions.get_object_bounds(element)
+        if isinstance(element, triggers.Trigger):
+            return self.trigger_index, element.get_bounds()
+        return None
+
+    def update_bounds(self, element: object) -> None:
+        """Updates the lookup after the element was moved by the simulation, e.g. actors, projectiles and hovering
+        platforms. This is not recorded as a change. Elements not managed by this context are ignored.
+        """
+        found = self._get_index_and_bounds(element)
+        if found is not None and element in found[0]:
+            found[0].update(element, found[1])
+
+    def mark_changed(self, element: object) -> None:
+        """Updates the lookup after a platform, ladder, object or trigger was modified in place, e.g. by the editor.
+        The change is recorded with a region covering the element's old and new location.
+        """
+        found = self._get_index_and_bounds(element)
+        if found is None or element not in found[0]:
+            return
+
+        index, bounds = found
+        old_bounds = index.get_bounds(element)
+        index.update(element, bounds)
+        self._record_change(element, changes.get_union(old_bounds, bounds))
+
+    def _remove_from_index(self, index: spatial.SpatialGrid, element: object) -> None:
+        bounds = index.get_bounds(element)
+        if index.remove(element):
+            self._record_change(element, bounds)
+
+    def _record_change(self, element: object, bounds: spatial.Bounds) -> None:
+        self.change_log.record(element, bounds)
+        if isinstance(element, platforms.Platform):
+            # outdated collision layer and raycaster
+            self.tile_grid = None
+            self.raycaster = None
+
+    def _reset_changes(self) -> None:
+        self.change_log.reset()
+        self.tile_grid = None
+        self.raycaster = None
+
+    @property
+    def version(self) -> int:
+        """Increases with every recorded change."""
+        return self.change_log.version
+
+    def changes_since(self, version: int) -> Optional[List[changes.Change]]:
+        """Returns all changes after the given version in order. Returns None if they are not available anymore, e.g.
+        because the whole level was replaced, so the caller needs to rebuild everything.
+        """
+        return self.change_log.since(version)
+
+    def get_counts(self) -> Dict[str, int]:
+        """Returns the number of elements per kind."""
+        return {
+            'platforms': len(self.platforms),
+            'ladders': len(self.ladders),
+            'objects': len(self.objects),
+            'actors': len(self.actors),
+            'projectiles': len(self.projectiles),
+            'triggers': len(self.triggers)
+        }
+
+    def query_rect(self, x: float, y: float, width: float, height: float) -> regions.Region:
+        """Returns all elements overlapping the rectangle, given by its bottom left position and size. Ladders cover
+        the area they can be reached from.
+        """
+        rect = (x, y, x + width, y + height)
+        return regions.Region(
+            platforms=[p for p in self.platform_index.query(rect)
+                       if regions.bounds_overlap(rect, regions.get_platform_bounds(p))],
+            ladders=[ladder for ladder in self.ladder_index.query(rect)
+                     if regions.bounds_overlap(rect, regions.get_ladder_bounds(ladder))],
+            objects=[o for o in self.object_index.query(rect)
+                     if regions.circle_overlaps_bounds(o.pos.x, o.pos.y, constants.OBJECT_RADIUS, rect)],
+            actors=[a for a in self.actor_index.query(rect)
+                    if regions.circle_overlaps_bounds(a.pos.x, a.pos.y, a.radius, rect)],
+            projectiles=[p for p in self.projectile_index.query(rect)
+                         if regions.circle_overlaps_bounds(p.pos.x, p.pos.y, p.radius, rect)])
+
+    def query_circle(self, x: float, y: float, radius: float) -> regions.Region:
+        """Returns all elements overlapping the circle. Ladders cover the area they can be reached from."""
+        rect = regions.get_circle_bounds(x, y, radius)
+        return regions.Region(
+            platforms=[p for p in self.platform_index.query(rect)
+                       if regions.circle_overlaps_bounds(x, y, radius, regions.get_platform_bounds(p))],
+            ladders=[ladder for ladder in self.ladder_index.query(rect)
+                     if regions.circle_overlaps_bounds(x, y, radius, regions.get_ladder_bounds(ladder))],
+            objects=[o for o in self.object_index.query(rect)
+                     if regions.circles_overlap(x, y, radius, o.pos.x, o.pos.y, constants.OBJECT_RADIUS)],
+            actors=[a for a in self.actor_index.query(rect)
+                    if regions.circles_overlap(x, y, radius, a.pos.x, a.pos.y, a.radius)],
+            projectiles=[p for p in self.projectile_index.query(rect)
+                         if regions.circles_overlap(x, y, radius, p.pos.x, p.pos.y, p.radius)])
+
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -79,10 +341,28 @@ class EventListener(ABC):
     def on_impact_actor(self, projectile: projectiles.Projectile, actor: actors.Actor) -> None:
         """Triggered when the projectile impact at the actor."""
 
+    @abstractmethod
+    def on_contact_begin(self, actor: actors.Actor, other: Union[objects.Object, actors.Actor]) -> None:
+        """Triggered when the actor starts touching the object or other actor. A contact between two actors is
+        reported once, with the actor which found it first.
+        """
+
+    @abstractmethod
+    def on_contact_end(self, actor: actors.Actor, other: Union[objects.Object, actors.Actor]) -> None:
+        """Triggered when the actor stops touching the object or other actor."""
+
     @abstractmethod
     def on_touch_object(self, actor: actors.Actor, obj: objects.Object) -> None:
-        """Triggered when the actor touches at the object."""
+        """Triggered on every update while the actor touches the object, if enabled."""
 
     @abstractmethod
     def on_touch_actor(self, actor: actors.Actor, other: actors.Actor) -> None:
-        """Triggered when the actor touches the other actor."""
+        """Triggered on every update while the actor touches the other actor, if enabled."""
+
+    @abstractmethod
+    def on_enter(self, actor: actors.Actor, trigger: triggers.Trigger) -> None:
+        """Triggered when the actor enters the trigger zone."""
+
+    @abstractmethod
+    def on_exit(self, actor: actors.Actor, trigger: triggers.Trigger) -> None:
+        """Triggered when the actor leaves the trigger zone."""
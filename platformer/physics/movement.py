@@ -20,6 +20,12 @@ class MovementData:
     face_x: FaceDirection = FaceDirection.RIGHT
     force: pygame.math.Vector2 = field(default_factory=pygame.math.Vector2)
 
+    def reset(self) -> None:
+        """Resets speed, facing direction and force in place."""
+        self.speed = 1.0
+        self.face_x = FaceDirection.RIGHT
+        self.force.update(0.0, 0.0)
+
     def get_jump_height_difference(self, elapsed_ms: int) -> float:
         """Calculates falling distances using f(x) = a * t^2.
         Returns the secant growth within a few elapsed_ms.
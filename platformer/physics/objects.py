@@ -3,12 +3,25 @@ from dataclasses import dataclass
 
 from core import constants, shapes
 
+from . import collision
+
 
 @dataclass
 class Object:
     pos: pygame.math.Vector2  # center
     object_type: constants.ObjectType
 
+    # collision filtering, see collision.is_relevant_pair
+    category: int = collision.CollisionCategory.OBJECT
+    mask: int = collision.OBJECT_MASK
+
+    def reset(self, x: float, y: float, object_type: constants.ObjectType) -> None:
+        """Reinitializes a reused object in place."""
+        self.pos.update(x, y)
+        self.object_type = object_type
+        self.category = collision.CollisionCategory.OBJECT
+        self.mask = collision.OBJECT_MASK
+
     def get_circ(self) -> shapes.Circ:
         """Returns the object's bounding circle."""
         return shapes.Circ(*self.pos, constants.OBJECT_RADIUS)
@@ -4,7 +4,7 @@ from typing import Optional
 
 from core import constants, shapes
 
-from . import movement, actors, platforms
+from . import movement, actors, platforms, collision
 
 
 GRAVITY_WEIGHT: float = 0.1
@@ -19,6 +19,22 @@ class Projectile:
     move: movement.MovementData = field(default_factory=movement.MovementData)
     from_actor: Optional[actors.Actor] = None
 
+    # collision filtering, see collision.is_relevant_pair
+    category: int = collision.CollisionCategory.PROJECTILE
+    mask: int = collision.PROJECTILE_MASK
+
+    def reset(self, object_id: int, x: float, y: float, object_type: constants.ObjectType,
+              from_actor: Optional[actors.Actor]) -> None:
+        """Reinitializes a reused projectile in place."""
+        self.object_id = object_id
+        self.pos.update(x, y)
+        self.radius = constants.OBJECT_RADIUS
+        self.object_type = object_type
+        self.move.reset()
+        self.from_actor = from_actor
+        self.category = collision.CollisionCategory.PROJECTILE
+        self.mask = collision.PROJECTILE_MASK
+
     def get_circ(self) -> shapes.Circ:
         """Returns the projectile's bounding circle."""
         return shapes.Circ(*self.pos, self.radius)
@@ -34,10 +50,10 @@ class Projectile:
         if landing_pos is None:
             return
 
-        self.pos = landing_pos.copy()
-        self.move.force = pygame.math.Vector2()
+        self.pos.update(landing_pos)
+        self.move.force.update(0.0, 0.0)
 
     def collide_with_platform(self, old_pos: pygame.math.Vector2) -> None:
         """Handles colliding with a platform by resetting the position, the force vector and similar things."""
-        self.pos = old_pos.copy()
-        self.move.force = pygame.math.Vector2()
+        self.pos.update(old_pos)
+        self.move.force.update(0.0, 0.0)
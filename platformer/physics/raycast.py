@@ -0,0 +1,240 @@
+import pygame
+import math
+import numpy
+from dataclasses import dataclass
+from typing import Sequence, List, Optional, Tuple
+
+from . import spatial
+from .regions import get_platform_bounds
+from .platforms import Platform
+
+
+DEFAULT_MAX_DISTANCE: float = 100.0
+
+# number of rays tested at once by cast_many(), limits the size of the temporary arrays
+BATCH_SIZE: int = 64
+
+PARALLEL_EPSILON: float = 1e-30
+
+
+@dataclass
+class RayHit:
+    platform: Platform
+    distance: float
+
+
+def get_ray_distance(ox: float, oy: float, dx: float, dy: float, bounds: spatial.Bounds) -> Optional[float]:
+    """Returns the distance along the normalized direction at which the ray enters the bounds, or None.
+
+    A ray which starts on an edge and moves away from the bounds or runs along the right or top edge does not hit.
+    Hence a ray leaving a platform's top edge upwards is not blocked by it.
+    """
+    left, bottom, right, top = bounds
+    t_near = 0.0
+    t_far = math.inf
+
+    if dx == 0.0:
+        if ox < left or ox >= right:
+            return None
+    else:
+        t1 = (left - ox) / dx
+        t2 = (right - ox) / dx
+        t_near = max(t_near, min(t1, t2))
+        t_far = min(t_far, max(t1, t2))
+
+    if dy == 0.0:
+        if oy < bottom or oy >= top:
+            return None
+    else:
+        t1 = (bottom - oy) / dy
+        t2 = (top - oy) / dy
+        t_near = max(t_near, min(t1, t2))
+        t_far = min(t_far, max(t1, t2))
+
+    if t_near > t_far or t_far <= 0.0:
+        return None
+
+    return t_near
+
+
+def _get_slab(origins: numpy.ndarray, inv_directions: numpy.ndarray, low: numpy.ndarray,
+              high: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Returns the (near, far) distances of all rays (rows) to all slabs (columns) along one axis."""
+    t1 = (low[None, :] - origins[:, None]) * inv_directions[:, None]
+    t2 = (high[None, :] - origins[:, None]) * inv_directions[:, None]
+    return numpy.minimum(t1, t2), numpy.maximum(t1, t2)
+
+
+class Raycaster:
+    """Answers raycasts against a snapshot of the platforms.
+
+    Static platforms are stored in a uniform grid for single casts and as bounds arrays for batched casts. Hovering
+    platforms move every frame, so they are always tested at their current position.
+    """
+
+    def __init__(self, platform_seq: Sequence[Platform], cell_size: float = spatial.DEFAULT_CELL_SIZE):
+        self.static_platforms = [platform for platform in platform_seq if not platform.hover.does_move()]
+        self.moving_platforms = [platform for platform in platform_seq if platform.hover.does_move()]
+
+        self.grid = spatial.SpatialGrid[Platform](cell_size)
+        for platform in self.static_platforms:
+            self.grid.insert(platform, get_platform_bounds(platform))
+
+        if len(self.grid.cells) > 0:
+            self.min_cell = (min(x for x, _ in self.grid.cells), min(y for _, y in self.grid.cells))
+            self.max_cell = (max(x for x, _ in self.grid.cells), max(y for _, y in self.grid.cells))
+        else:
+            self.min_cell = (0, 0)
+            self.max_cell = (-1, -1)
+
+        self.static_bounds = numpy.array([get_platform_bounds(platform) for platform in self.static_platforms],
+                                         dtype=numpy.float64).reshape(-1, 4)
+
+    def _is_leaving_grid(self, cx: int, cy: int, step_x: int, step_y: int) -> bool:
+        """Returns True if the cell is outside the occupied cells and the ray moves away from them."""
+        (min_x, min_y), (max_x, max_y) = self.min_cell, self.max_cell
+        return (cx < min_x and step_x <= 0) or (cx > max_x and step_x >= 0) or \
+            (cy < min_y and step_y <= 0) or (cy > max_y and step_y >= 0)
+
+    @staticmethod
+    def _is_closer(distance: Optional[float], best: Optional[Platform], best_distance: float) -> bool:
+        if distance is None:
+            return False
+        if best is None:
+            return distance <= best_distance
+        return distance < best_distance
+
+    def cast(self, origin: pygame.math.Vector2, direction: pygame.math.Vector2,
+             max_distance: float = DEFAULT_MAX_DISTANCE) -> Optional[RayHit]:
+        """Returns the closest platform hit within max_distance, or None. The grid is traversed cell by cell, so only
+        platforms near the ray are tested.
+        """
+        length = direction.length()
+        if length == 0.0:
+            return None
+
+        ox, oy = origin.x, origin.y
+        dx, dy = direction.x / length, direction.y / length
+        best: Optional[Platform] = None
+        best_distance = max_distance
+
+        for platform in self.moving_platforms:
+            distance = get_ray_distance(ox, oy, dx, dy, get_platform_bounds(platform))
+            if self._is_closer(distance, best, best_distance):
+                best, best_distance = platform, distance
+
+        cell_size = self.grid.cell_size
+        cx = math.floor(ox / cell_size)
+        cy = math.floor(oy / cell_size)
+        step_x = 1 if dx > 0.0 else -1 if dx < 0.0 else 0
+        step_y = 1 if dy > 0.0 else -1 if dy < 0.0 else 0
+        t_delta_x = cell_size / abs(dx) if dx != 0.0 else math.inf
+        t_delta_y = cell_size / abs(dy) if dy != 0.0 else math.inf
+        t_max_x = ((cx + (step_x > 0)) * cell_size - ox) / dx if dx != 0.0 else math.inf
+        t_max_y = ((cy + (step_y > 0)) * cell_size - oy) / dy if dy != 0.0 else math.inf
+
+        tested = set()
+        t = 0.0
+        while t <= best_distance and not self._is_leaving_grid(cx, cy, step_x, step_y):
+            for platform in self.grid.cells.get((cx, cy), ()):
+                if id(platform) in tested:
+                    continue
+                tested.add(id(platform))
+                distance = get_ray_distance(ox, oy, dx, dy, get_platform_bounds(platform))
+                if self._is_closer(distance, best, best_distance):
+                    best, best_distance = platform, distance
+
+            if t_max_x < t_max_y:
+                t = t_max_x
+                t_max_x += t_delta_x
+                cx += step_x
+            else:
+                t = t_max_y
+                t_max_y += t_delta_y
+                cy += step_y
+
+        if best is None:
+            return None
+
+        return RayHit(platform=best, distance=best_distance)
+
+    def cast_many(self, origins: numpy.ndarray, directions: numpy.ndarray,
+                  max_distance: float = DEFAULT_MAX_DISTANCE) -> Tuple[List[Optional[Platform]], numpy.ndarray]:
+        """Casts all rays given as (n, 2) arrays of origins and directions at once.
+        Returns the closest platform hit per ray (or None) and an array of distances (inf for misses).
+
+        Rays are sorted by origin and tested in batches using a vectorised slab test. Each batch is only tested
+        against the platforms overlapping the area its rays can reach.
+        """
+        origins = numpy.asarray(origins, dtype=numpy.float64).reshape(-1, 2)
+        directions = numpy.asarray(directions, dtype=numpy.float64).reshape(-1, 2)
+
+        candidates = self.static_platforms + self.moving_platforms
+        moving_bounds = numpy.array([get_platform_bounds(platform) for platform in self.moving_platforms],
+                                    dtype=numpy.float64).reshape(-1, 4)
+        bounds = numpy.concatenate((self.static_bounds, moving_bounds))
+
+        num_rays = origins.shape[0]
+        distances = numpy.full(num_rays, numpy.inf)
+        indices = numpy.full(num_rays, -1, dtype=numpy.int64)
+        if num_rays == 0 or bounds.shape[0] == 0:
+            return [None] * num_rays, distances
+
+        lengths = numpy.hypot(directions[:, 0], directions[:, 1])
+        valid = lengths > 0.0
+        unit = directions / numpy.where(valid, lengths, 1.0)[:, None]
+        # rays parallel to an axis get a tiny positive component, which keeps the slab test free of inf * 0
+        unit = numpy.where(unit == 0.0, PARALLEL_EPSILON, unit)
+        inv_unit = 1.0 / unit
+
+        # neighbouring rays are tested together, so each batch only needs the platforms near its rays
+        order = numpy.argsort(origins[:, 0], kind='stable')
+        reach = max_distance if math.isfinite(max_distance) else 0.0
+        ends = origins + unit * reach
+
+        for start in range(0, num_rays, BATCH_SIZE):
+            rows = order[start:start + BATCH_SIZE]
+            if math.isfinite(max_distance):
+                low = numpy.minimum(origins[rows], ends[rows]).min(axis=0)
+                high = numpy.maximum(origins[rows], ends[rows]).max(axis=0)
+                columns = numpy.nonzero((bounds[:, 0] <= high[0]) & (bounds[:, 2] >= low[0]) &
+                                        (bounds[:, 1] <= high[1]) & (bounds[:, 3] >= low[1]))[0]
+            else:
+                columns = numpy.arange(bounds.shape[0])
+            if columns.shape[0] == 0:
+                continue
+
+            near_x, far_x = _get_slab(origins[rows, 0], inv_unit[rows, 0], bounds[columns, 0], bounds[columns, 2])
+            near_y, far_y = _get_slab(origins[rows, 1], inv_unit[rows, 1], bounds[columns, 1], bounds[columns, 3])
+
+            near = numpy.maximum(numpy.maximum(near_x, near_y), 0.0)
+            far = numpy.minimum(far_x, far_y)
+            hit = (near <= far) & (far > 0.0) & (near <= max_distance) & valid[rows, None]
+            near = numpy.where(hit, near, numpy.inf)
+
+            closest = numpy.argmin(near, axis=1)
+            closest_distance = near[numpy.arange(rows.shape[0]), closest]
+            found = numpy.isfinite(closest_distance)
+            distances[rows] = closest_distance
+            indices[rows] = numpy.where(found, columns[closest], -1)
+
+        hits = [candidates[index] if index >= 0 else None for index in indices.tolist()]
+        return hits, distances
+
+    def line_of_sight(self, start: pygame.math.Vector2, end: pygame.math.Vector2) -> bool:
+        """Returns True if no platform blocks the line between both positions."""
+        delta = end - start
+        if delta.length_squared() == 0.0:
+            return True
+
+        return self.cast(start, delta, max_distance=delta.length()) is None
+
+    def line_of_sight_many(self, starts: numpy.ndarray, ends: numpy.ndarray) -> numpy.ndarray:
+        """Batched version of line_of_sight() for (n, 2) arrays. Returns a boolean array."""
+        starts = numpy.asarray(starts, dtype=numpy.float64).reshape(-1, 2)
+        deltas = numpy.asarray(ends, dtype=numpy.float64).reshape(-1, 2) - starts
+        lengths = numpy.hypot(deltas[:, 0], deltas[:, 1])
+
+        max_distance = float(lengths.max()) if lengths.shape[0] > 0 else 0.0
+        _, distances = self.cast_many(starts, deltas, max_distance=max_distance)
+        return (distances > lengths) | (lengths == 0.0)
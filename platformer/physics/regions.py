@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from core import constants
+
+from . import spatial
+from .platforms import Platform
+from .ladders import Ladder
+from .objects import Object
+from .actors import Actor
+from .projectiles import Projectile
+
+
+@dataclass
+class Region:
+    """Result of a region query on the physics context."""
+    platforms: List[Platform] = field(default_factory=list)
+    ladders: List[Ladder] = field(default_factory=list)
+    objects: List[Object] = field(default_factory=list)
+    actors: List[Actor] = field(default_factory=list)
+    projectiles: List[Projectile] = field(default_factory=list)
+
+
+def get_platform_bounds(platform: Platform) -> spatial.Bounds:
+    return platform.pos.x, platform.pos.y, platform.pos.x + platform.width, platform.pos.y + platform.height
+
+
+def get_ladder_bounds(ladder: Ladder) -> spatial.Bounds:
+    """Returns the area the ladder can be reached from."""
+    return ladder.pos.x - constants.OBJECT_RADIUS, ladder.pos.y, ladder.pos.x + constants.OBJECT_RADIUS, \
+        ladder.pos.y + ladder.height
+
+
+def get_circle_bounds(x: float, y: float, radius: float) -> spatial.Bounds:
+    return x - radius, y - radius, x + radius, y + radius
+
+
+def get_object_bounds(obj: Object) -> spatial.Bounds:
+    return get_circle_bounds(obj.pos.x, obj.pos.y, constants.OBJECT_RADIUS)
+
+
+def get_actor_bounds(actor: Actor) -> spatial.Bounds:
+    return get_circle_bounds(actor.pos.x, actor.pos.y, actor.radius)
+
+
+def get_projectile_bounds(proj: Projectile) -> spatial.Bounds:
+    return get_circle_bounds(proj.pos.x, proj.pos.y, proj.radius)
+
+
+def bounds_overlap(first: spatial.Bounds, second: spatial.Bounds) -> bool:
+    """Test whether both bounds overlap, touching edges included."""
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+
+def circle_overlaps_bounds(x: float, y: float, radius: float, bounds: spatial.Bounds) -> bool:
+    """Test whether the circle overlaps the bounds, touching included."""
+    closest_x = min(max(x, bounds[0]), bounds[2])
+    closest_y = min(max(y, bounds[1]), bounds[3])
+    return (x - closest_x) ** 2 + (y - closest_y) ** 2 <= radius ** 2
+
+
+def circles_overlap(x1: float, y1: float, r1: float, x2: float, y2: float, r2: float) -> bool:
+    return (x1 - x2) ** 2 + (y1 - y2) ** 2 <= (r1 + r2) ** 2
@@ -0,0 +1,136 @@
+import math
+from typing import TypeVar, Generic, Dict, List, Tuple, Optional
+
+
+T = TypeVar('T')
+
+# left, bottom, right, top in world coordinates
+Bounds = Tuple[float, float, float, float]
+
+CellRange = Tuple[int, int, int, int]
+
+DEFAULT_CELL_SIZE: float = 4.0
+
+
+class SpatialGrid(Generic[T]):
+    """Uniform grid which maps each cell to the elements whose bounds overlap it. Elements are tracked by identity, so
+    they do not need to be hashable.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE, max_cells: Optional[int] = None):
+        """If max_cells is given, elements covering more cells are not stored in the cells, but returned by every
+        query instead, e.g. a kill zone below the whole level.
+        """
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self.cells: Dict[Tuple[int, int], List[T]] = dict()
+        # id(element) -> element, for elements covering more than max_cells
+        self.oversized: Dict[int, T] = dict()
+
+        # id(element) -> (element, covered cells, insertion number, bounds)
+        self.entries: Dict[int, Tuple[T, CellRange, int, Bounds]] = dict()
+        self.next_seq = 0
+
+    def get_cell_range(self, bounds: Bounds) -> CellRange:
+        """Returns the range (x0, y0, x1, y1) of cells covered by the bounds, all inclusive."""
+        left, bottom, right, top = bounds
+        return (math.floor(left / self.cell_size), math.floor(bottom / self.cell_size),
+                math.floor(right / self.cell_size), math.floor(top / self.cell_size))
+
+    def is_oversized(self, cell_range: CellRange) -> bool:
+        if self.max_cells is None:
+            return False
+
+        x0, y0, x1, y1 = cell_range
+        return (x1 - x0 + 1) * (y1 - y0 + 1) > self.max_cells
+
+    def _add_to_cells(self, element: T, cell_range: CellRange) -> None:
+        if self.is_oversized(cell_range):
+            self.oversized[id(element)] = element
+            return
+
+        x0, y0, x1, y1 = cell_range
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                self.cells.setdefault((x, y), list()).append(element)
+
+    def _remove_from_cells(self, element: T, cell_range: CellRange) -> None:
+        if self.is_oversized(cell_range):
+            del self.oversized[id(element)]
+            return
+
+        x0, y0, x1, y1 = cell_range
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                cell = self.cells[(x, y)]
+                for index, other in enumerate(cell):
+                    if other is element:
+                        del cell[index]
+                        break
+                if len(cell) == 0:
+                    del self.cells[(x, y)]
+
+    def insert(self, element: T, bounds: Bounds) -> None:
+        """Adds the element with the given bounds. If it is already contained, it is updated instead."""
+        if id(element) in self.entries:
+            self.update(element, bounds)
+            return
+
+        cell_range = self.get_cell_range(bounds)
+        self._add_to_cells(element, cell_range)
+        self.entries[id(element)] = (element, cell_range, self.next_seq, bounds)
+        self.next_seq += 1
+
+    def remove(self, element: T) -> bool:
+        """Removes the element. Returns False if it was not contained."""
+        entry = self.entries.pop(id(element), None)
+        if entry is None:
+            return False
+
+        self._remove_from_cells(element, entry[1])
+        return True
+
+    def update(self, element: T, bounds: Bounds) -> None:
+        """Moves the element to its new bounds. The cells are only touched if it covers different cells now."""
+        entry = self.entries.get(id(element))
+        if entry is None:
+            self.insert(element, bounds)
+            return
+
+        cell_range = self.get_cell_range(bounds)
+        if cell_range != entry[1]:
+            self._remove_from_cells(element, entry[1])
+            self._add_to_cells(element, cell_range)
+        self.entries[id(element)] = (element, cell_range, entry[2], bounds)
+
+    def get_bounds(self, element: T) -> Optional[Bounds]:
+        """Returns the bounds the element was last inserted or updated with, or None if it is not contained."""
+        entry = self.entries.get(id(element))
+        return entry[3] if entry is not None else None
+
+    def query(self, bounds: Bounds) -> List[T]:
+        """Returns all elements whose cells overlap the bounds' cells, in insertion order. Since only cells are
+        compared, the caller needs to test the elements' actual shapes. Oversized elements are always returned.
+        """
+        x0, y0, x1, y1 = self.get_cell_range(bounds)
+        found: Dict[int, T] = dict(self.oversized)
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                for element in self.cells.get((x, y), ()):
+                    found[id(element)] = element
+
+        if len(found) <= 1:
+            return list(found.values())
+
+        return sorted(found.values(), key=lambda element: self.entries[id(element)][2])
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.oversized.clear()
+        self.entries.clear()
+
+    def __contains__(self, element: T) -> bool:
+        return id(element) in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
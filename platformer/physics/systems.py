@@ -1,15 +1,22 @@
 import pygame
 
-from . import platforms, ladders, actors, projectiles
+from typing import Dict, List, Iterable
+
+from . import platforms, ladders, actors, projectiles, collision, triggers, contacts
 from .context import EventListener, Context
 
 
 class ActorSystem(object):
-    """Handles updating all actors."""
+    """Handles updating all actors. Overlaps with objects and other actors are reported when they begin and end.
+    If report_stay is enabled, on_touch_object and on_touch_actor are additionally triggered on every update while
+    overlapping.
+    """
 
-    def __init__(self, listener: EventListener, context: Context):
+    def __init__(self, listener: EventListener, context: Context, report_stay: bool = False):
         self.listener = listener
         self.context = context
+        self.report_stay = report_stay
+        self.contacts = contacts.ContactCache()
 
     def handle_ladders(self, actor: actors.Actor) -> None:
         """Handles grabbing and releasing a ladder."""
@@ -60,14 +67,14 @@ class ActorSystem(object):
         """Handles landing on a platform."""
         has_reloaded_support_platform = False
 
-        platform = platforms.get_landing_platform(old_pos, actor.pos, self.context.platforms)
+        platform = self.context.get_landing_platform(old_pos, actor.pos)
         if platform is not None:
             actor.land_on_platform(platform, old_pos)
             has_reloaded_support_platform = True
             self.listener.on_landing(actor)
 
         if not has_reloaded_support_platform:
-            actor.on_platform = platforms.get_support_platform(actor.pos, self.context.platforms)
+            actor.on_platform = self.context.get_support_platform(actor.pos)
 
     def handle_platform_collision(self, actor: actors.Actor, old_pos: pygame.math.Vector2) -> None:
         """Handles collision with platforms."""
@@ -80,21 +87,38 @@ class ActorSystem(object):
 
     def handle_object_collision(self, actor: actors.Actor) -> None:
         """Finds and reports collisions between the actor and all relevant objects."""
+        if actor.mask & collision.CollisionCategory.OBJECT == 0:
+            # not interested in any object
+            return
+
         circ1 = actor.get_circ()
         for obj in self.context.objects:
+            if not collision.is_relevant_pair(actor, obj):
+                continue
             circ2 = obj.get_circ()
             if circ1.collidecirc(circ2):
-                self.listener.on_touch_object(actor, obj)
+                if self.contacts.touch(actor, obj):
+                    self.listener.on_contact_begin(actor, obj)
+                if self.report_stay:
+                    self.listener.on_touch_object(actor, obj)
 
     def handle_actor_collision(self, actor: actors.Actor) -> None:
         """Finds and reports collisions between the actor and all relevant actors."""
+        if actor.mask & (collision.CollisionCategory.PLAYER | collision.CollisionCategory.ENEMY) == 0:
+            # not interested in any actor
+            return
+
         circ1 = actor.get_circ()
         for other in self.context.actors:
-            if actor == other:
+            if actor == other or not collision.is_relevant_pair(actor, other):
                 continue
             circ2 = other.get_circ()
             if circ1.collidecirc(circ2):
-                self.listener.on_touch_actor(actor, other)
+                # both actors find each other, but the contact is reported once
+                if self.contacts.touch(actor, other, unordered=True):
+                    self.listener.on_contact_begin(actor, other)
+                if self.report_stay:
+                    self.listener.on_touch_actor(actor, other)
 
     def update(self, elapsed_ms: int) -> None:
         for actor in self.context.actors:
@@ -108,6 +132,10 @@ class ActorSystem(object):
 
             self.handle_object_collision(actor)
             self.handle_actor_collision(actor)
+            self.context.update_bounds(actor)
+
+        for actor, other in self.contacts.end_update():
+            self.listener.on_contact_end(actor, other)
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -130,7 +158,7 @@ class ProjectileSystem(object):
 
     def handle_platform_collision(self, projectile: projectiles.Projectile, old_pos: pygame.math.Vector2) -> None:
         """Checks for platform collision, both from above and x-wise."""
-        platform = platforms.get_landing_platform(old_pos, projectile.pos, self.context.platforms)
+        platform = self.context.get_landing_platform(old_pos, projectile.pos)
         if platform is not None:
             projectile.land_on_platform(platform, old_pos)
             self.listener.on_impact_platform(projectile, platform)
@@ -145,7 +173,7 @@ class ProjectileSystem(object):
         """Finds and reports collisions between the projectile and all relevant actors."""
         circ1 = projectile.get_circ()
         for actor in self.context.actors:
-            if not projectile.can_hit(actor):
+            if not collision.is_relevant_pair(projectile, actor) or not projectile.can_hit(actor):
                 continue
             circ2 = actor.get_circ()
             if circ1.collidecirc(circ2):
@@ -157,6 +185,46 @@ class ProjectileSystem(object):
             old_pos = self.handle_movement(projectile, elapsed_ms)
             self.handle_platform_collision(projectile, old_pos)
             self.handle_actor_collision(projectile)
+            self.context.update_bounds(projectile)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+class TriggerSystem(object):
+    """Tracks which trigger zones each actor is inside and reports changes only."""
+
+    def __init__(self, listener: EventListener, context: Context):
+        self.listener = listener
+        self.context = context
+        # id(actor) -> triggers the actor was inside during the last update
+        self.inside: Dict[int, List[triggers.Trigger]] = dict()
+
+    def handle_actor(self, actor: actors.Actor, previous: List[triggers.Trigger]) -> List[triggers.Trigger]:
+        """Reports leaving and entering trigger zones. Returns the triggers the actor is inside now."""
+        current = self.context.get_triggers_at(actor.pos)
+
+        for trigger in previous:
+            if not any(trigger is other for other in current):
+                self.listener.on_exit(actor, trigger)
+
+        for trigger in current:
+            if not any(trigger is other for other in previous):
+                self.listener.on_enter(actor, trigger)
+
+        return current
+
+    def update(self) -> None:
+        if len(self.context.triggers) == 0 and len(self.inside) == 0:
+            return
+
+        # removed actors are dropped without reporting
+        inside = dict()
+        for actor in self.context.actors:
+            current = self.handle_actor(actor, self.inside.get(id(actor), []))
+            if len(current) > 0:
+                inside[id(actor)] = current
+        self.inside = inside
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -166,7 +234,13 @@ class System:
     def __init__(self, listener: EventListener, context: Context):
         self.actor_system = ActorSystem(listener, context)
         self.projectile_system = ProjectileSystem(listener, context)
+        self.trigger_system = TriggerSystem(listener, context)
 
     def update(self, elapsed_ms: int) -> None:
         self.actor_system.update(elapsed_ms)
         self.projectile_system.update(elapsed_ms)
+        self.trigger_system.update()
+
+    def discard_contacts(self, elements: Iterable[object]) -> None:
+        """Forgets the contacts of removed objects or actors without reporting their end."""
+        self.actor_system.contacts.discard(elements)
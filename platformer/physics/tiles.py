@@ -0,0 +1,134 @@
+import pygame
+import math
+from typing import Sequence, List, Optional, Tuple
+
+from .platforms import Platform
+
+
+def is_grid_aligned(platform: Platform) -> bool:
+    """Returns True if the platform is located at integer coordinates and does not hover."""
+    return not platform.hover.does_move() and platform.pos.x == int(platform.pos.x) and \
+        platform.pos.y == int(platform.pos.y)
+
+
+class TileGrid:
+    """Collision layer for grid-aligned platforms. Each cell (x, y) covers [x; x+1) x [y; y+1) in world coordinates.
+
+    Solid cells and cells containing a platform's top edge are stored as bit-packed rows, so testing a cell is O(1).
+    The platform owning a top edge cell is stored as well. If platforms overlap, the first one wins.
+    All platforms that are not grid-aligned (including hovering ones) are kept in `free_platforms` and need to be
+    searched as usual.
+    """
+
+    def __init__(self, platform_seq: Sequence[Platform]):
+        self.free_platforms: List[Platform] = [platform for platform in platform_seq
+                                               if not is_grid_aligned(platform)]
+        aligned = [platform for platform in platform_seq if is_grid_aligned(platform)]
+
+        if len(aligned) > 0:
+            self.left = int(min(platform.pos.x for platform in aligned))
+            self.bottom = int(min(platform.pos.y for platform in aligned))
+            right = int(max(platform.pos.x + platform.width for platform in aligned))
+            top = int(max(platform.pos.y + platform.height for platform in aligned))
+        else:
+            self.left = self.bottom = right = top = 0
+
+        # the topmost row only holds top edges
+        self.num_cols = right - self.left
+        self.num_rows = top - self.bottom + 1
+        self.stride = (self.num_cols + 7) // 8
+
+        self.solid = bytearray(self.stride * self.num_rows)
+        self.top = bytearray(self.stride * self.num_rows)
+        self.top_platforms: List[Optional[Platform]] = [None] * (self.num_cols * self.num_rows)
+
+        for platform in aligned:
+            self.add_platform(platform)
+
+    def _set_bit(self, bits: bytearray, col: int, row: int) -> None:
+        bits[row * self.stride + (col >> 3)] |= 1 << (col & 7)
+
+    def _get_bit(self, bits: bytearray, col: int, row: int) -> bool:
+        return bits[row * self.stride + (col >> 3)] & (1 << (col & 7)) != 0
+
+    def _to_cell(self, x: float, y: float) -> Optional[Tuple[int, int]]:
+        """Returns the (column, row) of the cell containing the position, or None if outside the grid."""
+        col = math.floor(x) - self.left
+        row = math.floor(y) - self.bottom
+        if 0 <= col < self.num_cols and 0 <= row < self.num_rows:
+            return col, row
+        return None
+
+    def add_platform(self, platform: Platform) -> None:
+        """Marks the grid-aligned platform's cells as solid and its top edge cells."""
+        col0 = int(platform.pos.x) - self.left
+        row0 = int(platform.pos.y) - self.bottom
+        for row in range(row0, row0 + platform.height):
+            for col in range(col0, col0 + platform.width):
+                self._set_bit(self.solid, col, row)
+
+        row = row0 + platform.height
+        for col in range(col0, col0 + platform.width):
+            if not self._get_bit(self.top, col, row):
+                self._set_bit(self.top, col, row)
+                self.top_platforms[row * self.num_cols + col] = platform
+
+    def is_solid(self, x: float, y: float) -> bool:
+        """Returns True if the position is inside a grid-aligned platform."""
+        cell = self._to_cell(x, y)
+        return cell is not None and self._get_bit(self.solid, *cell)
+
+    def has_top_edge(self, x: float, y: float) -> bool:
+        """Returns True if a grid-aligned platform's top edge is located at the position's cell."""
+        cell = self._to_cell(x, y)
+        return cell is not None and self._get_bit(self.top, *cell)
+
+    def get_top_platform(self, x: float, y: float) -> Optional[Platform]:
+        """Returns the platform owning the top edge at the position's cell, or None."""
+        cell = self._to_cell(x, y)
+        if cell is None or not self._get_bit(self.top, *cell):
+            return None
+        col, row = cell
+        return self.top_platforms[row * self.num_cols + col]
+
+    def _get_edge_candidates(self, x: float, y: float) -> List[Platform]:
+        """Returns platforms whose top edge might contain x at row y. Since edges exclude their end points, a position
+        at a cell border may belong to the platform of the left cell.
+        """
+        candidates = list()
+        platform = self.get_top_platform(x, y)
+        if platform is not None:
+            candidates.append(platform)
+        if x == int(x):
+            platform = self.get_top_platform(x - 1, y)
+            if platform is not None and platform not in candidates:
+                candidates.append(platform)
+        return candidates
+
+    def get_support_platform(self, pos: pygame.math.Vector2) -> Optional[Platform]:
+        """Returns the grid-aligned platform whose top edge the point is located at, or None."""
+        if pos.y != int(pos.y):
+            # grid-aligned platforms have their top edges at integer heights
+            return None
+
+        for platform in self._get_edge_candidates(pos.x, pos.y):
+            if platform.supports_point(pos):
+                return platform
+
+        return None
+
+    def get_landing_candidates(self, start_point: pygame.math.Vector2, end_point: pygame.math.Vector2) \
+            -> List[Platform]:
+        """Returns all grid-aligned platforms which were traversed from above by moving from start_point to
+        end_point.
+        """
+        candidates: List[Platform] = list()
+        row = min(math.floor(start_point.y), self.bottom + self.num_rows - 1)
+        while row > end_point.y and row >= self.bottom:
+            for x in (start_point.x, end_point.x):
+                for platform in self._get_edge_candidates(x, row):
+                    if platform not in candidates and platform.was_traverse_from_above(start_point, end_point):
+                        candidates.append(platform)
+            row -= 1
+
+        return candidates
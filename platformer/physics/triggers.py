@@ -0,0 +1,27 @@
+import pygame
+from dataclasses import dataclass
+from enum import IntEnum
+
+from . import spatial
+
+
+class TriggerType(IntEnum):
+    CHECKPOINT = 0
+    KILL = 1
+    SPAWN = 2
+
+
+@dataclass
+class Trigger:
+    pos: pygame.math.Vector2  # bottom left
+    width: float
+    height: float
+    trigger_type: TriggerType = TriggerType.CHECKPOINT
+
+    def get_bounds(self) -> spatial.Bounds:
+        """Returns the trigger's bounds as (left, bottom, right, top)."""
+        return self.pos.x, self.pos.y, self.pos.x + self.width, self.pos.y + self.height
+
+    def contains_point(self, pos: pygame.math.Vector2) -> bool:
+        """Test whether the position is inside the trigger. Left and bottom edges are inside, the others are not."""
+        return self.pos.x <= pos.x < self.pos.x + self.width and self.pos.y <= pos.y < self.pos.y + self.height
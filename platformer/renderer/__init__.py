@@ -2,3 +2,5 @@ from .base import Camera
 from .images import Context, Actor
 from .images import ImageRenderer as Renderer
 from .parallax import ParallaxRenderer
+from .particles import ParticleRenderer
+from .dirty import DirtyRects
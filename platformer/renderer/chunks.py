@@ -0,0 +1,139 @@
+import math
+import pygame
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from core import constants, resources
+
+from .. import physics
+from ..physics import spatial
+from . import base
+
+
+# chunk width and height in pixels
+CHUNK_SIZE: int = 256
+
+# platforms and ladders are drawn beyond their bounds (edges, ladder ends), so chunks within this distance (in world
+# units) are affected by them
+ELEMENT_MARGIN: float = 2.0
+
+ChunkKey = Tuple[int, int]
+BakeFunc = Callable[[pygame.Surface, base.Camera, List[physics.Platform], List[physics.Ladder]], None]
+
+
+class ChunkLayer:
+    """Static platforms and ladders, pre-rendered into chunk surfaces of a fixed size.
+
+    Chunks are addressed in layer pixels, where x is the world's x and y is the world's negated y, both multiplied by
+    WORLD_SCALE. They are baked when they become visible for the first time and dropped when the physics context
+    reports changes nearby. Hovering platforms are not baked, since they move every frame.
+    """
+
+    def __init__(self, physics_context: physics.Context, bake: BakeFunc, chunk_size: int = CHUNK_SIZE):
+        self.physics_context = physics_context
+        self.bake = bake
+        self.chunk_size = chunk_size
+
+        # chunks without any static element are None
+        self.chunks: Dict[ChunkKey, Optional[pygame.Surface]] = dict()
+        self.version: Optional[int] = None
+        # increases whenever chunks are dropped, so the layer's look may have changed
+        self.generation = 0
+
+    def invalidate(self) -> None:
+        """Drops all chunks, e.g. after the tileset was changed."""
+        self.chunks.clear()
+        self.generation += 1
+
+    def get_chunk_keys(self, bounds: spatial.Bounds) -> Iterator[ChunkKey]:
+        """Yields all chunks which are affected by an element within the world bounds."""
+        left, bottom, right, top = bounds
+        scale = constants.WORLD_SCALE / self.chunk_size
+        first_x = math.floor((left - ELEMENT_MARGIN) * scale)
+        last_x = math.floor((right + ELEMENT_MARGIN) * scale)
+        first_y = math.floor(-(top + ELEMENT_MARGIN) * scale)
+        last_y = math.floor(-(bottom - ELEMENT_MARGIN) * scale)
+
+        for y in range(first_y, last_y + 1):
+            for x in range(first_x, last_x + 1):
+                yield x, y
+
+    def sync(self) -> None:
+        """Drops all chunks which are affected by changes since the last call."""
+        changes = self.physics_context.changes_since(self.version) if self.version is not None else None
+        if changes is None:
+            self.invalidate()
+
+        else:
+            for change in changes:
+                if not isinstance(change.element, (physics.Platform, physics.Ladder)):
+                    continue
+                for key in self.get_chunk_keys(change.bounds):
+                    self.chunks.pop(key, None)
+                self.generation += 1
+
+        self.version = self.physics_context.version
+
+    def create_chunk(self, key: ChunkKey) -> Optional[pygame.Surface]:
+        """Bakes all static platforms and ladders near the chunk. The bake function sorts them for drawing."""
+        x, y = key
+        size = self.chunk_size / constants.WORLD_SCALE
+        region = self.physics_context.query_rect(x * size - ELEMENT_MARGIN, -(y + 1) * size - ELEMENT_MARGIN,
+                                                 size + 2 * ELEMENT_MARGIN, size + 2 * ELEMENT_MARGIN)
+
+        platforms = [platform for platform in region.platforms if not platform.hover.does_move()]
+        ladders = region.ladders
+        if len(platforms) == 0 and len(ladders) == 0:
+            return None
+
+        surface = pygame.Surface((self.chunk_size, self.chunk_size))
+        surface.fill(resources.alpha_key)
+        surface.set_colorkey(resources.alpha_key)
+
+        camera = base.Camera(size=(self.chunk_size, self.chunk_size))
+        camera.width = camera.height = self.chunk_size
+        camera.topleft = pygame.math.Vector2(x * size, -(y + 1) * size)
+
+        self.bake(surface, camera, platforms, ladders)
+        return surface
+
+    def get_chunk(self, key: ChunkKey) -> Optional[pygame.Surface]:
+        """Returns the chunk, which is baked if necessary."""
+        if key not in self.chunks:
+            self.chunks[key] = self.create_chunk(key)
+
+        return self.chunks[key]
+
+    @staticmethod
+    def get_origin(camera: base.Camera) -> Tuple[int, int]:
+        """Returns the layer pixel at the camera's top left corner. It is rounded once per frame, so neighbouring
+        chunks stay aligned, also at negative screen positions.
+        """
+        x = math.ceil(camera.topleft.x * constants.WORLD_SCALE)
+        y = math.ceil(-camera.height - camera.topleft.y * constants.WORLD_SCALE)
+        return x, y
+
+    def get_visible_chunks(self, origin: Tuple[int, int], area: pygame.Rect) \
+            -> Iterator[Tuple[pygame.Surface, pygame.Rect]]:
+        """Yields all non-empty chunks within the screen area, together with their screen rect. The screen's top left
+        corner is at the given origin in layer pixels.
+        """
+        origin_x, origin_y = origin
+        first_x = (origin_x + area.left) // self.chunk_size
+        last_x = (origin_x + area.right - 1) // self.chunk_size
+        first_y = (origin_y + area.top) // self.chunk_size
+        last_y = (origin_y + area.bottom - 1) // self.chunk_size
+
+        for y in range(first_y, last_y + 1):
+            for x in range(first_x, last_x + 1):
+                chunk = self.get_chunk((x, y))
+                if chunk is not None:
+                    yield chunk, pygame.Rect(x * self.chunk_size - origin_x, y * self.chunk_size - origin_y,
+                                             self.chunk_size, self.chunk_size)
+
+    def draw(self, target: pygame.Surface, camera: base.Camera) -> None:
+        """Blits all chunks within the camera's view."""
+        self.sync()
+
+        screen_rect = pygame.Rect(0, 0, camera.width, camera.height)
+        for chunk, rect in self.get_visible_chunks(self.get_origin(camera), screen_rect):
+            target.blit(chunk, rect)
@@ -0,0 +1,86 @@
+import pygame
+from typing import Hashable, Iterable, List, Optional
+
+
+def merge_rects(rects: Iterable[Optional[pygame.Rect]]) -> List[pygame.Rect]:
+    """Returns the union of overlapping rects, so each pixel is covered by a single rect. Empty rects and None are
+    dropped.
+    """
+    merged: List[pygame.Rect] = list()
+    for rect in rects:
+        if rect is None or rect.width <= 0 or rect.height <= 0:
+            continue
+
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+
+    return merged
+
+
+class DirtyRects:
+    """Keeps a copy of the target's static background, e.g. the parallax layers and the baked platforms, and the areas
+    which were drawn on top of it during the last frame.
+
+    Usage per frame:
+        if dirty.restore(key):
+            # draw the background
+            dirty.store()
+        # draw dynamic elements and add their areas
+        dirty.add(rect)
+        changed = dirty.get_rects()
+
+    The key describes the background, e.g. the camera position. As long as it does not change, only the areas of the
+    last frame are restored from the copy, instead of redrawing the whole background.
+    """
+
+    def __init__(self, target: pygame.Surface):
+        self.target = target
+        self.background = target.copy()
+        self.key: Optional[Hashable] = None
+        self.full_redraw = True
+
+        self.previous: List[pygame.Rect] = list()
+        self.current: List[pygame.Rect] = list()
+
+    def invalidate(self) -> None:
+        """Makes the next frame redraw the background, e.g. after something else was drawn onto the target."""
+        self.key = None
+
+    def restore(self, key: Hashable) -> bool:
+        """Starts a new frame. Returns True if the background needs to be drawn, because its key changed. Otherwise
+        the last frame's areas are restored from the stored background.
+        """
+        self.previous = self.current
+        self.current = list()
+
+        self.full_redraw = self.key is None or key != self.key
+        self.key = key
+        if self.full_redraw:
+            return True
+
+        self.target.blits([(self.background, rect, rect) for rect in self.previous], doreturn=False)
+        return False
+
+    def store(self) -> None:
+        """Copies the drawn background."""
+        self.background.blit(self.target, (0, 0))
+
+    def add(self, rect: Optional[pygame.Rect]) -> None:
+        """Records an area which was drawn on top of the background during this frame."""
+        if rect is not None:
+            self.current.append(rect)
+
+    def add_all(self, rects: Iterable[Optional[pygame.Rect]]) -> None:
+        for rect in rects:
+            self.add(rect)
+
+    def get_rects(self) -> Optional[List[pygame.Rect]]:
+        """Returns the areas which changed since the last frame, or None if the whole target was redrawn."""
+        if self.full_redraw:
+            return None
+
+        return merge_rects(self.previous + self.current)
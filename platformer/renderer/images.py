@@ -1,10 +1,14 @@
 import pygame
 from dataclasses import dataclass
+from typing import Optional, List, Dict, Tuple
 
 from core import constants, resources, objectids
 
 from .. import animations, physics
-from . import base, shapes
+from . import base, shapes, chunks, order
+
+
+OUTLINE_COLOR = pygame.Color('yellow')
 
 
 @dataclass
@@ -27,14 +31,14 @@ class Ladder:
 @dataclass
 class Actor:
     object_id: int
-    sprite_sheet: pygame.Surface
+    sprite_sheet: Optional[pygame.Surface]
 
 
 class Context:
     def __init__(self):
         self.actors = objectids.IdList()
 
-    def create_actor(self, object_id: int, sprite_sheet: pygame.Surface) -> Actor:
+    def create_actor(self, object_id: int, sprite_sheet: Optional[pygame.Surface]) -> Actor:
         a = Actor(object_id=object_id, sprite_sheet=sprite_sheet)
         self.actors.append(a)
         return a
@@ -50,8 +54,15 @@ class ImageRenderer(shapes.ShapeRenderer):
         self.sprite_context = sprite_context
         self.cache = cache
 
+        # drawing order of platforms, ladders and objects, the physics context's lists are not sorted
+        self.draw_order = order.SceneOrder(physics_context)
+        # static platforms and ladders are baked
+        self.static_layer = chunks.ChunkLayer(physics_context, self.bake_static)
+
         # load first tileset
         self.tiles = None
+        self.tileset_index = 0
+        self.platform_surfaces: Dict[Tuple[int, int, int, bool, bool], pygame.Surface] = dict()
         self.load_fileset(0)
 
         # load objects sheet
@@ -62,6 +73,9 @@ class ImageRenderer(shapes.ShapeRenderer):
         tile_files = self.cache.paths.all_tiles()
         tile_path = self.cache.paths.tile(tile_files[index])
         self.tiles = self.cache.get_image(tile_path)
+        self.tileset_index = index
+        self.platform_surfaces.clear()
+        self.static_layer.invalidate()
 
     @staticmethod
     def get_platform_clip(alt_platform: bool = False) -> Platform:
@@ -133,96 +147,125 @@ class ImageRenderer(shapes.ShapeRenderer):
 
         return clip_rect
 
-    def draw_platform(self, platform: physics.Platform, add_outline: bool = False) -> None:
-        src = self.tiles
-        if add_outline:
-            src = src.copy()
-            resources.add_outline(src, pygame.Color('yellow'))
+    def compose_platform(self, src: pygame.Surface, width: int, height: int) -> pygame.Surface:
+        """Composes a platform of the given size from the tileset's clips. The surface's top left corner is one tile
+        left of and one tile above the platform's top, see get_platform_offset().
+        """
+        clip = self.get_platform_clip(alt_platform=height == 1)
+        size = ((width + 2) * constants.WORLD_SCALE, (height + 1) * constants.WORLD_SCALE)
+        if height == 0:
+            # the top tiles reach below the platform's position
+            size = (size[0], size[1] + constants.WORLD_SCALE)
+
+        surface = pygame.Surface(size)
+        surface.fill(resources.alpha_key)
+        surface.set_colorkey(resources.alpha_key)
 
-        pos = self.get_platform_rect(platform)
-        pos.h *= -1
-        clip = self.get_platform_clip(alt_platform=platform.height == 1)
+        # position of the platform's bottom left corner within the surface
+        pos = pygame.Rect(constants.WORLD_SCALE, (height + 1) * constants.WORLD_SCALE, 0, 0)
 
         # draw textures
         pos_tmp = pos.copy()
         pos_tmp.y -= constants.WORLD_SCALE
-        for y in range(platform.height):
+        for y in range(height):
             # left edge
-            pos_tmp.x = pos.x
-            pos_tmp.x -= constants.WORLD_SCALE
-            if self.camera.rect_is_visible(pos_tmp):
-                self.target.blit(src, pos_tmp, clip.tex_left_clip_rect)
+            pos_tmp.x = pos.x - constants.WORLD_SCALE
+            surface.blit(src, pos_tmp, clip.tex_left_clip_rect)
             # repeated tex
-            for x in range(platform.width):
+            for x in range(width):
                 pos_tmp.x += constants.WORLD_SCALE
-                if self.camera.rect_is_visible(pos_tmp):
-                    self.target.blit(src, pos_tmp, clip.tex_clip_rect)
+                surface.blit(src, pos_tmp, clip.tex_clip_rect)
             # right edge
             pos_tmp.x += constants.WORLD_SCALE
-            if self.camera.rect_is_visible(pos_tmp):
-                self.target.blit(src, pos_tmp, clip.tex_right_clip_rect)
+            surface.blit(src, pos_tmp, clip.tex_right_clip_rect)
             pos_tmp.y -= constants.WORLD_SCALE
 
         # draw platform
         pos_tmp = pos.copy()
-        pos_tmp.y -= constants.WORLD_SCALE + platform.height * constants.WORLD_SCALE
-        for x in range(platform.width):
-            if self.camera.rect_is_visible(pos_tmp):
-                self.target.blit(src, pos_tmp, clip.top_clip_rect)
+        pos_tmp.y -= constants.WORLD_SCALE + height * constants.WORLD_SCALE
+        for x in range(width):
+            surface.blit(src, pos_tmp, clip.top_clip_rect)
             pos_tmp.x += constants.WORLD_SCALE
 
         # draw edges
-        if self.camera.rect_is_visible(pos_tmp):
-            self.target.blit(src, pos_tmp, clip.right_clip_rect)
+        surface.blit(src, pos_tmp, clip.right_clip_rect)
         pos_tmp.x = pos.x - constants.WORLD_SCALE
-        if self.camera.rect_is_visible(pos_tmp):
-            self.target.blit(src, pos_tmp, clip.left_clip_rect)
+        surface.blit(src, pos_tmp, clip.left_clip_rect)
+
+        return surface
+
+    @staticmethod
+    def get_platform_offset(height: int) -> Tuple[int, int]:
+        """Returns the offset of a composed platform surface relative to the platform's screen position."""
+        return -constants.WORLD_SCALE, -(height + 1) * constants.WORLD_SCALE
+
+    def get_source(self, src: pygame.Surface, add_outline: bool) -> pygame.Surface:
+        """Returns the surface itself or its cached outlined variant."""
+        if not add_outline:
+            return src
+
+        return self.cache.get_outlined_surface(src, OUTLINE_COLOR)
+
+    def get_platform_surface(self, width: int, height: int, add_outline: bool = False) -> pygame.Surface:
+        """Returns the composed platform of the current tileset. It is created once per size and outline."""
+        key = (self.tileset_index, width, height, height == 1, add_outline)
+        if key not in self.platform_surfaces:
+            src = self.get_source(self.tiles, add_outline)
+            self.platform_surfaces[key] = self.compose_platform(src, width, height)
+
+        return self.platform_surfaces[key]
+
+    # The draw_* methods return the area they changed, or None if nothing was visible.
+
+    def draw_platform(self, platform: physics.Platform, add_outline: bool = False) -> Optional[pygame.Rect]:
+        surface = self.get_platform_surface(platform.width, platform.height, add_outline)
+
+        offset_x, offset_y = self.get_platform_offset(platform.height)
+        pos = self.from_world_coord(platform.pos)
+        return self.target.blit(surface, (pos.x + offset_x, pos.y + offset_y))
 
-    def draw_ladder(self, ladder: physics.Ladder, add_outline: bool = False) -> None:
-        src = self.tiles
-        if add_outline:
-            src = src.copy()
-            resources.add_outline(src, pygame.Color('yellow'))
+    def draw_ladder(self, ladder: physics.Ladder, add_outline: bool = False) -> Optional[pygame.Rect]:
+        src = self.get_source(self.tiles, add_outline)
 
         pos = self.get_ladder_rect(ladder)
         clip = self.get_ladder_clip()
+        changed = list()
 
         # draw upper part of the ladder
         pos.y -= constants.WORLD_SCALE
         if self.camera.rect_is_visible(pos):
-            self.target.blit(src, pos, clip.top_clip_rect)
+            changed.append(self.target.blit(src, pos, clip.top_clip_rect))
         pos.y += constants.WORLD_SCALE
 
         # draw ladder elements
         for i in range(ladder.height):
             if self.camera.rect_is_visible(pos):
-                self.target.blit(src, pos, clip.mid_clip_rect)
+                changed.append(self.target.blit(src, pos, clip.mid_clip_rect))
             pos.y += constants.WORLD_SCALE
 
         # draw lower part of the ladder:
         if self.camera.rect_is_visible(pos):
-            self.target.blit(src, pos, clip.bottom_clip_rect)
+            changed.append(self.target.blit(src, pos, clip.bottom_clip_rect))
 
-    def draw_object(self, obj: physics.Object, add_outline: bool = False) -> None:
-        src = self.objects
-        if add_outline:
-            src = src.copy()
-            resources.add_outline(src, pygame.Color('yellow'))
+        if len(changed) == 0:
+            return None
+        return changed[0].unionall(changed[1:])
+
+    def draw_object(self, obj: physics.Object, add_outline: bool = False) -> Optional[pygame.Rect]:
+        src = self.get_source(self.objects, add_outline)
 
         pos = self.get_object_rect(obj)
         clip = self.get_object_clip(object_type=obj.object_type, variation_col=0)
 
-        if self.camera.rect_is_visible(pos):
-            self.target.blit(src, pos, clip)
+        if not self.camera.rect_is_visible(pos):
+            return None
+        return self.target.blit(src, pos, clip)
 
-    def draw_actor(self, actor: physics.Actor, add_outline: bool = False) -> None:
+    def draw_actor(self, actor: physics.Actor, add_outline: bool = False) -> Optional[pygame.Rect]:
         sprite_actor = self.sprite_context.actors.get_by_id(actor.object_id)
         ani_actor = self.ani_context.actors.get_by_id(actor.object_id)
 
-        src = sprite_actor.sprite_sheet
-        if add_outline:
-            src = src.copy()
-            resources.add_outline(src, pygame.Color('yellow'))
+        src = self.get_source(sprite_actor.sprite_sheet, add_outline)
 
         pos = self.get_actor_rect(actor)
         clip = self.get_actor_clip(face_x=actor.move.face_x, frame_id=ani_actor.frame.frame_id,
@@ -231,14 +274,12 @@ class ImageRenderer(shapes.ShapeRenderer):
         # apply movement offset from animation
         pos.y += ani_actor.oscillate.delta_y
 
-        if self.camera.rect_is_visible(pos):
-            self.target.blit(src, pos, clip)
+        if not self.camera.rect_is_visible(pos):
+            return None
+        return self.target.blit(src, pos, clip)
 
-    def draw_projectile(self, proj: physics.Projectile, add_outline: bool = False) -> None:
-        src = self.objects
-        if add_outline:
-            src = src.copy()
-            resources.add_outline(src, pygame.Color('yellow'))
+    def draw_projectile(self, proj: physics.Projectile, add_outline: bool = False) -> Optional[pygame.Rect]:
+        src = self.get_source(self.objects, add_outline)
 
         # FIXME: allow for spinning animation
         """
@@ -249,8 +290,64 @@ class ImageRenderer(shapes.ShapeRenderer):
 
         pos = self.get_projectile_rect(proj)
         clip = self.get_projectile_clip(object_type=proj.object_type, variation_col=0)
-        if self.camera.rect_is_visible(pos):
-            self.target.blit(src, pos, clip)
+        if not self.camera.rect_is_visible(pos):
+            return None
+        return self.target.blit(src, pos, clip)
+
+    def bake_static(self, target: pygame.Surface, camera: base.Camera, platforms: List[physics.Platform],
+                    ladders: List[physics.Ladder]) -> None:
+        """Draws the given platforms and ladders onto a chunk in drawing order, viewed by the chunk's camera."""
+        self.draw_order.sync()
+        platforms = sorted(platforms, key=self.draw_order.platforms.get_sort_key)
+        ladders = sorted(ladders, key=self.draw_order.ladders.get_sort_key)
+
+        screen = self.target, self.camera
+        self.target, self.camera = target, camera
+        try:
+            for platform in platforms:
+                self.draw_platform(platform)
+            for ladder in ladders:
+                self.draw_ladder(ladder)
+        finally:
+            self.target, self.camera = screen
 
     def update(self, elapsed_ms: int) -> None:
-        self.physics_context.platforms.sort(key=lambda plat: -plat.pos.y-plat.height)
+        self.draw_order.sync()
+
+    def draw_static(self) -> None:
+        """Blits the baked static layer."""
+        self.static_layer.draw(self.target, self.camera)
+
+    def draw_dynamic(self) -> List[Optional[pygame.Rect]]:
+        """Draws hovering platforms, objects, projectiles and actors within the camera's view. Returns the changed
+        areas.
+        """
+        self.draw_order.sync()
+        region = self.get_visible_region()
+
+        # hovering platforms are moved without a recorded change
+        platforms = [platform for platform in region.platforms if platform.hover.does_move()]
+        for platform in platforms:
+            self.draw_order.platforms.update(platform)
+        platforms.sort(key=self.draw_order.platforms.get_sort_key)
+        region.objects.sort(key=self.draw_order.objects.get_sort_key)
+
+        changed = list()
+        for platform in platforms:
+            changed.append(self.draw_platform(platform))
+
+        for obj in region.objects:
+            changed.append(self.draw_object(obj))
+
+        for projectile in region.projectiles:
+            changed.append(self.draw_projectile(projectile))
+
+        for actor in region.actors:
+            changed.append(self.draw_actor(actor))
+
+        return changed
+
+    def draw(self) -> None:
+        """Blits the baked static layer and draws hovering platforms, objects, projectiles and actors on top."""
+        self.draw_static()
+        self.draw_dynamic()
@@ -0,0 +1,147 @@
+import bisect
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+from .. import physics
+
+
+T = TypeVar('T')
+
+# primary key and insertion number, which keeps elements with equal keys in a stable order
+SortKey = Tuple[float, int]
+
+
+def get_platform_key(platform: physics.Platform) -> float:
+    """Platforms with a higher top are drawn first."""
+    return -platform.pos.y - platform.height
+
+
+def get_ladder_key(ladder: physics.Ladder) -> float:
+    return -ladder.pos.y - ladder.height
+
+
+def get_object_key(obj: physics.Object) -> float:
+    return -obj.pos.y
+
+
+class DrawOrder(Generic[T]):
+    """Keeps elements sorted by a key, which is only evaluated when an element is inserted or updated. Elements are
+    tracked by identity, so they do not need to be hashable.
+    """
+
+    def __init__(self, get_key: Callable[[T], float]):
+        self.get_key = get_key
+        # sorted by (key, insertion number), the last item is id(element)
+        self.entries: List[Tuple[float, int, int]] = list()
+        self.elements: Dict[int, T] = dict()
+        self.keys: Dict[int, SortKey] = dict()
+        self.next_seq = 0
+
+    def insert(self, element: T, seq: Optional[int] = None) -> None:
+        """Inserts the element at its sorted position. It keeps the given insertion number, if any."""
+        if seq is None:
+            seq = self.next_seq
+            self.next_seq += 1
+
+        key = (self.get_key(element), seq)
+        bisect.insort(self.entries, (*key, id(element)))
+        self.elements[id(element)] = element
+        self.keys[id(element)] = key
+
+    def remove(self, element: T) -> bool:
+        """Removes the element. Returns False if it was not contained."""
+        key = self.keys.pop(id(element), None)
+        if key is None:
+            return False
+
+        index = bisect.bisect_left(self.entries, (*key, id(element)))
+        del self.entries[index]
+        del self.elements[id(element)]
+        return True
+
+    def update(self, element: T) -> bool:
+        """Moves the element if its key changed. Unknown elements are inserted. Returns True if it was moved."""
+        key = self.keys.get(id(element))
+        if key is None:
+            self.insert(element)
+            return True
+
+        if self.get_key(element) == key[0]:
+            return False
+
+        self.remove(element)
+        self.insert(element, key[1])
+        return True
+
+    def rebuild(self, elements: List[T]) -> None:
+        """Replaces all elements. Elements with equal keys keep the given order."""
+        self.entries.clear()
+        self.elements.clear()
+        self.keys.clear()
+        self.next_seq = 0
+        for element in elements:
+            key = (self.get_key(element), self.next_seq)
+            self.next_seq += 1
+            self.entries.append((*key, id(element)))
+            self.elements[id(element)] = element
+            self.keys[id(element)] = key
+        self.entries.sort()
+
+    def get_sort_key(self, element: T) -> SortKey:
+        """Returns the element's position in the draw order, to be used with list.sort()."""
+        return self.keys[id(element)]
+
+    def __iter__(self) -> Iterator[T]:
+        for entry in self.entries:
+            yield self.elements[entry[2]]
+
+    def __contains__(self, element: T) -> bool:
+        return id(element) in self.keys
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class SceneOrder:
+    """Draw orders of the platforms, ladders and objects, kept up to date using the physics context's change log.
+    The physics context's lists are not touched.
+
+    Hovering platforms are moved by the animations without a recorded change, so they need to be updated explicitly.
+    """
+
+    def __init__(self, physics_context: physics.Context):
+        self.physics_context = physics_context
+        self.platforms: DrawOrder[physics.Platform] = DrawOrder(get_platform_key)
+        self.ladders: DrawOrder[physics.Ladder] = DrawOrder(get_ladder_key)
+        self.objects: DrawOrder[physics.Object] = DrawOrder(get_object_key)
+        self.version: Optional[int] = None
+
+    def rebuild(self) -> None:
+        self.platforms.rebuild(self.physics_context.platforms)
+        self.ladders.rebuild(self.physics_context.ladders)
+        self.objects.rebuild(self.physics_context.objects)
+
+    def sync(self) -> None:
+        """Applies all changes since the last call."""
+        changes = self.physics_context.changes_since(self.version) if self.version is not None else None
+        if changes is None:
+            self.rebuild()
+
+        else:
+            ctx = self.physics_context
+            for change in changes:
+                element = change.element
+                if isinstance(element, physics.Platform):
+                    order, index = self.platforms, ctx.platform_index
+                elif isinstance(element, physics.Ladder):
+                    order, index = self.ladders, ctx.ladder_index
+                elif isinstance(element, physics.Object):
+                    order, index = self.objects, ctx.object_index
+                else:
+                    continue
+
+                if element in index:
+                    order.update(element)
+                else:
+                    order.remove(element)
+
+        self.version = self.physics_context.version
@@ -1,5 +1,6 @@
 import pygame
 import math
+from typing import List, Tuple
 
 from core import constants, resources
 
@@ -22,6 +23,7 @@ class ParallaxRenderer:
 
         # load first background
         self.background = None
+        self.fill_color = pygame.Color('black')
         self.load_background(0)
 
         self.clouds_offset = 0
@@ -32,10 +34,12 @@ class ParallaxRenderer:
         background_files = self.cache.paths.all_backgrounds()
         background_path = self.cache.paths.background(background_files[index])
         self.background = pygame.transform.scale_by(self.cache.get_image(background_path), 2)
+        # reading a pixel is slow, because the surface needs to be locked
+        self.fill_color = self.background.get_at((0, 0))
 
     def get_fill_color(self) -> pygame.Color:
         """Grab first pixels color."""
-        return self.background.get_at((0, 0))
+        return self.fill_color
 
     def get_num_layers(self) -> int:
         """Returns how many layers with a height of RESOLUTION_Y fit inside the loaded background."""
@@ -64,18 +68,27 @@ class ParallaxRenderer:
         for i in range(int(num_repeats+1)):
             self.target.blit(self.background, (-x % width + i * width, y), clip)
 
-    def draw(self) -> None:
+    def get_layer_positions(self) -> List[Tuple[int, int]]:
+        """Returns the pixel position of each layer. The drawn background only changes if these change."""
         screen_height = pygame.display.get_window_size()[1]
         if constants.SCALE_2X:
             screen_height //= 2
         y0 = screen_height - constants.RESOLUTION_Y
 
+        positions = list()
         for index in range(self.get_num_layers()):
             x = int(self.camera.topleft.x * self.get_layer_speed(index) * PARALLAX_SPEED)
             y = y0
             if index == CLOUD_LAYER:
                 x += self.clouds_offset * CLOUD_SPEED * self.cloud_speed
                 y -= math.cos(self.clouds_offset / CLOUD_PERIOD_LENGTH) * CLOUD_DELTA_Y * self.cloud_speed
+            # blitting truncates anyway
+            positions.append((int(x), int(y)))
+
+        return positions
+
+    def draw(self) -> None:
+        for index, (x, y) in enumerate(self.get_layer_positions()):
             clip = self.get_layer_rect(index)
             self.draw_layer(x, y, clip)
 
@@ -0,0 +1,57 @@
+import pygame
+import numpy
+from typing import List
+
+from core import constants
+
+from .. import particles
+from . import base
+
+
+PARTICLE_SIZE: int = 2
+
+
+class ParticleRenderer:
+    """Draws all particles with a single batched blit call."""
+
+    def __init__(self, camera: base.Camera, target: pygame.Surface, context: particles.Context):
+        self.camera = camera
+        self.target = target
+        self.context = context
+
+        # one small surface per palette color
+        self.dots = list()
+        for color in particles.context.PALETTE:
+            dot = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE))
+            dot.fill(color)
+            self.dots.append(dot)
+
+    def update(self, elapsed_ms: int) -> None:
+        pass
+
+    def draw(self) -> List[pygame.Rect]:
+        """Draws all visible particles. Returns the bounding box of the changed area, if any."""
+        n = self.context.count
+        if n == 0:
+            return []
+
+        # transform world into screen coordinates, see ShapeRenderer.from_world_coord
+        pos = self.context.pos[:n]
+        x = ((pos[:, 0] - self.camera.topleft.x) * constants.WORLD_SCALE).astype(numpy.int32)
+        y = self.camera.height - ((pos[:, 1] - self.camera.topleft.y) * constants.WORLD_SCALE).astype(numpy.int32)
+
+        visible = (x > -PARTICLE_SIZE) & (x < self.camera.width) & (y > -PARTICLE_SIZE) & (y < self.camera.height)
+        if not visible.any():
+            return []
+
+        dots = self.dots
+        x = x[visible]
+        y = y[visible]
+        colors = self.context.color[:n][visible].tolist()
+        coords = zip(x.tolist(), y.tolist())
+        self.target.blits([(dots[color], xy) for color, xy in zip(colors, coords)], doreturn=False)
+
+        left = int(x.min())
+        top = int(y.min())
+        bounds = pygame.Rect(left, top, int(x.max()) - left + PARTICLE_SIZE, int(y.max()) - top + PARTICLE_SIZE)
+        return [bounds.clip(self.target.get_rect())]
@@ -8,6 +8,11 @@ from .. import physics
 from . import base
 
 
+# elements are drawn beyond their bounds (sprites, platform edges, ladder ends), so elements within this distance (in
+# world units) of the camera's view are drawn
+VIEW_MARGIN: float = 2.0
+
+
 @dataclass
 class Mapping:
     platform: str = 'red'
@@ -89,6 +94,13 @@ class ShapeRenderer(base.Renderer):
 
         return pos_rect
 
+    def get_visible_region(self) -> physics.Region:
+        """Returns all elements within the camera's view, found by the physics context's lookup."""
+        width = self.camera.width / constants.WORLD_SCALE
+        height = self.camera.height / constants.WORLD_SCALE
+        return self.physics_context.query_rect(self.camera.topleft.x - VIEW_MARGIN, self.camera.topleft.y - VIEW_MARGIN,
+                                               width + 2 * VIEW_MARGIN, height + 2 * VIEW_MARGIN)
+
     def update(self, elapsed_ms: int) -> None:
         pass
 
@@ -120,7 +132,8 @@ class ShapeRenderer(base.Renderer):
         c = pygame.Color(self.mapping.projectile)
         pygame.gfxdraw.circle(self.target, *pos.center, r, c)
 
-    def draw_position(self, pos: pygame.math.Vector2) -> None:
+    def draw_position(self, pos: pygame.math.Vector2) -> pygame.Rect:
+        """Draws a cross at the position. Returns the changed area."""
         pos = self.from_world_coord(pos)
         x = int(pos.x)
         y = int(pos.y)
@@ -128,8 +141,10 @@ class ShapeRenderer(base.Renderer):
         c = pygame.Color(self.mapping.platform)
         pygame.gfxdraw.line(self.target, x - r, y - r, x + r, y + r, c)
         pygame.gfxdraw.line(self.target, x - r, y + r, x + r, y - r, c)
+        return pygame.Rect(x - r, y - r, 2 * r + 1, 2 * r + 1).clip(self.target.get_rect())
 
-    def draw_line(self, start_point: pygame.math.Vector2, end_point: pygame.math.Vector2) -> None:
+    def draw_line(self, start_point: pygame.math.Vector2, end_point: pygame.math.Vector2) -> pygame.Rect:
+        """Draws a line between both positions. Returns the changed area."""
         start_point = self.from_world_coord(start_point)
         end_point = self.from_world_coord(end_point)
         x1 = int(start_point.x)
@@ -138,19 +153,22 @@ class ShapeRenderer(base.Renderer):
         y2 = int(end_point.y)
         c = pygame.Color(self.mapping.platform)
         pygame.gfxdraw.line(self.target, x1, y1, x2, y2, c)
+        return pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1).clip(self.target.get_rect())
 
     def draw(self) -> None:
-        for platform in self.physics_context.platforms:
+        region = self.get_visible_region()
+
+        for platform in region.platforms:
             self.draw_platform(platform)
 
-        for ladder in self.physics_context.ladders:
+        for ladder in region.ladders:
             self.draw_ladder(ladder)
 
-        for obj in self.physics_context.objects:
+        for obj in region.objects:
             self.draw_object(obj)
 
-        for projectile in self.physics_context.projectiles:
+        for projectile in region.projectiles:
             self.draw_projectile(projectile)
 
-        for actor in self.physics_context.actors:
+        for actor in region.actors:
             self.draw_actor(actor)
@@ -0,0 +1,211 @@
+import pygame
+from abc import abstractmethod
+from typing import Optional, Union
+
+from core import constants, resources
+
+from platformer import animations, characters, controls, physics
+from platformer import factory
+
+
+# fallback kill zone below the level, used if the level does not provide one. It is large enough to catch actors which
+# fall next to the platforms, too.
+KILL_ZONE_TOP: float = -10.0
+KILL_ZONE_EXTENT: float = 1e6
+
+
+def create_demo_scene(f: factory.Factory, sprite_sheet: Optional[pygame.Surface]) -> characters.Actor:
+    """Creates the player character and some enemies. Without a sprite sheet, the actors are not drawable.
+    Returns the player's character.
+    """
+    player_char_actor = f.create_character(sprite_sheet=sprite_sheet, x=5, y=5, max_hit_points=5, num_axes=10)
+    f.create_player(player_char_actor,
+                    keys=controls.Keybinding(left_key=pygame.K_a, right_key=pygame.K_d, up_key=pygame.K_w,
+                                             down_key=pygame.K_s, attack_key=pygame.K_SPACE))
+
+    for value, color_set in enumerate([constants.SNOW_CLOTHES_COLORS, constants.GRASS_CLOTHES_COLOR,
+                                       constants.STONE_CLOTHES_COLOR, constants.EMBER_CLOTHES_COLOR]):
+        enemy_guy = None
+        if sprite_sheet is not None:
+            enemy_guy = sprite_sheet.copy()
+            resources.transform_color_replace(enemy_guy, dict(zip(constants.SPRITE_CLOTHES_COLORS, color_set)))
+        f.create_enemy(sprite_sheet=enemy_guy, x=6.25 + value, y=5.5, max_hit_points=3, num_axes=0)
+
+    return player_char_actor
+
+
+class GameRules(factory.EventListener):
+    """Gameplay reactions to the systems' events. Subclasses provide the factory and decide what happens if a player
+    gets killed.
+    """
+    factory: factory.Factory
+
+    @abstractmethod
+    def on_player_killed(self, player: controls.Player) -> None:
+        """Triggered when a player entered a kill zone."""
+
+    def create_kill_zone(self) -> None:
+        """Adds a kill zone below the level unless the level provides one."""
+        phys_ctx = self.factory.ctx.physics
+        if any(trigger.trigger_type == physics.TriggerType.KILL for trigger in phys_ctx.triggers):
+            return
+
+        phys_ctx.create_trigger(x=-KILL_ZONE_EXTENT, y=KILL_ZONE_TOP - KILL_ZONE_EXTENT,
+                                width=2 * KILL_ZONE_EXTENT, height=KILL_ZONE_EXTENT,
+                                trigger_type=physics.TriggerType.KILL)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # --- physics events ---
+
+    def on_grab(self, actor: physics.Actor) -> None:
+        """Triggered when the actor grabs a ladder."""
+        player = self.factory.ctx.players.actors.get_by_id(actor.object_id)
+        if player is not None:
+            return
+
+        # enemy! let 'm climb
+        actor.pos.x = actor.on_ladder.pos.x
+        actor.move.force.x = 0.0
+        actor.move.force.y = 0.0
+        ani_enemy = self.factory.ctx.animations.actors.get_by_id(actor.object_id)
+        ani_enemy.frame.start(animations.Action.IDLE)
+
+    def on_release(self, actor: physics.Actor) -> None:
+        """Triggered when the actor releases a ladder."""
+        pass
+
+    def on_falling(self, phys_actor: physics.Actor) -> None:
+        """Triggered when the actor starts falling."""
+        actor = self.factory.ctx.characters.actors.get_by_id(phys_actor.object_id)
+        characters.set_falling_from(actor, phys_actor)
+
+    def on_landing(self, phys_actor: physics.Actor) -> None:
+        """Triggered when the actor landed on a platform."""
+        actor = self.factory.ctx.characters.actors.get_by_id(phys_actor.object_id)
+        action, damage = characters.apply_landing(actor, phys_actor)
+        ani_actor = self.factory.ctx.animations.actors.get_by_id(phys_actor.object_id)
+        self.factory.particles.on_landing(phys_actor)
+
+        if damage > 0:
+            self.on_char_damaged(actor, damage, None)
+
+        else:
+            ani_actor.frame.start(action)
+
+    def on_collision(self, actor: physics.Actor, platform: physics.Platform) -> None:
+        """Triggered when the actor runs into a platform."""
+        pass
+
+    def on_contact_begin(self, phys_actor: physics.Actor, other: Union[physics.Object, physics.Actor]) -> None:
+        """Triggered when an actor starts touching an object or another actor."""
+        if isinstance(other, physics.Object):
+            self.collect_object(phys_actor, other)
+
+    def on_contact_end(self, phys_actor: physics.Actor, other: Union[physics.Object, physics.Actor]) -> None:
+        """Triggered when an actor stops touching an object or another actor."""
+        pass
+
+    def on_touch_object(self, phys_actor: physics.Actor, obj: physics.Object) -> None:
+        """Triggered while the actor touches an object. Not enabled."""
+        pass
+
+    def collect_object(self, phys_actor: physics.Actor, obj: physics.Object) -> None:
+        """Applies the object to the actor and replaces it by a random new one."""
+        if self.factory.is_destroyed(obj):
+            # already collected by another actor during this tick
+            return
+
+        self.factory.particles.on_touch_object(phys_actor, obj)
+        char_actor = self.factory.ctx.characters.actors.get_by_id(phys_actor.object_id)
+        if char_actor is not None:
+            if obj.object_type == constants.ObjectType.FOOD:
+                # heal him
+                char_actor.hit_points += 1
+                # FIXME: on_player_healed
+
+            elif obj.object_type == constants.ObjectType.WEAPON:
+                # grab axe
+                char_actor.num_axes += 1
+                # FIXME: on_weapon_collected
+
+        self.factory.destroy_object(obj)
+        self.factory.create_random_object()
+
+    def on_impact_platform(self, proj: physics.Projectile, platform: physics.Platform) -> None:
+        """Triggered when a projectile hits a platform."""
+        if self.factory.is_destroyed(proj):
+            return
+
+        self.factory.particles.on_impact_platform(proj, platform)
+        self.factory.ctx.physics.create_object(x=proj.pos.x, y=proj.pos.y - constants.OBJECT_RADIUS,
+                                               object_type=proj.object_type)
+        self.factory.destroy_projectile(proj)
+
+    def on_impact_actor(self, proj: physics.Projectile, phys_actor: physics.Actor) -> None:
+        """Triggered when a projectile hits an actor."""
+        char_actor = self.factory.ctx.characters.actors.get_by_id(phys_actor.object_id)
+        if char_actor is not None:
+            self.factory.characters.apply_projectile_hit(char_actor, 2, proj)
+
+        if self.factory.is_destroyed(proj):
+            # already dropped during this tick
+            return
+
+        # drop projectile as object
+        self.factory.ctx.physics.create_object(x=proj.pos.x, y=proj.pos.y - constants.OBJECT_RADIUS,
+                                               object_type=proj.object_type)
+        self.factory.destroy_projectile(proj)
+
+    def on_touch_actor(self, proj: physics.Projectile, phys_actor: physics.Actor) -> None:
+        """Triggered while an actor touches another actor. Not enabled."""
+        pass
+
+    def on_enter(self, phys_actor: physics.Actor, trigger: physics.Trigger) -> None:
+        """Triggered when an actor enters a trigger zone."""
+        if trigger.trigger_type != physics.TriggerType.KILL:
+            return
+
+        player = self.factory.ctx.players.actors.get_by_id(phys_actor.object_id)
+        if player is not None:
+            self.on_player_killed(player)
+
+    def on_exit(self, phys_actor: physics.Actor, trigger: physics.Trigger) -> None:
+        """Triggered when an actor leaves a trigger zone."""
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # --- Animation Events -
+
+    def on_animation_finish(self, ani: animations.Actor) -> None:
+        """Triggered when an attack animation finished."""
+        actor = self.factory.ctx.characters.actors.get_by_id(ani.object_id)
+        if actor is None:
+            return
+
+        if ani.frame.action == animations.Action.ATTACK:
+            victims = characters.query_melee_range(actor, self.factory.ctx.characters, self.factory.ctx.physics)
+            for victim in victims:
+                characters.attack_enemy(1, victim)
+                self.on_char_damaged(victim, 1, actor)
+
+        elif ani.frame.action == animations.Action.THROW:
+            actor = self.factory.ctx.characters.actors.get_by_id(ani.object_id)
+            proj = characters.throw_object(actor, 3.0, constants.ObjectType.WEAPON, self.factory.ctx.physics,
+                                           self.factory.create_projectile)
+            if proj is not None:
+                proj.move.force.y = 1.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # --- Character events
+
+    def on_char_damaged(self, char_actor: characters.Actor, damage: int, cause: Optional[characters.Actor]) -> None:
+        """Triggered when an actor got damaged."""
+        if char_actor.hit_points > 0:
+            return
+
+        ani_actor = self.factory.ctx.animations.actors.get_by_id(char_actor.object_id)
+        ani_actor.frame.start(animations.Action.DIE)
+
+        phys_actor = self.factory.ctx.physics.actors.get_by_id(char_actor.object_id)
+        phys_actor.move.force.x = 0.0
+        phys_actor.can_collide = False
@@ -0,0 +1,61 @@
+import unittest
+import time
+import pstats
+import pathlib
+import tempfile
+
+from core import capture
+
+
+def busy_wait(duration: float) -> None:
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+class FrameCaptureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.phase = 'update'
+        self.capture = capture.FrameCapture(lambda: self.phase, pathlib.Path(self.tmp.name) / 'captures')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test__nothing_is_captured_before_request(self):
+        self.assertFalse(self.capture.active)
+        self.assertEqual(self.capture.pending, 0)
+
+    def test__capture_frames(self):
+        self.capture.request(3)
+        self.capture.begin()
+        self.assertTrue(self.capture.active)
+
+        for index in range(3):
+            self.phase = 'update' if index < 2 else 'draw'
+            busy_wait(0.02)
+            self.capture.end_frame()
+
+        self.assertFalse(self.capture.active)
+        pstats_path, collapsed_path = self.capture.last_files
+        self.assertEqual(pstats_path.suffix, '.pstats')
+        stats = pstats.Stats(str(pstats_path))
+        self.assertTrue(any(func[2] == 'busy_wait' for func in stats.stats))
+
+        with open(collapsed_path) as file:
+            lines = file.read().splitlines()
+        self.assertGreater(len(lines), 0)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertIn(stack.split(';')[0], ['update', 'draw'])
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any('busy_wait' in line for line in lines))
+
+    def test__request_is_ignored_while_active(self):
+        self.capture.request(1)
+        self.capture.begin()
+        self.capture.request(5)
+        self.assertEqual(self.capture.pending, 0)
+        self.capture.end_frame()
+        self.assertFalse(self.capture.active)
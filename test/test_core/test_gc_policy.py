@@ -0,0 +1,64 @@
+import gc
+import unittest
+
+from core import gc_policy
+
+
+class GcPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.thresholds = gc.get_threshold()
+        self.policy = gc_policy.GcPolicy()
+
+    def tearDown(self):
+        self.policy.end()
+        gc.set_threshold(*self.thresholds)
+
+    def test__begin_and_end_change_thresholds(self):
+        self.policy.begin()
+        self.assertEqual(gc.get_threshold(), gc_policy.FRAME_THRESHOLDS)
+
+        self.policy.end()
+        self.assertEqual(gc.get_threshold(), self.thresholds)
+
+    def test__disabled_policy_does_nothing(self):
+        self.policy.enabled = False
+        self.policy.begin()
+        self.assertEqual(gc.get_threshold(), self.thresholds)
+
+    def test__collect_idle_needs_idle_time(self):
+        self.policy.begin()
+        gc.collect()
+        self.policy.pop_pauses()
+        num_full = self.policy.num_collections[2]
+
+        for _ in range(gc_policy.IDLE_COLLECT_COUNT):
+            gc.collect(1)
+        self.policy.collect_idle(0.0)
+        self.policy.pop_pauses()
+        self.assertEqual(self.policy.num_collections[2], num_full)
+
+        self.policy.collect_idle(gc_policy.MIN_IDLE_MS)
+        pauses = self.policy.pop_pauses()
+        self.assertEqual([pause[0] for pause in pauses], [2])
+        self.assertEqual(self.policy.num_collections[2], num_full + 1)
+        self.assertGreaterEqual(self.policy.max_pause_ms, 0.0)
+
+    def test__collect_idle_is_forced_eventually(self):
+        self.policy.begin()
+        gc.collect()
+
+        for _ in range(gc_policy.FORCE_COLLECT_COUNT):
+            gc.collect(1)
+        self.policy.pop_pauses()
+        self.policy.collect_idle(0.0)
+        self.assertEqual([pause[0] for pause in self.policy.pop_pauses()], [2])
+
+    def test__refreeze_keeps_alive_objects_frozen(self):
+        self.addCleanup(gc.unfreeze)
+        self.policy.freeze()
+        self.policy.refreeze()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        self.policy.unfreeze()
+        self.assertEqual(gc.get_freeze_count(), 0)
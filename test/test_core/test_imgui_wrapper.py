@@ -0,0 +1,102 @@
+import unittest
+import unittest.mock
+import pygame
+
+import OpenGL.GL
+
+from core import imgui_wrapper
+
+
+class PixelFormatTest(unittest.TestCase):
+
+    def test__xrgb_surface_is_uploaded_as_bgra(self):
+        surface = pygame.Surface((4, 3), depth=32, masks=(0xff0000, 0x00ff00, 0x0000ff, 0))
+        self.assertEqual(imgui_wrapper.get_pixel_format(surface), OpenGL.GL.GL_BGRA)
+
+    def test__xbgr_surface_is_uploaded_as_rgba(self):
+        surface = pygame.Surface((4, 3), depth=32, masks=(0x0000ff, 0x00ff00, 0xff0000, 0))
+        self.assertEqual(imgui_wrapper.get_pixel_format(surface), OpenGL.GL.GL_RGBA)
+
+    def test__other_surfaces_need_conversion(self):
+        surface = pygame.Surface((4, 3), depth=24)
+        self.assertIsNone(imgui_wrapper.get_pixel_format(surface))
+
+
+class UploadTest(unittest.TestCase):
+
+    def setUp(self):
+        # skip the display and ImGui setup, the ids are usually generated by OpenGL
+        self.wrapper = imgui_wrapper.OpenGlWrapper(use_pbo=True, init_gl=False)
+        self.wrapper.tex_id = 1
+        self.wrapper.pbo_ids = [2, 3]
+        self.surface = pygame.Surface((4, 3), depth=32, masks=(0xff0000, 0x00ff00, 0x0000ff, 0))
+
+        # records all calls in order
+        self.gl = unittest.mock.Mock()
+        self.gl.glMapBuffer.return_value = 0
+        names = ['glBindTexture', 'glTexImage2D', 'glBindBuffer', 'glBufferData', 'glMapBuffer', 'glUnmapBuffer',
+                 'glTexSubImage2D', 'glPixelStorei']
+        patcher = unittest.mock.patch.multiple(OpenGL.GL, **{name: getattr(self.gl, name) for name in names})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_texture_sources(self):
+        """Returns the bound pixel buffer of each texture update, or 0 if it was read from memory."""
+        bound = 0
+        sources = list()
+        for name, args, _ in self.gl.mock_calls:
+            if name == 'glBindBuffer':
+                bound = args[1]
+            elif name == 'glTexSubImage2D':
+                sources.append(bound)
+        return sources
+
+    def get_row_length(self):
+        """Returns the last unpack row length which was set."""
+        values = [args[1] for name, args, _ in self.gl.mock_calls
+                  if name == 'glPixelStorei' and args[0] == OpenGL.GL.GL_UNPACK_ROW_LENGTH]
+        return values[-1]
+
+    def test__first_frame_is_written_directly(self):
+        self.wrapper.upload(self.surface)
+
+        self.assertEqual(self.get_texture_sources(), [0])
+        self.gl.glMapBuffer.assert_not_called()
+        self.assertFalse(self.wrapper.pbo_ready)
+
+    def test__later_frames_are_streamed_one_frame_behind(self):
+        self.wrapper.upload(self.surface)
+        self.wrapper.upload(self.surface)
+        self.assertEqual(self.get_texture_sources(), [0])
+        self.assertTrue(self.wrapper.pbo_ready)
+
+        self.wrapper.upload(self.surface)
+        self.assertEqual(self.get_texture_sources(), [0, 3])
+
+    def test__flush_pending_uploads_last_frame(self):
+        self.wrapper.upload(self.surface)
+        self.wrapper.upload(self.surface)
+        self.wrapper.flush_pending()
+
+        self.assertEqual(self.get_texture_sources(), [0, 3])
+        self.assertFalse(self.wrapper.pbo_ready)
+
+        # nothing left to flush
+        self.wrapper.flush_pending()
+        self.assertEqual(self.get_texture_sources(), [0, 3])
+
+    def test__row_length_is_reset(self):
+        self.wrapper.upload(self.surface)
+        self.assertEqual(self.get_row_length(), 0)
+
+        self.wrapper.upload(self.surface)
+        self.wrapper.flush_pending()
+        self.assertEqual(self.get_row_length(), 0)
+
+    def test__row_length_is_reset_without_pbo(self):
+        self.wrapper.pbo_ids = None
+        self.wrapper.upload(self.surface)
+        self.wrapper.upload(self.surface, [pygame.Rect(1, 1, 2, 1)])
+
+        self.assertEqual(self.get_texture_sources(), [0, 0])
+        self.assertEqual(self.get_row_length(), 0)
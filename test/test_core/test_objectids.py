@@ -29,3 +29,28 @@ class ObjectIdTest(unittest.TestCase):
 
         el = lis.get_by_id(5)
         self.assertIsNone(el)
+
+    def test__remove_by_ids(self):
+        lis = objectids.IdList[Demo]()
+        lis.append(Demo(1, 'first'))
+        lis.append(Demo(4, 'fourth'))
+        lis.append(Demo(7, 'seventh'))
+        lis.append(Demo(9, 'ninth'))
+
+        lis.remove_by_ids({4, 9, 12})
+        self.assertIsInstance(lis, objectids.IdList)
+        self.assertEqual([obj.object_id for obj in lis], [1, 7])
+
+    def test__remove_instances(self):
+        first = Demo(1, 'first')
+        second = Demo(1, 'first')
+        third = Demo(3, 'third')
+        lis = [first, second, third]
+
+        # equal but not identical elements are kept
+        removed = objectids.remove_instances(lis, [second, second])
+        self.assertEqual(len(removed), 1)
+        self.assertIs(removed[0], second)
+        self.assertEqual(len(lis), 2)
+        self.assertIs(lis[0], first)
+        self.assertIs(lis[1], third)
@@ -0,0 +1,79 @@
+import unittest
+import pygame
+
+from core import gc_policy, perf_overlay, profiler
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test__get_returns_latest_values_in_order(self):
+        history = perf_overlay.History(size=3)
+        self.assertEqual(len(history.get()), 0)
+        self.assertEqual(history.latest(), 0.0)
+
+        for value in range(5):
+            history.append(value)
+
+        self.assertEqual(list(history.get()), [2.0, 3.0, 4.0])
+        self.assertEqual(history.latest(), 4.0)
+
+
+class PerfOverlayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = profiler.Profiler()
+        self.policy = gc_policy.GcPolicy()
+        self.overlay = perf_overlay.PerfOverlay(self.profiler, self.policy, None, lambda: {'actors': 2})
+
+    def tearDown(self):
+        if self.overlay.visible:
+            self.overlay.toggle()
+
+    def test__toggle_enables_profiler_while_visible(self):
+        event = pygame.event.Event(pygame.KEYDOWN, key=perf_overlay.TOGGLE_KEY)
+        self.overlay.process_event(event)
+        self.assertTrue(self.overlay.visible)
+        self.assertTrue(self.profiler.enabled)
+
+        self.overlay.process_event(event)
+        self.assertFalse(self.overlay.visible)
+        self.assertFalse(self.profiler.enabled)
+
+    def test__record(self):
+        self.overlay.toggle()
+        self.profiler.add('update', 4.0)
+        self.profiler.add('update.physics', 3.0)
+        self.profiler.add('draw', 5.0)
+        self.profiler.add('tick', 20.0)
+        self.profiler.add('gc', 1.0)
+        self.profiler.end_frame()
+        self.policy.num_collections[1] += 1
+        self.overlay.record()
+
+        # neither nested sections nor waiting for the next frame are counted
+        self.assertEqual(self.overlay.frame_times.latest(), 9.0)
+        self.assertEqual(self.overlay.get_gc_runs(), [0, 1, 0])
+        self.assertEqual(self.overlay.gc_times.latest(), 1.0)
+        self.assertEqual(self.overlay.entity_counts['actors'].latest(), 2.0)
+
+    def test__toggle_drops_old_values(self):
+        self.overlay.toggle()
+        self.profiler.add('update', 4.0)
+        self.profiler.end_frame()
+        self.policy.num_collections[0] += 2
+        self.overlay.record()
+        self.overlay.toggle()
+
+        self.overlay.toggle()
+        self.assertEqual(len(self.overlay.frame_times.get()), 0)
+        self.assertEqual(len(self.overlay.entity_counts), 0)
+        self.assertEqual(self.overlay.get_gc_runs(), [0, 0, 0])
+
+        # the profiler's last frame was recorded before
+        self.overlay.record()
+        self.assertEqual(len(self.overlay.frame_times.get()), 0)
+
+        self.profiler.add('update', 2.0)
+        self.profiler.end_frame()
+        self.overlay.record()
+        self.assertEqual(list(self.overlay.frame_times.get()), [2.0])
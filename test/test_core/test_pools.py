@@ -0,0 +1,41 @@
+import unittest
+from dataclasses import dataclass
+
+from core import pools
+
+
+@dataclass
+class Demo:
+    value: int = 0
+
+
+class PoolTest(unittest.TestCase):
+
+    def test__acquire_creates_if_empty(self):
+        pool = pools.Pool(Demo)
+        first = pool.acquire()
+        second = pool.acquire()
+
+        self.assertIsInstance(first, Demo)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(pool), 0)
+
+    def test__acquire_reuses_released(self):
+        pool = pools.Pool(Demo)
+        first = pool.acquire()
+        first.value = 5
+        pool.release(first)
+        self.assertEqual(len(pool), 1)
+
+        # instance is handed out as released
+        second = pool.acquire()
+        self.assertIs(second, first)
+        self.assertEqual(second.value, 5)
+        self.assertEqual(len(pool), 0)
+
+    def test__release_respects_max_size(self):
+        pool = pools.Pool(Demo, max_size=2)
+        for _ in range(5):
+            pool.release(Demo())
+
+        self.assertEqual(len(pool), 2)
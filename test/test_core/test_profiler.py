@@ -0,0 +1,95 @@
+import gc
+import unittest
+import json
+import pathlib
+import tempfile
+
+from core import profiler
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = profiler.Profiler(history_size=4, enabled=True)
+
+    def record(self, **times) -> None:
+        for name, elapsed_ms in times.items():
+            self.profiler.current[name] = elapsed_ms
+        self.profiler.end_frame()
+
+    def test__disabled_records_nothing(self):
+        self.profiler.enabled = False
+        start = self.profiler.begin()
+        self.profiler.end('update', start)
+        self.profiler.end_frame()
+
+        self.assertEqual(start, 0.0)
+        self.assertEqual(self.profiler.num_frames, 0)
+        self.assertEqual(self.profiler.names, [])
+
+    def test__sections_are_summed_per_frame(self):
+        start = self.profiler.begin()
+        self.profiler.end('update', start)
+        self.profiler.end('update', start)
+        self.profiler.end_frame()
+
+        self.assertEqual(self.profiler.names, ['update'])
+        self.assertEqual(self.profiler.get_times('update').shape, (1,))
+        self.assertGreaterEqual(self.profiler.get_times('update')[0], 0.0)
+
+    def test__ring_buffer_keeps_latest_frames(self):
+        for value in range(6):
+            self.record(update=float(value))
+        self.record(update=6.0, draw=1.0)
+
+        self.assertEqual(list(self.profiler.get_times('update')), [3.0, 4.0, 5.0, 6.0])
+        # sections which appear later are zero in earlier frames
+        self.assertEqual(list(self.profiler.get_times('draw')), [0.0, 0.0, 0.0, 1.0])
+        self.assertEqual(len(self.profiler.get_times('unknown')), 0)
+
+    def test__percentiles(self):
+        for value in [1.0, 2.0, 3.0, 4.0]:
+            self.record(update=value)
+
+        percentiles = self.profiler.get_percentiles('update', (0.0, 50.0, 100.0))
+        self.assertAlmostEqual(percentiles[0.0], 1.0)
+        self.assertAlmostEqual(percentiles[50.0], 2.5)
+        self.assertAlmostEqual(percentiles[100.0], 4.0)
+
+        summary = self.profiler.get_summary()
+        self.assertAlmostEqual(summary['update']['mean'], 2.5)
+        self.assertAlmostEqual(summary['update']['max'], 4.0)
+
+    def test__export(self):
+        self.record(update=1.0, draw=2.0)
+        self.record(update=3.0)
+
+        with tempfile.TemporaryDirectory() as root:
+            json_path = pathlib.Path(root) / 'profile.json'
+            self.profiler.to_json(json_path)
+            with open(json_path) as file:
+                data = json.load(file)
+            self.assertEqual(data['sections'], ['update', 'draw'])
+            self.assertEqual(data['frames'], [[1.0, 2.0], [3.0, 0.0]])
+
+            csv_path = pathlib.Path(root) / 'profile.csv'
+            self.profiler.to_csv(csv_path)
+            with open(csv_path) as file:
+                lines = file.read().splitlines()
+            self.assertEqual(lines, ['update,draw', '1.0,2.0', '3.0,0.0'])
+
+
+class GcMonitorTest(unittest.TestCase):
+
+    def test__records_collections_while_installed(self):
+        monitor = profiler.GcMonitor()
+        monitor.install()
+        gc.collect()
+        monitor.uninstall()
+        gc.collect()
+
+        collections = monitor.pop_collections()
+        self.assertEqual(len(collections), 1)
+        self.assertEqual(collections[0][0], 2)
+        self.assertGreaterEqual(collections[0][1], 0.0)
+        self.assertEqual(monitor.pop_collections(), [])
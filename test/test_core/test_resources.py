@@ -1,7 +1,8 @@
 import pygame
+import pathlib
 import unittest
 
-from core import resources
+from core import resources, paths
 
 
 def color_to_hex(color: pygame.Color) -> str:
@@ -42,3 +43,21 @@ class ResourcesTest(unittest.TestCase):
 
                 hex_ = color_to_hex(surface.unmap_rgb(pixels[x, y]))
                 self.assertEqual(hex_, hex_str)
+
+    # --- get_outlined_surface -----------------------------------------------------------------------------------------
+
+    def test__get_outlined_surface(self):
+        cache = resources.Cache(paths.DataPath(pathlib.Path('.')))
+        surface = pygame.Surface((5, 5), flags=pygame.SRCALPHA)
+        pygame.draw.rect(surface, 'green', pygame.Rect(1, 1, 3, 3))
+
+        outlined = cache.get_outlined_surface(surface, pygame.Color('yellow'))
+        self.assertIsNot(outlined, surface)
+        self.assertEqual(outlined.get_at((1, 1)), pygame.Color('yellow'))
+        self.assertEqual(outlined.get_at((2, 2)), pygame.Color('green'))
+        # the source is not modified
+        self.assertEqual(surface.get_at((1, 1)), pygame.Color('green'))
+
+        self.assertIs(cache.get_outlined_surface(surface, pygame.Color('yellow')), outlined)
+        self.assertIsNot(cache.get_outlined_surface(surface, pygame.Color('red')), outlined)
+        self.assertEqual(cache.get_stats()['outlined'], 2)
@@ -0,0 +1,179 @@
+import gc
+import unittest
+import pygame
+import pathlib
+import tempfile
+
+from core import state_machine
+
+
+class CountingState(state_machine.State):
+
+    def __init__(self, engine: state_machine.Engine, max_updates: int):
+        super().__init__(engine)
+        self.max_updates = max_updates
+        self.elapsed = list()
+        self.num_draws = 0
+
+    def process_event(self, event: pygame.event.Event) -> None:
+        pass
+
+    def update(self, elapsed_ms: int) -> None:
+        self.elapsed.append(elapsed_ms)
+        if len(self.elapsed) == self.max_updates:
+            self.engine.pop()
+
+    def draw(self) -> None:
+        self.num_draws += 1
+        self.engine.buffer.fill('red', (0, 0, len(self.elapsed), 1))
+
+
+class StubWrapper(object):
+    """Counts the uploads instead of using OpenGL."""
+
+    def __init__(self):
+        self.num_uploads = 0
+        self.num_flushes = 0
+
+    def upload(self, source: pygame.Surface, rects=None) -> None:
+        self.num_uploads += 1
+
+    def flush_pending(self) -> None:
+        self.num_flushes += 1
+
+
+class UploadingEngine(state_machine.HeadlessEngine):
+    """Headless engine which draws like the windowed engine, using a stub wrapper."""
+
+    draw = state_machine.Engine.draw
+
+    def __init__(self, screen_width: int, screen_height: int):
+        super().__init__(screen_width, screen_height, step_ms=20)
+        self.wrapper = StubWrapper()
+
+
+class HeadlessEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = state_machine.HeadlessEngine(32, 16, step_ms=20, capture_interval=2)
+
+    def tearDown(self):
+        # the engine quits pygame once it is collected, which must not happen during another test. Pushed states froze
+        # it, so it needs to be unfrozen first.
+        self.engine = None
+        gc.unfreeze()
+        gc.collect()
+
+    def test__run_until_no_state_is_left(self):
+        state = CountingState(self.engine, 4)
+        self.engine.push(state)
+        self.engine.run()
+
+        self.assertEqual(state.elapsed, [0, 20, 20, 20])
+        self.assertEqual(len(self.engine.queue), 0)
+
+    def test__run_max_frames(self):
+        state = CountingState(self.engine, 100)
+        self.engine.push(state)
+        self.engine.run(max_frames=5)
+
+        self.assertEqual(len(state.elapsed), 5)
+        self.assertEqual(len(self.engine.queue), 1)
+
+    def test__capture_frames(self):
+        state = CountingState(self.engine, 100)
+        self.engine.push(state)
+        self.engine.run(max_frames=5)
+
+        # frames 0, 2 and 4 are captured
+        self.assertEqual(len(self.engine.frames), 3)
+        self.assertEqual(self.engine.frames[1].get_at((2, 0)), pygame.Color('red'))
+        self.assertEqual(self.engine.frames[1].get_at((3, 0)), pygame.Color('black'))
+
+    def test__buffer_is_kept_if_the_state_restores_it(self):
+        state = CountingState(self.engine, 100)
+        state.restores_buffer = True
+        self.engine.push(state)
+        self.engine.run(max_frames=5)
+
+        # all frames' pixels are still there
+        self.assertEqual(self.engine.frames[1].get_at((1, 0)), pygame.Color('red'))
+        self.assertEqual(self.engine.frames[2].get_at((3, 0)), pygame.Color('red'))
+
+    def test__pop_keeps_remaining_states_frozen(self):
+        self.engine.push(CountingState(self.engine, 100))
+        self.engine.push(CountingState(self.engine, 100))
+
+        self.engine.pop()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        self.engine.pop()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test__capture(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.engine.capture.output_dir = pathlib.Path(root)
+            state = CountingState(self.engine, 100)
+            self.engine.push(state)
+
+            self.engine.run(max_frames=2)
+            self.assertEqual(len(self.engine.capture.last_files), 0)
+
+            self.engine.start_capture(2)
+            self.engine.run(max_frames=3)
+            self.assertFalse(self.engine.capture.active)
+            self.assertEqual(len(self.engine.capture.last_files), 2)
+            self.assertTrue(self.engine.capture.last_files[0].exists())
+
+
+class RedrawOnDemandTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = UploadingEngine(32, 16)
+        self.state = CountingState(self.engine, 100)
+        self.state.redraw_on_demand = True
+        self.engine.push(self.state)
+
+    def tearDown(self):
+        self.engine = None
+        self.state = None
+        gc.unfreeze()
+        gc.collect()
+
+    def test__draw_and_upload_are_skipped_while_idle(self):
+        self.engine.run(max_frames=5)
+
+        # only the frame after pushing the state
+        self.assertEqual(self.state.num_draws, 1)
+        self.assertEqual(self.engine.wrapper.num_uploads, 1)
+        self.assertEqual(self.engine.wrapper.num_flushes, 4)
+
+    def test__request_redraw_draws_once(self):
+        self.engine.run(max_frames=2)
+        self.engine.request_redraw()
+        self.engine.run(max_frames=3)
+
+        self.assertEqual(self.state.num_draws, 2)
+        self.assertEqual(self.engine.wrapper.num_uploads, 2)
+
+    def test__push_and_pop_draw_once(self):
+        self.engine.run(max_frames=2)
+
+        other = CountingState(self.engine, 100)
+        other.redraw_on_demand = True
+        self.engine.push(other)
+        self.engine.run(max_frames=3)
+        self.assertEqual(other.num_draws, 1)
+
+        self.engine.pop()
+        self.engine.run(max_frames=3)
+        self.assertEqual(self.state.num_draws, 2)
+        self.assertEqual(self.engine.wrapper.num_uploads, 3)
+
+    def test__states_without_redraw_on_demand_are_always_drawn(self):
+        self.state.redraw_on_demand = False
+        self.engine.run(max_frames=5)
+
+        self.assertEqual(self.state.num_draws, 5)
+        self.assertEqual(self.engine.wrapper.num_uploads, 5)
+        self.assertEqual(self.engine.wrapper.num_flushes, 0)
@@ -113,3 +113,14 @@ class AnimationSystemTest(unittest.TestCase):
         # make sure everybody got updated
         for actor in self.ctx.actors:
             self.assertEqual(actor.oscillate.total_time_ms, 25)
+
+    def test__remove_projectiles_reuses_projectiles(self):
+        proj1 = self.ctx.create_projectile(3)
+        self.ctx.create_projectile(4)
+
+        self.ctx.remove_projectiles({3})
+        self.assertEqual([proj.object_id for proj in self.ctx.projectiles], [4])
+
+        proj3 = self.ctx.create_projectile(5)
+        self.assertIs(proj3, proj1)
+        self.assertEqual(proj3.object_id, 5)
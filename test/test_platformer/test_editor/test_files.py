@@ -22,6 +22,7 @@ class LevelTest(unittest.TestCase):
 
         ctx.create_ladder(x=3.25, y=0.5, height=4)
         ctx.create_object(x=3.5, y=5.5, object_type=constants.ObjectType.FOOD)
+        ctx.create_trigger(x=-2.0, y=-20.0, width=30.0, height=10.0, trigger_type=physics.TriggerType.KILL)
 
         root = files.to_xml(ctx)
         other = files.from_xml(root)
@@ -60,6 +61,13 @@ class LevelTest(unittest.TestCase):
         self.assertEqual(other.objects[0].pos.x, 3.5)
         self.assertEqual(other.objects[0].pos.y, 5.5)
         self.assertEqual(other.objects[0].object_type, constants.ObjectType.FOOD)
+        self.assertEqual(len(other.triggers), 1)
+        self.assertEqual(other.triggers[0].pos.x, -2.0)
+        self.assertEqual(other.triggers[0].pos.y, -20.0)
+        self.assertEqual(other.triggers[0].width, 30.0)
+        self.assertEqual(other.triggers[0].height, 10.0)
+        self.assertEqual(other.triggers[0].trigger_type, physics.TriggerType.KILL)
+        self.assertEqual(len(other.get_triggers_at(other.triggers[0].pos)), 1)
 
     def test__to_file_from_file_invert_each_other(self):
         ctx = physics.Context()
@@ -0,0 +1,86 @@
+import unittest
+import pathlib
+import numpy
+
+from platformer import environment
+
+
+LEVEL_PATH = pathlib.Path(__file__).parents[2] / 'data' / 'levels' / 'stage01.xml'
+
+
+class EnvironmentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.env = environment.Environment(2, LEVEL_PATH)
+
+    def test__reset(self):
+        observations = self.env.reset()
+        self.assertEqual(observations.shape, (2, environment.OBSERVATION_SIZE))
+        self.assertAlmostEqual(observations[0, 0], 5.0)
+        self.assertAlmostEqual(observations[0, 1], 5.0)
+        self.assertFalse(self.env.dones.any())
+
+    def test__step_moves_only_the_pressed_world(self):
+        self.env.reset()
+        actions = numpy.zeros((2, environment.NUM_BUTTONS), dtype=bool)
+        actions[0, environment.RIGHT] = True
+        for _ in range(10):
+            observations, dones = self.env.step(actions)
+
+        self.assertGreater(observations[0, 0], 5.0)
+        self.assertAlmostEqual(observations[1, 0], 5.0)
+        self.assertFalse(dones.any())
+
+    def test__kill_zone_reaches_beside_the_level(self):
+        self.env.reset()
+        world = self.env.worlds[0]
+        phys_player = world.factory.ctx.physics.actors.get_by_id(world.player_char.object_id)
+        right = max(platform.pos.x + platform.width for platform in world.factory.ctx.physics.platforms)
+        phys_player.pos.x = right + 1000.0
+        phys_player.pos.y = -500.0
+
+        actions = numpy.zeros((2, environment.NUM_BUTTONS), dtype=bool)
+        _, dones = self.env.step(actions)
+        self.assertTrue(dones[0])
+        self.assertFalse(dones[1])
+
+    def test__kill_zone_finishes_world(self):
+        self.env.reset()
+        world = self.env.worlds[1]
+        phys_player = world.factory.ctx.physics.actors.get_by_id(world.player_char.object_id)
+        phys_player.pos.y = -20.0
+
+        actions = numpy.zeros((2, environment.NUM_BUTTONS), dtype=bool)
+        _, dones = self.env.step(actions)
+        self.assertFalse(dones[0])
+        self.assertTrue(dones[1])
+
+        # done worlds are frozen until they are reset
+        before = self.env.observations[1].copy()
+        observations, _ = self.env.step(actions)
+        self.assertTrue((observations[1] == before).all())
+
+        self.env.reset([1])
+        self.assertFalse(self.env.dones[1])
+        self.assertAlmostEqual(self.env.observations[1, 1], 5.0)
+
+    def test__seed_makes_worlds_reproducible(self):
+        def get_random_objects(env: environment.Environment):
+            result = list()
+            for world in env.worlds:
+                for _ in range(3):
+                    world.factory.create_random_object()
+                obj = world.factory.ctx.physics.objects[-1]
+                result.append((obj.pos.x, obj.pos.y, obj.object_type))
+            return result
+
+        first = environment.Environment(2, LEVEL_PATH, seed=3)
+        second = environment.Environment(2, LEVEL_PATH, seed=3)
+        self.assertEqual(get_random_objects(first), get_random_objects(second))
+
+        # reset worlds continue with new generators from the same sequence
+        first.reset()
+        second.reset()
+        self.assertEqual(get_random_objects(first), get_random_objects(second))
+        self.assertEqual(first.worlds[0].factory.ctx.particles.rng.random(),
+                         second.worlds[0].factory.ctx.particles.rng.random())
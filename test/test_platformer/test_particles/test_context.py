@@ -0,0 +1,86 @@
+import unittest
+import math
+import pygame
+
+from core import constants
+from platformer import physics
+from platformer.particles import context
+
+
+class ParticleContextTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = context.Context(capacity=100, seed=0)
+
+    def test__emit(self):
+        num = self.ctx.emit(2.0, 3.0, 10, context.DUST_COLOR, speed=1.0, ttl_ms=100)
+        self.assertEqual(num, 10)
+        self.assertEqual(self.ctx.count, 10)
+        self.assertTrue((self.ctx.pos[:10, 0] == 2.0).all())
+        self.assertTrue((self.ctx.pos[:10, 1] == 3.0).all())
+        self.assertTrue((self.ctx.ttl[:10] > 0).all())
+        self.assertTrue((self.ctx.ttl[:10] <= 100).all())
+
+        # upwards by default
+        self.assertTrue((self.ctx.vel[:10, 1] >= 0.0).all())
+
+    def test__emit_respects_capacity(self):
+        self.ctx.emit(0.0, 0.0, 80, context.DUST_COLOR, speed=1.0, ttl_ms=100)
+        num = self.ctx.emit(0.0, 0.0, 80, context.SPARK_COLOR, speed=1.0, ttl_ms=100)
+        self.assertEqual(num, 20)
+        self.assertEqual(self.ctx.count, 100)
+
+        num = self.ctx.emit(0.0, 0.0, 80, context.SPARK_COLOR, speed=1.0, ttl_ms=100)
+        self.assertEqual(num, 0)
+
+    def test__update_moves_particles(self):
+        self.ctx.emit(2.0, 3.0, 10, context.DUST_COLOR, speed=1.0, ttl_ms=1000, angle=0.0, spread=0.0)
+        self.ctx.update(10)
+
+        self.assertEqual(self.ctx.count, 10)
+        self.assertTrue((self.ctx.pos[:10, 0] > 2.0).all())
+        self.assertTrue((self.ctx.vel[:10, 1] < 0.0).all())
+
+    def test__update_drops_expired_particles(self):
+        self.ctx.emit(0.0, 0.0, 10, context.DUST_COLOR, speed=1.0, ttl_ms=50)
+        self.ctx.emit(5.0, 5.0, 5, context.SPARK_COLOR, speed=1.0, ttl_ms=1000)
+
+        self.ctx.update(60)
+        self.assertEqual(self.ctx.count, 5)
+        self.assertTrue((self.ctx.color[:5] == context.SPARK_COLOR).all())
+        self.assertTrue((self.ctx.pos[:5, 0] > 4.0).all())
+
+
+class ParticleSystemTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = context.Context(capacity=100, seed=0)
+        self.system = context.ParticleSystem(self.ctx)
+
+    def test__on_landing(self):
+        actor = physics.Actor(object_id=1, pos=pygame.math.Vector2(2.0, 1.0))
+        self.system.on_landing(actor)
+        self.assertGreater(self.ctx.count, 0)
+        self.assertTrue((self.ctx.color[:self.ctx.count] == context.DUST_COLOR).all())
+
+    def test__on_impact_platform(self):
+        platform = physics.Platform(pos=pygame.math.Vector2(0.0, 0.0), width=3)
+        proj = physics.Projectile(object_id=1, pos=pygame.math.Vector2(1.0, 0.0),
+                                  object_type=constants.ObjectType.FOOD)
+        self.system.on_impact_platform(proj, platform)
+        self.assertEqual(self.ctx.count, 0)
+
+        proj.object_type = constants.ObjectType.WEAPON
+        self.system.on_impact_platform(proj, platform)
+        self.assertGreater(self.ctx.count, 0)
+
+    def test__on_touch_object(self):
+        actor = physics.Actor(object_id=1, pos=pygame.math.Vector2(2.0, 1.0))
+        obj = physics.Object(pos=pygame.math.Vector2(2.0, 1.0), object_type=constants.ObjectType.WEAPON)
+        self.system.on_touch_object(actor, obj)
+        self.assertEqual(self.ctx.count, 0)
+
+        obj.object_type = constants.ObjectType.FOOD
+        self.system.on_touch_object(actor, obj)
+        self.assertGreater(self.ctx.count, 0)
+        self.assertAlmostEqual(math.fsum(self.ctx.pos[:self.ctx.count, 0]) / self.ctx.count, 2.0)
@@ -0,0 +1,35 @@
+import unittest
+
+from platformer.physics import changes
+
+
+class ChangeLogTest(unittest.TestCase):
+
+    def test__since_returns_changes_in_order(self):
+        log = changes.ChangeLog()
+        version = log.version
+        log.record('first', (0.0, 0.0, 1.0, 1.0))
+        log.record('second', (2.0, 0.0, 3.0, 1.0))
+
+        found = log.since(version)
+        self.assertEqual([change.element for change in found], ['first', 'second'])
+        self.assertEqual([change.element for change in log.since(version + 1)], ['second'])
+        self.assertEqual(log.since(log.version), [])
+
+    def test__since_requires_rebuild_if_changes_were_dropped(self):
+        log = changes.ChangeLog(max_size=2)
+        log.record('first', (0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(len(log.since(0)), 1)
+
+        log.record('second', (0.0, 0.0, 1.0, 1.0))
+        log.record('third', (0.0, 0.0, 1.0, 1.0))
+        self.assertIsNone(log.since(0))
+        self.assertEqual([change.element for change in log.since(1)], ['second', 'third'])
+
+        version = log.version
+        log.reset()
+        self.assertIsNone(log.since(version))
+        self.assertEqual(log.since(log.version), [])
+
+    def test__get_union(self):
+        self.assertEqual(changes.get_union((0.0, 1.0, 2.0, 3.0), (-1.0, 2.0, 1.0, 4.0)), (-1.0, 1.0, 2.0, 4.0))
@@ -0,0 +1,37 @@
+import unittest
+import pygame
+
+from core import constants
+from platformer.physics import actors, objects, projectiles, collision
+
+
+class CollisionFilterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.player = actors.Actor(object_id=1, pos=pygame.math.Vector2(1, 1))
+        self.enemy = actors.Actor(object_id=2, pos=pygame.math.Vector2(1, 1),
+                                  category=collision.CollisionCategory.ENEMY, mask=collision.ENEMY_MASK)
+        self.other_enemy = actors.Actor(object_id=3, pos=pygame.math.Vector2(1, 1),
+                                        category=collision.CollisionCategory.ENEMY, mask=collision.ENEMY_MASK)
+        self.obj = objects.Object(pos=pygame.math.Vector2(1, 1), object_type=constants.ObjectType.FOOD)
+        self.proj = projectiles.Projectile(object_id=4, pos=pygame.math.Vector2(1, 1))
+
+    def test__is_relevant_pair(self):
+        self.assertTrue(collision.is_relevant_pair(self.player, self.enemy))
+        self.assertTrue(collision.is_relevant_pair(self.enemy, self.player))
+        self.assertTrue(collision.is_relevant_pair(self.player, self.obj))
+        self.assertTrue(collision.is_relevant_pair(self.proj, self.player))
+        self.assertTrue(collision.is_relevant_pair(self.proj, self.enemy))
+
+        # enemies ignore each other and all objects
+        self.assertFalse(collision.is_relevant_pair(self.enemy, self.other_enemy))
+        self.assertFalse(collision.is_relevant_pair(self.enemy, self.obj))
+
+        # projectiles do not interact with objects
+        self.assertFalse(collision.is_relevant_pair(self.proj, self.obj))
+
+    def test__is_relevant_pair_requires_both_directions(self):
+        self.player.mask = collision.CollisionCategory.OBJECT
+        self.assertFalse(collision.is_relevant_pair(self.player, self.enemy))
+        self.assertFalse(collision.is_relevant_pair(self.enemy, self.player))
+        self.assertTrue(collision.is_relevant_pair(self.player, self.obj))
@@ -0,0 +1,50 @@
+import unittest
+
+from platformer.physics import contacts
+
+
+class ContactCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = contacts.ContactCache()
+        self.first = ['first']
+        self.second = ['second']
+
+    def test__touch_reports_begin_once(self):
+        self.assertTrue(self.cache.touch(self.first, self.second))
+        self.assertFalse(self.cache.touch(self.first, self.second))
+        # pairs are directed
+        self.assertTrue(self.cache.touch(self.second, self.first))
+        self.assertEqual(len(self.cache), 2)
+
+    def test__unordered_pairs_are_the_same_contact(self):
+        self.assertTrue(self.cache.touch(self.first, self.second, unordered=True))
+        self.assertFalse(self.cache.touch(self.second, self.first, unordered=True))
+        self.assertEqual(len(self.cache), 1)
+
+        # the order of the first touch is kept
+        self.cache.end_update()
+        ended = self.cache.end_update()
+        self.assertIs(ended[0][0], self.first)
+        self.assertIs(ended[0][1], self.second)
+
+    def test__end_update_returns_pairs_not_touched(self):
+        self.cache.touch(self.first, self.second)
+        self.assertEqual(self.cache.end_update(), [])
+
+        self.cache.touch(self.first, self.second)
+        self.assertEqual(self.cache.end_update(), [])
+
+        ended = self.cache.end_update()
+        self.assertEqual(len(ended), 1)
+        self.assertIs(ended[0][0], self.first)
+        self.assertIs(ended[0][1], self.second)
+        self.assertEqual(len(self.cache), 0)
+
+    def test__discard_forgets_without_ending(self):
+        self.cache.touch(self.first, self.second)
+        self.cache.end_update()
+
+        self.cache.discard([self.second])
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.end_update(), [])
@@ -0,0 +1,187 @@
+import unittest
+
+from core import constants
+import pygame
+
+from platformer.physics import context, movement, triggers
+
+
+class ContextTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ctx = context.Context()
+
+    def test__remove_objects_reuses_objects(self):
+        obj1 = self.ctx.create_object(x=1.0, y=2.0, object_type=constants.ObjectType.FOOD)
+        obj2 = self.ctx.create_object(x=3.0, y=2.0, object_type=constants.ObjectType.FOOD)
+
+        self.ctx.remove_objects([obj1])
+        self.assertEqual(len(self.ctx.objects), 1)
+        self.assertIs(self.ctx.objects[0], obj2)
+
+        # removed object is reset on reuse
+        obj3 = self.ctx.create_object(x=5.0, y=6.0, object_type=constants.ObjectType.WEAPON)
+        self.assertIs(obj3, obj1)
+        self.assertEqual(obj3.pos.x, 5.0)
+        self.assertEqual(obj3.pos.y, 6.0)
+        self.assertEqual(obj3.object_type, constants.ObjectType.WEAPON)
+
+    def test__remove_projectiles_reuses_projectiles(self):
+        actor = self.ctx.create_actor(1, x=1.0, y=1.0)
+        actor.move.face_x = movement.FaceDirection.LEFT
+        proj1 = self.ctx.create_projectile(2, x=1.0, y=1.5, from_actor=actor)
+        proj1.move.speed = 3.0
+        proj1.move.force.y = 0.5
+        pos = proj1.pos
+
+        self.ctx.remove_projectiles([proj1])
+        self.assertEqual(len(self.ctx.projectiles), 0)
+
+        # removing twice does not hand out the projectile twice
+        self.ctx.remove_projectiles([proj1])
+        self.assertEqual(len(self.ctx.projectile_pool), 1)
+
+        # removed projectile is reset on reuse
+        proj2 = self.ctx.create_projectile(3, x=4.0, y=2.0)
+        self.assertIs(proj2, proj1)
+        self.assertIs(proj2.pos, pos)
+        self.assertEqual(proj2.object_id, 3)
+        self.assertEqual(proj2.pos.x, 4.0)
+        self.assertEqual(proj2.pos.y, 2.0)
+        self.assertEqual(proj2.move.speed, 1.0)
+        self.assertEqual(proj2.move.face_x, movement.FaceDirection.RIGHT)
+        self.assertEqual(proj2.move.force.x, 0.0)
+        self.assertEqual(proj2.move.force.y, 0.0)
+        self.assertIsNone(proj2.from_actor)
+
+    def test__get_triggers_at(self):
+        kill = self.ctx.create_trigger(x=-10.0, y=-20.0, width=40.0, height=10.0,
+                                       trigger_type=triggers.TriggerType.KILL)
+        checkpoint = self.ctx.create_trigger(x=2.0, y=-15.0, width=1.0, height=1.0)
+
+        self.assertEqual(self.ctx.get_triggers_at(pygame.math.Vector2(0.0, 0.0)), [])
+        found = self.ctx.get_triggers_at(pygame.math.Vector2(2.5, -14.5))
+        self.assertEqual(len(found), 2)
+        self.assertIs(found[0], kill)
+        self.assertIs(found[1], checkpoint)
+
+        self.ctx.remove_trigger(kill)
+        self.assertEqual(len(self.ctx.triggers), 1)
+        self.assertEqual(self.ctx.get_triggers_at(pygame.math.Vector2(0.0, -15.0)), [])
+
+    def test__query_rect(self):
+        platform = self.ctx.create_platform(x=0.0, y=0.0, width=5, height=1)
+        ladder = self.ctx.create_ladder(x=6.0, y=1.0, height=3)
+        obj = self.ctx.create_object(x=2.0, y=1.5, object_type=constants.ObjectType.FOOD)
+        actor = self.ctx.create_actor(1, x=12.0, y=1.5)
+        proj = self.ctx.create_projectile(2, x=20.0, y=5.0)
+
+        region = self.ctx.query_rect(x=1.0, y=0.5, width=4.75, height=1.0)
+        self.assertEqual(len(region.platforms), 1)
+        self.assertIs(region.platforms[0], platform)
+        # ladders are found within their reach
+        self.assertEqual(len(region.ladders), 1)
+        self.assertIs(region.ladders[0], ladder)
+        self.assertEqual(len(region.objects), 1)
+        self.assertIs(region.objects[0], obj)
+        self.assertEqual(region.actors, [])
+        self.assertEqual(region.projectiles, [])
+
+        region = self.ctx.query_rect(x=11.0, y=0.0, width=10.0, height=10.0)
+        self.assertEqual(region.platforms, [])
+        self.assertEqual(len(region.actors), 1)
+        self.assertIs(region.actors[0], actor)
+        self.assertEqual(len(region.projectiles), 1)
+        self.assertIs(region.projectiles[0], proj)
+
+    def test__query_circle(self):
+        platform = self.ctx.create_platform(x=0.0, y=0.0, width=5, height=1)
+        actor = self.ctx.create_actor(1, x=7.0, y=1.5)
+
+        # close to the platform's corner, but not touching it
+        region = self.ctx.query_circle(x=5.5, y=1.5, radius=0.6)
+        self.assertEqual(region.platforms, [])
+        self.assertEqual(region.actors, [])
+
+        region = self.ctx.query_circle(x=5.5, y=1.5, radius=1.0)
+        self.assertEqual(len(region.platforms), 1)
+        self.assertIs(region.platforms[0], platform)
+        self.assertEqual(len(region.actors), 1)
+        self.assertIs(region.actors[0], actor)
+
+    def test__update_bounds_and_remove_keep_queries_up_to_date(self):
+        platform = self.ctx.create_platform(x=0.0, y=0.0, width=2)
+        ladder = self.ctx.create_ladder(x=1.0, y=0.0, height=2)
+        obj = self.ctx.create_object(x=1.0, y=0.5, object_type=constants.ObjectType.FOOD)
+        self.ctx.create_actor(1, x=1.0, y=0.5)
+
+        platform.pos.x = 30.0
+        self.ctx.update_bounds(platform)
+        self.assertEqual(self.ctx.query_rect(x=0.0, y=0.0, width=2.0, height=2.0).platforms, [])
+        self.assertEqual(len(self.ctx.query_rect(x=30.0, y=0.0, width=1.0, height=1.0).platforms), 1)
+
+        self.ctx.remove_platform(platform)
+        self.ctx.remove_ladder(ladder)
+        self.ctx.remove_objects([obj])
+        self.ctx.remove_actors({1})
+        region = self.ctx.query_rect(x=-50.0, y=-50.0, width=100.0, height=100.0)
+        self.assertEqual(region, context.regions.Region())
+        self.assertEqual(len(self.ctx.platforms), 0)
+        self.assertEqual(len(self.ctx.ladders), 0)
+        self.assertEqual(len(self.ctx.actors), 0)
+
+    def test__clear_level_and_apply_level(self):
+        other = context.Context()
+        platform = other.create_platform(x=0.0, y=0.0, width=2)
+        other.create_trigger(x=0.0, y=-20.0, width=10.0, height=10.0)
+
+        self.ctx.create_ladder(x=1.0, y=0.0, height=2)
+        self.ctx.clear_level()
+        self.assertEqual(self.ctx.query_rect(x=0.0, y=0.0, width=2.0, height=2.0).ladders, [])
+
+        self.ctx.apply_level(other)
+        self.assertEqual(self.ctx.query_rect(x=0.0, y=0.0, width=2.0, height=2.0).platforms, [platform])
+        self.assertEqual(len(self.ctx.get_triggers_at(pygame.math.Vector2(1.0, -15.0))), 1)
+
+    def test__mark_changed_records_old_and_new_location(self):
+        platform = self.ctx.create_platform(x=0.0, y=0.0, width=2)
+        version = self.ctx.version
+
+        platform.pos.x = 10.0
+        self.ctx.mark_changed(platform)
+        found = self.ctx.changes_since(version)
+        self.assertEqual(len(found), 1)
+        self.assertIs(found[0].element, platform)
+        self.assertEqual(found[0].bounds, (0.0, 0.0, 12.0, 0.0))
+        self.assertEqual(self.ctx.query_rect(x=10.0, y=0.0, width=1.0, height=1.0).platforms, [platform])
+
+        # moving by the simulation is not recorded
+        version = self.ctx.version
+        platform.pos.x = 11.0
+        self.ctx.update_bounds(platform)
+        self.assertEqual(self.ctx.changes_since(version), [])
+
+    def test__create_and_remove_are_recorded(self):
+        version = self.ctx.version
+        platform = self.ctx.create_platform(x=0.0, y=0.0, width=2)
+        ladder = self.ctx.create_ladder(x=1.0, y=0.0, height=2)
+        obj = self.ctx.create_object(x=1.0, y=0.5, object_type=constants.ObjectType.FOOD)
+        self.ctx.remove_objects([obj])
+        self.ctx.remove_platform(platform)
+
+        found = self.ctx.changes_since(version)
+        self.assertEqual(len(found), 5)
+        self.assertIs(found[1].element, ladder)
+        self.assertIs(found[4].element, platform)
+        self.assertEqual(found[4].bounds, (0.0, 0.0, 2.0, 0.0))
+
+        # actors are not recorded
+        version = self.ctx.version
+        self.ctx.create_actor(1, x=1.0, y=1.0)
+        self.assertEqual(self.ctx.changes_since(version), [])
+
+    def test__apply_level_requires_rebuild(self):
+        version = self.ctx.version
+        self.ctx.apply_level(context.Context())
+        self.assertIsNone(self.ctx.changes_since(version))
+        self.assertEqual(self.ctx.changes_since(self.ctx.version), [])
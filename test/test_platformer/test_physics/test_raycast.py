@@ -0,0 +1,107 @@
+import unittest
+import random
+import numpy
+import pygame
+
+from platformer.physics import context, platforms, raycast
+
+
+class RaycasterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ctx = context.Context()
+        self.ground = self.ctx.create_platform(x=0, y=0, width=20, height=2)
+        self.wall = self.ctx.create_platform(x=10, y=2, width=1, height=4)
+        self.ledge = self.ctx.create_platform(x=3, y=5, width=3)
+        self.hovering = self.ctx.create_platform(x=14, y=4, width=2)
+        self.hovering.hover.y = platforms.HoverType.SIN
+
+        self.raycaster = raycast.Raycaster(self.ctx.platforms)
+
+    def test__get_ray_distance(self):
+        bounds = (2.0, 0.0, 4.0, 1.0)
+        self.assertAlmostEqual(raycast.get_ray_distance(0.0, 0.5, 1.0, 0.0, bounds), 2.0)
+        self.assertIsNone(raycast.get_ray_distance(0.0, 0.5, -1.0, 0.0, bounds))
+        self.assertIsNone(raycast.get_ray_distance(0.0, 2.0, 1.0, 0.0, bounds))
+        # running along or leaving the top edge does not hit
+        self.assertIsNone(raycast.get_ray_distance(0.0, 1.0, 1.0, 0.0, bounds))
+        self.assertIsNone(raycast.get_ray_distance(3.0, 1.0, 0.0, 1.0, bounds))
+        # looking down from the top edge does
+        self.assertAlmostEqual(raycast.get_ray_distance(3.0, 1.0, 0.0, -1.0, bounds), 0.0)
+
+    def test__cast_finds_closest_platform(self):
+        hit = self.raycaster.cast(pygame.math.Vector2(1.0, 3.0), pygame.math.Vector2(1.0, 0.0))
+        self.assertIs(hit.platform, self.wall)
+        self.assertAlmostEqual(hit.distance, 9.0)
+
+        hit = self.raycaster.cast(pygame.math.Vector2(4.0, 8.0), pygame.math.Vector2(0.0, -2.0))
+        self.assertIs(hit.platform, self.ledge)
+        self.assertAlmostEqual(hit.distance, 3.0)
+
+        # diagonal direction is normalized
+        hit = self.raycaster.cast(pygame.math.Vector2(1.0, 5.0), pygame.math.Vector2(1.0, -1.0))
+        self.assertIs(hit.platform, self.ground)
+        self.assertAlmostEqual(hit.distance, 3.0 * 2 ** 0.5)
+
+    def test__cast_respects_max_distance(self):
+        self.assertIsNone(self.raycaster.cast(pygame.math.Vector2(1.0, 3.0), pygame.math.Vector2(1.0, 0.0),
+                                              max_distance=8.0))
+        self.assertIsNone(self.raycaster.cast(pygame.math.Vector2(1.0, 3.0), pygame.math.Vector2(-1.0, 0.0)))
+        self.assertIsNone(self.raycaster.cast(pygame.math.Vector2(1.0, 3.0), pygame.math.Vector2()))
+
+    def test__cast_uses_current_position_of_hovering_platforms(self):
+        origin = pygame.math.Vector2(15.0, 10.0)
+        direction = pygame.math.Vector2(0.0, -1.0)
+        self.assertAlmostEqual(self.raycaster.cast(origin, direction).distance, 6.0)
+
+        self.hovering.pos.y = 7.0
+        hit = self.raycaster.cast(origin, direction)
+        self.assertIs(hit.platform, self.hovering)
+        self.assertAlmostEqual(hit.distance, 3.0)
+
+    def test__line_of_sight(self):
+        self.assertTrue(self.raycaster.line_of_sight(pygame.math.Vector2(1.0, 2.0), pygame.math.Vector2(9.0, 2.0)))
+        self.assertFalse(self.raycaster.line_of_sight(pygame.math.Vector2(1.0, 3.0), pygame.math.Vector2(12.0, 3.0)))
+        self.assertTrue(self.raycaster.line_of_sight(pygame.math.Vector2(4.0, 4.0), pygame.math.Vector2(4.0, 4.0)))
+
+        result = self.raycaster.line_of_sight_many(numpy.array([[1.0, 2.0], [1.0, 3.0]]),
+                                                   numpy.array([[9.0, 2.0], [12.0, 3.0]]))
+        self.assertEqual(result.tolist(), [True, False])
+
+    def test__cast_many_matches_cast(self):
+        rng = random.Random(4)
+        origins = numpy.array([[rng.uniform(-5.0, 25.0), rng.uniform(-2.0, 10.0)] for _ in range(300)])
+        directions = numpy.array([[rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0)] for _ in range(300)])
+        directions[:10, 0] = 0.0
+        directions[10:20, 1] = 0.0
+
+        hits, distances = self.raycaster.cast_many(origins, directions, max_distance=15.0)
+        for index in range(len(origins)):
+            hit = self.raycaster.cast(pygame.math.Vector2(*origins[index]), pygame.math.Vector2(*directions[index]),
+                                      max_distance=15.0)
+            if hit is None:
+                self.assertIsNone(hits[index])
+                self.assertEqual(distances[index], numpy.inf)
+            else:
+                self.assertIsNotNone(hits[index])
+                self.assertAlmostEqual(distances[index], hit.distance)
+
+    def test__unlimited_max_distance(self):
+        origins = numpy.array([[1.0, 3.0], [1.0, 3.0]])
+        directions = numpy.array([[1.0, 0.0], [-1.0, 0.0]])
+        hits, distances = self.raycaster.cast_many(origins, directions, max_distance=numpy.inf)
+        self.assertIs(hits[0], self.wall)
+        self.assertAlmostEqual(distances[0], 9.0)
+        self.assertIsNone(hits[1])
+        self.assertIsNone(self.raycaster.cast(pygame.math.Vector2(1.0, 3.0), pygame.math.Vector2(-1.0, 0.0),
+                                              max_distance=numpy.inf))
+
+    def test__context_rebuilds_raycaster_after_create_platform(self):
+        raycaster = self.ctx.get_raycaster()
+        self.assertIs(self.ctx.get_raycaster(), raycaster)
+
+        self.ctx.create_platform(x=0, y=8, width=5)
+        self.assertIsNot(self.ctx.get_raycaster(), raycaster)
+        hit = self.ctx.raycast(pygame.math.Vector2(1.0, 10.0), pygame.math.Vector2(0.0, -1.0))
+        self.assertAlmostEqual(hit.distance, 2.0)
+        self.assertFalse(self.ctx.line_of_sight(pygame.math.Vector2(1.0, 10.0), pygame.math.Vector2(1.0, 3.0)))
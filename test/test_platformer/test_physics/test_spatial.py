@@ -0,0 +1,78 @@
+import unittest
+
+from platformer.physics import spatial
+
+
+class SpatialGridTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.grid = spatial.SpatialGrid[list](cell_size=2.0)
+
+    def test__get_cell_range(self):
+        self.assertEqual(self.grid.get_cell_range((0.0, 0.0, 1.9, 1.9)), (0, 0, 0, 0))
+        self.assertEqual(self.grid.get_cell_range((-0.5, 1.0, 4.0, 3.0)), (-1, 0, 2, 1))
+
+    def test__query_finds_overlapping_elements_in_insertion_order(self):
+        first = ['first']
+        second = ['second']
+        self.grid.insert(second, (5.0, 0.0, 9.0, 1.0))
+        self.grid.insert(first, (0.0, 0.0, 6.0, 1.0))
+
+        self.assertEqual(self.grid.query((-3.0, -3.0, -2.5, -2.5)), [])
+        self.assertEqual(self.grid.query((0.5, 0.5, 0.5, 0.5)), [first])
+        found = self.grid.query((5.5, 0.5, 5.5, 0.5))
+        self.assertEqual(len(found), 2)
+        self.assertIs(found[0], second)
+        self.assertIs(found[1], first)
+
+    def test__elements_are_tracked_by_identity(self):
+        first = ['same']
+        second = ['same']
+        self.grid.insert(first, (0.0, 0.0, 1.0, 1.0))
+        self.grid.insert(second, (0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(len(self.grid), 2)
+
+        self.assertTrue(self.grid.remove(first))
+        self.assertFalse(self.grid.remove(first))
+        found = self.grid.query((0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(len(found), 1)
+        self.assertIs(found[0], second)
+
+    def test__update_moves_element(self):
+        element = ['element']
+        self.grid.insert(element, (0.0, 0.0, 1.0, 1.0))
+        self.grid.update(element, (10.0, 10.0, 11.0, 11.0))
+
+        self.assertEqual(self.grid.query((0.0, 0.0, 1.0, 1.0)), [])
+        self.assertEqual(self.grid.query((10.5, 10.5, 10.5, 10.5)), [element])
+        self.assertEqual(self.grid.get_bounds(element), (10.0, 10.0, 11.0, 11.0))
+        # empty cells are dropped
+        self.assertEqual(len(self.grid.cells), 1)
+
+    def test__clear(self):
+        element = ['element']
+        self.grid.insert(element, (0.0, 0.0, 1.0, 1.0))
+        self.grid.clear()
+        self.assertEqual(len(self.grid), 0)
+        self.assertNotIn(element, self.grid)
+        self.assertEqual(self.grid.query((0.0, 0.0, 1.0, 1.0)), [])
+
+    def test__oversized_elements_are_found_everywhere(self):
+        grid = spatial.SpatialGrid[list](cell_size=2.0, max_cells=4)
+        small = ['small']
+        large = ['large']
+        grid.insert(large, (-1e6, -1e6, 1e6, 0.0))
+        grid.insert(small, (0.0, 0.0, 1.0, 1.0))
+
+        self.assertEqual(len(grid.cells), 1)
+        found = grid.query((0.5, 0.5, 0.5, 0.5))
+        self.assertEqual(len(found), 2)
+        self.assertIs(found[0], large)
+        self.assertEqual(grid.query((500.0, -500.0, 500.0, -500.0)), [large])
+
+        grid.update(large, (0.0, -2.0, 1.0, -1.0))
+        self.assertEqual(grid.query((500.0, -500.0, 500.0, -500.0)), [])
+        self.assertEqual(grid.query((0.5, -1.5, 0.5, -1.5)), [large])
+
+        self.assertTrue(grid.remove(large))
+        self.assertEqual(grid.query((0.5, -1.5, 0.5, -1.5)), [])
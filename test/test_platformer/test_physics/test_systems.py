@@ -1,12 +1,15 @@
 import unittest
+from typing import Union
 
 from core import constants
-from platformer.physics import actors, platforms, objects, projectiles, systems, context
+from platformer.physics import actors, platforms, objects, projectiles, systems, context, collision, triggers
 
 
 class UnittestListener(context.EventListener):
     def __init__(self):
         self.last = None
+        self.num_contacts_begun = 0
+        self.num_contacts_ended = 0
 
     def on_grab(self, actor: actors.Actor) -> None:
         self.last = ('grab', actor)
@@ -29,12 +32,26 @@ class UnittestListener(context.EventListener):
     def on_impact_actor(self, proj: projectiles.Projectile, actor: actors.Actor) -> None:
         self.last = ('impact_actor', proj, actor)
 
+    def on_contact_begin(self, actor: actors.Actor, other: Union[objects.Object, actors.Actor]) -> None:
+        self.last = ('contact_begin', actor, other)
+        self.num_contacts_begun += 1
+
+    def on_contact_end(self, actor: actors.Actor, other: Union[objects.Object, actors.Actor]) -> None:
+        self.last = ('contact_end', actor, other)
+        self.num_contacts_ended += 1
+
     def on_touch_object(self, actor: actors.Actor, obj: objects.Object) -> None:
         self.last = ('touch_object', actor, obj)
 
     def on_touch_actor(self, actor: actors.Actor, other: actors.Actor) -> None:
         self.last = ('touch_actor', actor, other)
 
+    def on_enter(self, actor: actors.Actor, trigger: triggers.Trigger) -> None:
+        self.last = ('enter', actor, trigger)
+
+    def on_exit(self, actor: actors.Actor, trigger: triggers.Trigger) -> None:
+        self.last = ('exit', actor, trigger)
+
 
 # ----------------------------------------------------------------------------------------------------------------------
 
@@ -243,10 +260,39 @@ class ActorSystemsTest(unittest.TestCase):
         self.system.handle_object_collision(actor)
         self.assertIsInstance(self.listener.last, tuple)
         self.assertEqual(len(self.listener.last), 3)
-        self.assertEqual(self.listener.last[0], 'touch_object')
+        self.assertEqual(self.listener.last[0], 'contact_begin')
         self.assertEqual(self.listener.last[1], actor)
         self.assertEqual(self.listener.last[2], obj)
 
+        # ongoing contact is not reported again
+        self.listener.last = None
+        self.system.handle_object_collision(actor)
+        self.assertIsNone(self.listener.last)
+
+    def test__handle_object_collision_reports_stay_if_enabled(self):
+        actor = self.context.create_actor(1, x=2.0, y=1.0)
+        obj = self.context.create_object(x=2.1, y=1.0, object_type=constants.ObjectType.FOOD)
+        self.system.report_stay = True
+
+        self.system.handle_object_collision(actor)
+        self.system.handle_object_collision(actor)
+        self.assertEqual(self.listener.last, ('touch_object', actor, obj))
+
+    def test__handle_object_collision_respects_masks(self):
+        actor = self.context.create_actor(1, x=2.0, y=1.0)
+        actor.category = collision.CollisionCategory.ENEMY
+        self.context.create_object(x=2.1, y=1.0, object_type=constants.ObjectType.FOOD)
+
+        # objects only collide with players
+        self.system.handle_object_collision(actor)
+        self.assertIsNone(self.listener.last)
+
+        # actor does not care about objects
+        actor.category = collision.CollisionCategory.PLAYER
+        actor.mask = collision.CollisionCategory.ENEMY
+        self.system.handle_object_collision(actor)
+        self.assertIsNone(self.listener.last)
+
     def test__handle_actor_collision(self):
         actor = self.context.create_actor(1, x=2.0, y=1.0)
 
@@ -259,10 +305,52 @@ class ActorSystemsTest(unittest.TestCase):
         self.system.handle_actor_collision(actor)
         self.assertIsInstance(self.listener.last, tuple)
         self.assertEqual(len(self.listener.last), 3)
-        self.assertEqual(self.listener.last[0], 'touch_actor')
+        self.assertEqual(self.listener.last[0], 'contact_begin')
         self.assertEqual(self.listener.last[1], actor)
         self.assertEqual(self.listener.last[2], other)
 
+    def test__handle_actor_collision_respects_masks(self):
+        actor = self.context.create_actor(1, x=2.0, y=1.0)
+        other = self.context.create_actor(2, x=2.1, y=1.0)
+        for a in [actor, other]:
+            a.category = collision.CollisionCategory.ENEMY
+            a.mask = collision.ENEMY_MASK
+
+        # enemies do not touch each other
+        self.system.handle_actor_collision(actor)
+        self.assertIsNone(self.listener.last)
+
+        # but touch players
+        other.category = collision.CollisionCategory.PLAYER
+        other.mask = collision.ACTOR_MASK
+        self.system.handle_actor_collision(actor)
+        self.assertEqual(self.listener.last[0], 'contact_begin')
+
+    def test__update_reports_contact_end(self):
+        actor = self.context.create_actor(1, x=2.0, y=1.0)
+        obj = self.context.create_object(x=2.1, y=1.0, object_type=constants.ObjectType.FOOD)
+
+        self.system.update(0)
+        self.assertEqual(self.listener.last, ('contact_begin', actor, obj))
+
+        obj.pos.x = 8.0
+        self.system.update(0)
+        self.assertEqual(self.listener.last, ('contact_end', actor, obj))
+        self.assertEqual(len(self.system.contacts), 0)
+
+    def test__update_reports_actor_contact_once(self):
+        self.context.create_actor(1, x=2.0, y=1.0)
+        other = self.context.create_actor(2, x=2.1, y=1.0)
+
+        self.system.update(0)
+        self.system.update(0)
+        self.assertEqual(self.listener.num_contacts_begun, 1)
+
+        other.pos.x = 8.0
+        self.system.update(0)
+        self.assertEqual(self.listener.num_contacts_ended, 1)
+        self.assertEqual(len(self.system.contacts), 0)
+
     # ------------------------------------------------------------------------------------------------------------------
 
     def test_can_release_off_ladder(self):
@@ -372,3 +460,55 @@ class ProjectileSystemsTest(unittest.TestCase):
         self.assertEqual(self.listener.last[0], 'impact_actor')
         self.assertEqual(self.listener.last[1], proj)
         self.assertEqual(self.listener.last[2], actor)
+
+    def test__handle_actor_collision_respects_masks(self):
+        proj = self.context.create_projectile(object_id=10, x=2.0, y=2.0)
+        proj.mask = collision.CollisionCategory.ENEMY
+        self.context.create_actor(1, x=2.2, y=2.0)
+
+        # player actor is not hit
+        self.system.handle_actor_collision(proj)
+        self.assertIsNone(self.listener.last)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+class TriggerSystemTest(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = UnittestListener()
+        self.context = context.Context()
+        self.system = systems.TriggerSystem(self.listener, self.context)
+
+    def test__update_reports_membership_changes_only(self):
+        trigger = self.context.create_trigger(x=0.0, y=-20.0, width=10.0, height=10.0,
+                                              trigger_type=triggers.TriggerType.KILL)
+        actor = self.context.create_actor(1, x=2.0, y=1.0)
+
+        self.system.update()
+        self.assertIsNone(self.listener.last)
+
+        actor.pos.y = -12.0
+        self.system.update()
+        self.assertEqual(self.listener.last, ('enter', actor, trigger))
+
+        # staying inside is not reported again
+        self.listener.last = None
+        actor.pos.y = -15.0
+        self.system.update()
+        self.assertIsNone(self.listener.last)
+
+        actor.pos.x = 11.0
+        self.system.update()
+        self.assertEqual(self.listener.last, ('exit', actor, trigger))
+
+    def test__update_forgets_removed_actors(self):
+        self.context.create_trigger(x=0.0, y=0.0, width=10.0, height=10.0)
+        self.context.create_actor(1, x=2.0, y=1.0)
+        self.system.update()
+        self.assertEqual(len(self.system.inside), 1)
+
+        self.context.actors.remove_by_ids({1})
+        self.system.update()
+        self.assertEqual(len(self.system.inside), 0)
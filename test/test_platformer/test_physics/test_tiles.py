@@ -0,0 +1,101 @@
+import unittest
+import pygame
+
+from platformer.physics import context, platforms, tiles
+
+
+class TileGridTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ctx = context.Context()
+        self.ground = self.ctx.create_platform(x=0, y=0, width=10, height=2)
+        self.ledge = self.ctx.create_platform(x=3, y=4, width=3)
+        self.free = self.ctx.create_platform(x=6.5, y=3.0, width=2)
+        self.hovering = self.ctx.create_platform(x=12, y=1, width=2)
+        self.hovering.hover.x = platforms.HoverType.SIN
+
+        self.grid = tiles.TileGrid(self.ctx.platforms)
+
+    def test__is_grid_aligned(self):
+        self.assertTrue(tiles.is_grid_aligned(self.ground))
+        self.assertTrue(tiles.is_grid_aligned(self.ledge))
+        self.assertFalse(tiles.is_grid_aligned(self.free))
+        self.assertFalse(tiles.is_grid_aligned(self.hovering))
+
+    def test__free_platforms(self):
+        self.assertEqual(len(self.grid.free_platforms), 2)
+        self.assertIs(self.grid.free_platforms[0], self.free)
+        self.assertIs(self.grid.free_platforms[1], self.hovering)
+
+    def test__is_solid(self):
+        self.assertTrue(self.grid.is_solid(0.0, 0.0))
+        self.assertTrue(self.grid.is_solid(9.5, 1.5))
+        self.assertFalse(self.grid.is_solid(10.0, 1.0))
+        self.assertFalse(self.grid.is_solid(4.0, 2.5))
+        self.assertFalse(self.grid.is_solid(-1.0, 0.0))
+        self.assertFalse(self.grid.is_solid(4.0, 100.0))
+
+        # platforms without height are not solid
+        self.assertFalse(self.grid.is_solid(4.0, 4.0))
+
+    def test__has_top_edge(self):
+        self.assertTrue(self.grid.has_top_edge(0.5, 2.0))
+        self.assertTrue(self.grid.has_top_edge(5.5, 4.0))
+        self.assertFalse(self.grid.has_top_edge(6.5, 4.0))
+        self.assertFalse(self.grid.has_top_edge(0.5, 1.0))
+
+    def test__get_support_platform(self):
+        self.assertIs(self.grid.get_support_platform(pygame.math.Vector2(0.5, 2.0)), self.ground)
+        self.assertIs(self.grid.get_support_platform(pygame.math.Vector2(4.0, 4.0)), self.ledge)
+
+        # end points are excluded
+        self.assertIsNone(self.grid.get_support_platform(pygame.math.Vector2(3.0, 4.0)))
+        self.assertIsNone(self.grid.get_support_platform(pygame.math.Vector2(6.0, 4.0)))
+
+        # not at top edge
+        self.assertIsNone(self.grid.get_support_platform(pygame.math.Vector2(4.0, 4.1)))
+        self.assertIsNone(self.grid.get_support_platform(pygame.math.Vector2(7.0, 3.0)))
+
+    def test__get_landing_candidates(self):
+        start = pygame.math.Vector2(4.0, 4.2)
+        end = pygame.math.Vector2(4.1, 3.8)
+        self.assertEqual(self.grid.get_landing_candidates(start, end), [self.ledge])
+
+        # falling through multiple top edges
+        start = pygame.math.Vector2(4.0, 5.0)
+        end = pygame.math.Vector2(4.0, 1.0)
+        self.assertEqual(self.grid.get_landing_candidates(start, end), [self.ledge, self.ground])
+
+        # jumping upwards
+        self.assertEqual(self.grid.get_landing_candidates(end, start), [])
+
+
+class ContextTileGridTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ctx = context.Context()
+        self.ctx.create_platform(x=0, y=0, width=10, height=2)
+        self.ctx.create_platform(x=3, y=4, width=3)
+        self.ctx.create_platform(x=3.5, y=3.5, width=2)
+        self.ctx.create_platform(x=6.5, y=3.0, width=2)
+
+    def test__queries_match_linear_search(self):
+        linear = context.Context()
+        linear.platforms = self.ctx.platforms
+        self.ctx.build_tile_grid()
+
+        points = [pygame.math.Vector2(x / 4, y / 2) for x in range(-4, 48) for y in range(-2, 12)]
+        for pos in points:
+            self.assertIs(self.ctx.get_support_platform(pos), linear.get_support_platform(pos))
+
+        for start in points:
+            for delta in [(0.0, -0.3), (0.25, -0.6), (-0.1, -2.5), (0.0, 0.3)]:
+                end = start + pygame.math.Vector2(delta)
+                self.assertIs(self.ctx.get_landing_platform(start, end), linear.get_landing_platform(start, end))
+
+    def test__create_platform_drops_tile_grid(self):
+        self.ctx.build_tile_grid()
+        self.assertIsNotNone(self.ctx.tile_grid)
+
+        self.ctx.create_platform(x=1, y=1, width=1)
+        self.assertIsNone(self.ctx.tile_grid)
@@ -0,0 +1,21 @@
+import unittest
+import pygame
+
+from platformer.physics import triggers
+
+
+class TriggerTest(unittest.TestCase):
+
+    def test__contains_point(self):
+        trigger = triggers.Trigger(pos=pygame.math.Vector2(2.0, 1.0), width=3.0, height=2.0)
+
+        self.assertTrue(trigger.contains_point(pygame.math.Vector2(2.0, 1.0)))
+        self.assertTrue(trigger.contains_point(pygame.math.Vector2(4.5, 2.5)))
+        # right and top edges are outside
+        self.assertFalse(trigger.contains_point(pygame.math.Vector2(5.0, 2.0)))
+        self.assertFalse(trigger.contains_point(pygame.math.Vector2(3.0, 3.0)))
+        self.assertFalse(trigger.contains_point(pygame.math.Vector2(1.9, 2.0)))
+
+    def test__get_bounds(self):
+        trigger = triggers.Trigger(pos=pygame.math.Vector2(2.0, 1.0), width=3.0, height=2.0)
+        self.assertEqual(trigger.get_bounds(), (2.0, 1.0, 5.0, 3.0))
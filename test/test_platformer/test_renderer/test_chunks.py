@@ -0,0 +1,141 @@
+import tempfile
+import unittest
+import os
+import random
+import pygame
+import pathlib
+
+from core import constants, resources, paths
+
+from platformer import physics, animations
+from platformer.renderer import base, images, chunks
+
+
+class ChunkLayerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.phy_ctx = physics.Context()
+        self.phy_ctx.create_platform(x=1, y=0, width=3, height=2)
+        self.phy_ctx.create_platform(x=8, y=3, width=4)
+        self.phy_ctx.create_platform(x=7, y=5, width=2, height=1)
+        self.phy_ctx.create_platform(x=1, y=5, width=12)
+        self.phy_ctx.create_ladder(x=9, y=3, height=2)
+
+        self.cam = base.Camera((320, 192))
+        self.cam.topleft.x = -1.5
+        self.cam.topleft.y = -0.5
+
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        pygame.init()
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        data_paths = paths.DataPath(pathlib.Path(self.tempdir.name))
+        self.cache = resources.Cache(data_paths)
+        obj_path = data_paths('objects', 'png')
+        obj_path.touch()
+        self.cache.images[str(obj_path)] = pygame.Surface((constants.OBJECT_SCALE, constants.OBJECT_SCALE))
+
+        # tileset with random colors, some pixels are transparent
+        rng = random.Random(0)
+        tiles = pygame.Surface((6 * constants.WORLD_SCALE, 3 * constants.WORLD_SCALE))
+        for y in range(0, tiles.get_height(), 4):
+            for x in range(0, tiles.get_width(), 4):
+                color = resources.alpha_key if rng.random() < 0.2 else \
+                    pygame.Color(rng.randrange(256), rng.randrange(256), rng.randrange(200))
+                tiles.fill(color, (x, y, 4, 4))
+        tiles.set_colorkey(resources.alpha_key)
+        tile_path = data_paths.tile('grass')
+        tile_path.touch()
+        self.cache.images[str(tile_path)] = tiles
+
+        self.buffer = pygame.Surface((self.cam.width, self.cam.height))
+        self.renderer = images.ImageRenderer(self.cam, self.buffer, self.phy_ctx, animations.Context(),
+                                             images.Context(), self.cache)
+        self.renderer.static_layer.chunk_size = 64
+        self.renderer.update(0)
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def draw_live(self, platforms=None) -> pygame.Surface:
+        """Draws the platforms and ladders tile by tile. A larger view is drawn and cropped, so tiles at the edges are
+        not culled.
+        """
+        if platforms is None:
+            platforms = self.phy_ctx.platforms
+
+        margin = 2
+        cam = base.Camera((self.cam.width + 2 * margin * constants.WORLD_SCALE,
+                           self.cam.height + 2 * margin * constants.WORLD_SCALE))
+        cam.topleft = self.cam.topleft - pygame.math.Vector2(margin, margin)
+        larger = pygame.Surface((cam.width, cam.height))
+        self.renderer.bake_static(larger, cam, platforms, self.phy_ctx.ladders)
+
+        offset = margin * constants.WORLD_SCALE
+        return larger.subsurface((offset, offset, self.cam.width, self.cam.height)).copy()
+
+    def draw_baked(self) -> pygame.Surface:
+        self.buffer.fill('black')
+        self.renderer.static_layer.draw(self.buffer, self.cam)
+        return self.buffer
+
+    def assertSameImage(self, first: pygame.Surface, second: pygame.Surface) -> None:
+        self.assertEqual(pygame.image.tostring(first, 'RGB'), pygame.image.tostring(second, 'RGB'))
+
+    def test__baked_layer_matches_tiles(self):
+        self.assertSameImage(self.draw_baked(), self.draw_live())
+        self.assertGreater(len(self.renderer.static_layer.chunks), 0)
+
+    def test__chunks_are_reused(self):
+        self.draw_baked()
+        chunk_surfaces = dict(self.renderer.static_layer.chunks)
+        self.draw_baked()
+        for key, chunk in self.renderer.static_layer.chunks.items():
+            self.assertIs(chunk, chunk_surfaces[key])
+
+    def test__changes_rebake_nearby_chunks(self):
+        self.draw_baked()
+        old_chunks = dict(self.renderer.static_layer.chunks)
+
+        platform = self.phy_ctx.platforms[-1]
+        platform.pos.x += 1
+        self.phy_ctx.mark_changed(platform)
+        ladder = self.phy_ctx.create_ladder(x=3, y=0, height=3)
+
+        self.assertSameImage(self.draw_baked(), self.draw_live())
+        # chunks far away from the changes are kept
+        far_key = (4, -1)
+        self.assertIs(self.renderer.static_layer.chunks[far_key], old_chunks[far_key])
+
+        self.phy_ctx.remove_ladder(ladder)
+        self.assertSameImage(self.draw_baked(), self.draw_live())
+
+    def test__hovering_platforms_are_not_baked(self):
+        self.phy_ctx.platforms[0].hover = physics.Hovering(x=physics.HoverType.SIN)
+        self.phy_ctx.mark_changed(self.phy_ctx.platforms[0])
+
+        self.assertSameImage(self.draw_baked(), self.draw_live(self.phy_ctx.platforms[1:]))
+
+    def test__invalidate_on_tileset_change(self):
+        self.draw_baked()
+        self.renderer.load_fileset(0)
+        self.assertEqual(len(self.renderer.static_layer.chunks), 0)
+
+    def test__generation_changes_with_static_elements(self):
+        layer = self.renderer.static_layer
+        layer.sync()
+        generation = layer.generation
+
+        self.phy_ctx.create_object(x=2, y=3, object_type=constants.ObjectType.FOOD)
+        layer.sync()
+        self.assertEqual(layer.generation, generation)
+
+        self.phy_ctx.create_ladder(x=3, y=0, height=3)
+        layer.sync()
+        self.assertGreater(layer.generation, generation)
+
+    def test__get_chunk_keys(self):
+        layer = chunks.ChunkLayer(self.phy_ctx, self.renderer.bake_static, chunk_size=64)
+        # 2 world units per chunk, margin of 2 units
+        keys = list(layer.get_chunk_keys((0.5, 0.5, 1.5, 1.0)))
+        self.assertEqual(keys, [(x, y) for y in range(-2, 1) for x in range(-1, 2)])
@@ -0,0 +1,56 @@
+import unittest
+import pygame
+
+from platformer.renderer import dirty
+
+
+class MergeRectsTest(unittest.TestCase):
+
+    def test__overlapping_rects_are_merged(self):
+        rects = dirty.merge_rects([pygame.Rect(0, 0, 4, 4), pygame.Rect(10, 0, 2, 2), pygame.Rect(3, 3, 4, 4)])
+        self.assertEqual(rects, [pygame.Rect(10, 0, 2, 2), pygame.Rect(0, 0, 7, 7)])
+
+    def test__chained_rects_are_merged(self):
+        # the last rect connects both others
+        rects = dirty.merge_rects([pygame.Rect(0, 0, 2, 2), pygame.Rect(4, 0, 2, 2), pygame.Rect(1, 0, 4, 1)])
+        self.assertEqual(rects, [pygame.Rect(0, 0, 6, 2)])
+
+    def test__empty_rects_are_dropped(self):
+        self.assertEqual(dirty.merge_rects([None, pygame.Rect(5, 5, 0, 3)]), [])
+
+
+class DirtyRectsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.target = pygame.Surface((16, 8))
+        self.dirty = dirty.DirtyRects(self.target)
+
+    def draw_frame(self, key, sprite_pos) -> bool:
+        full_redraw = self.dirty.restore(key)
+        if full_redraw:
+            self.target.fill('blue')
+            self.dirty.store()
+        self.dirty.add(self.target.fill('red', pygame.Rect(sprite_pos, (2, 2))))
+        return full_redraw
+
+    def test__first_frame_is_a_full_redraw(self):
+        self.assertTrue(self.draw_frame(0, (0, 0)))
+        self.assertIsNone(self.dirty.get_rects())
+
+    def test__previous_areas_are_restored(self):
+        self.draw_frame(0, (0, 0))
+        self.assertFalse(self.draw_frame(0, (4, 0)))
+
+        self.assertEqual(self.target.get_at((0, 0)), pygame.Color('blue'))
+        self.assertEqual(self.target.get_at((4, 0)), pygame.Color('red'))
+        self.assertEqual(self.dirty.get_rects(), [pygame.Rect(0, 0, 2, 2), pygame.Rect(4, 0, 2, 2)])
+
+    def test__changed_key_redraws_everything(self):
+        self.draw_frame(0, (0, 0))
+        self.assertTrue(self.draw_frame(1, (0, 0)))
+        self.assertIsNone(self.dirty.get_rects())
+
+    def test__invalidate(self):
+        self.draw_frame(0, (0, 0))
+        self.dirty.invalidate()
+        self.assertTrue(self.draw_frame(0, (0, 0)))
@@ -158,7 +158,49 @@ class ImageRendererTest(unittest.TestCase):
         self.assertEqual(clip.width, constants.OBJECT_SCALE)
         self.assertEqual(clip.height, constants.OBJECT_SCALE)
 
+    def test__get_platform_surface(self):
+        surface = self.renderer.get_platform_surface(width=3, height=2)
+        self.assertEqual(surface.get_size(), (5 * constants.WORLD_SCALE, 3 * constants.WORLD_SCALE))
+        self.assertIs(self.renderer.get_platform_surface(width=3, height=2), surface)
+
+        # top tiles reach below flat platforms
+        surface = self.renderer.get_platform_surface(width=4, height=0)
+        self.assertEqual(surface.get_size(), (6 * constants.WORLD_SCALE, 2 * constants.WORLD_SCALE))
+        self.assertEqual(len(self.renderer.platform_surfaces), 2)
+
+    def test__outlines_are_cached(self):
+        for _ in range(2):
+            self.renderer.draw_platform(self.phy_ctx.platforms[0], add_outline=True)
+            self.renderer.draw_ladder(self.phy_ctx.ladders[0], add_outline=True)
+            self.renderer.draw_object(self.phy_ctx.objects[0], add_outline=True)
+            self.renderer.draw_projectile(self.phy_ctx.projectiles[0], add_outline=True)
+            self.renderer.draw_actor(self.phy_ctx.actors[0], add_outline=True)
+
+        # tileset, objects and sprite sheet
+        self.assertEqual(len(self.cache.outlined), 3)
+
+    def test__load_fileset_drops_platform_surfaces(self):
+        self.renderer.get_platform_surface(width=3, height=2)
+        self.renderer.load_fileset(0)
+        self.assertEqual(len(self.renderer.platform_surfaces), 0)
+
     # ------------------------------------------------------------------------------------------------------------------
 
+    def test__draw_dynamic_returns_changed_areas(self):
+        changed = self.renderer.draw_dynamic()
+
+        # object, projectile and actor, none of the platforms is hovering
+        self.assertEqual(len(changed), 3)
+        # clipped by the buffer's top right corner
+        actor_rect = self.renderer.get_actor_rect(self.phy_ctx.actors[0])
+        self.assertEqual(changed[2], actor_rect.clip(self.buffer.get_rect()))
+
+    def test__draw_dynamic_skips_elements_out_of_view(self):
+        self.phy_ctx.create_object(x=40, y=3, object_type=constants.ObjectType.FOOD)
+        self.phy_ctx.create_projectile(3, x=-30, y=5.5)
+
+        # the same three elements as above
+        self.assertEqual(len(self.renderer.draw_dynamic()), 3)
+
     def test_draw_does_not_raise(self):
         self.renderer.draw()
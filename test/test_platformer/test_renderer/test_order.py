@@ -0,0 +1,107 @@
+import unittest
+
+from core import constants
+
+from platformer import physics
+from platformer.renderer import order
+
+
+class DrawOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = physics.Context()
+        self.draw_order = order.DrawOrder(order.get_platform_key)
+
+    def test__insert_keeps_elements_sorted(self):
+        low = self.ctx.create_platform(x=0, y=1, width=2)
+        high = self.ctx.create_platform(x=0, y=5, width=2)
+        tall = self.ctx.create_platform(x=4, y=0, width=2, height=3)
+        for platform in [low, high, tall]:
+            self.draw_order.insert(platform)
+
+        self.assertEqual(list(self.draw_order), [high, tall, low])
+
+    def test__equal_keys_keep_insertion_order(self):
+        first = self.ctx.create_platform(x=0, y=2, width=2)
+        second = self.ctx.create_platform(x=5, y=2, width=2)
+        self.draw_order.insert(second)
+        self.draw_order.insert(first)
+
+        self.assertEqual(list(self.draw_order), [second, first])
+
+    def test__update_moves_changed_elements_only(self):
+        first = self.ctx.create_platform(x=0, y=2, width=2)
+        second = self.ctx.create_platform(x=5, y=2, width=2)
+        self.draw_order.rebuild([first, second])
+
+        self.assertFalse(self.draw_order.update(first))
+        first.pos.y = 1
+        self.assertTrue(self.draw_order.update(first))
+        self.assertEqual(list(self.draw_order), [second, first])
+
+        # back at the old height, the insertion number is kept
+        first.pos.y = 2
+        self.draw_order.update(first)
+        self.assertEqual(list(self.draw_order), [first, second])
+
+    def test__remove(self):
+        first = self.ctx.create_platform(x=0, y=2, width=2)
+        second = self.ctx.create_platform(x=5, y=2, width=2)
+        self.draw_order.rebuild([first, second])
+
+        self.assertTrue(self.draw_order.remove(first))
+        self.assertFalse(self.draw_order.remove(first))
+        self.assertEqual(list(self.draw_order), [second])
+        self.assertNotIn(first, self.draw_order)
+
+    def test__get_sort_key(self):
+        low = self.ctx.create_platform(x=0, y=1, width=2)
+        high = self.ctx.create_platform(x=0, y=5, width=2)
+        self.draw_order.rebuild([low, high])
+
+        platforms = [low, high]
+        platforms.sort(key=self.draw_order.get_sort_key)
+        self.assertEqual(platforms, [high, low])
+
+
+class SceneOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = physics.Context()
+        self.low = self.ctx.create_platform(x=0, y=1, width=2)
+        self.high = self.ctx.create_platform(x=0, y=5, width=2)
+        self.scene_order = order.SceneOrder(self.ctx)
+        self.scene_order.sync()
+
+    def test__sync_does_not_sort_the_physics_context(self):
+        self.assertEqual(list(self.scene_order.platforms), [self.high, self.low])
+        self.assertEqual(self.ctx.platforms, [self.low, self.high])
+
+    def test__sync_applies_created_and_removed_elements(self):
+        middle = self.ctx.create_platform(x=4, y=3, width=2)
+        ladder = self.ctx.create_ladder(x=1, y=1, height=4)
+        obj = self.ctx.create_object(x=1, y=2, object_type=constants.ObjectType.FOOD)
+        self.ctx.remove_platform(self.high)
+        self.scene_order.sync()
+
+        self.assertEqual(list(self.scene_order.platforms), [middle, self.low])
+        self.assertEqual(list(self.scene_order.ladders), [ladder])
+        self.assertEqual(list(self.scene_order.objects), [obj])
+
+        self.ctx.remove_objects([obj])
+        self.scene_order.sync()
+        self.assertEqual(len(self.scene_order.objects), 0)
+
+    def test__sync_applies_changed_elements(self):
+        self.low.pos.y = 8
+        self.ctx.mark_changed(self.low)
+        self.scene_order.sync()
+
+        self.assertEqual(list(self.scene_order.platforms), [self.low, self.high])
+
+    def test__sync_rebuilds_after_reset(self):
+        self.ctx.clear_level()
+        platform = self.ctx.create_platform(x=0, y=0, width=1)
+        self.scene_order.sync()
+
+        self.assertEqual(list(self.scene_order.platforms), [platform])
@@ -0,0 +1,40 @@
+import unittest
+import os
+import pygame
+
+from core import constants
+from platformer import particles
+from platformer.renderer import base
+from platformer.renderer import particles as particle_renderer
+
+
+class ParticleRendererTest(unittest.TestCase):
+
+    def setUp(self):
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        pygame.init()
+
+        self.cam = base.Camera((320, 192))
+        self.buffer = pygame.Surface((self.cam.width, self.cam.height))
+        self.ctx = particles.Context(capacity=1000, seed=0)
+        self.renderer = particle_renderer.ParticleRenderer(self.cam, self.buffer, self.ctx)
+
+    def test_draw_does_not_raise(self):
+        # nothing to draw
+        self.renderer.draw()
+
+        # partially offscreen
+        self.ctx.emit(0.0, 0.0, 500, particles.context.DUST_COLOR, speed=5.0, ttl_ms=1000)
+        self.ctx.update(100)
+        self.renderer.draw()
+
+    def test_draw_visible_particle(self):
+        self.ctx.emit(2.0, 3.0, 1, particles.context.SPARK_COLOR, speed=0.0, ttl_ms=1000)
+        changed = self.renderer.draw()
+
+        offset = particle_renderer.PARTICLE_SIZE // 2
+        color = self.buffer.get_at((2 * constants.WORLD_SCALE + offset,
+                                    self.cam.height - 3 * constants.WORLD_SCALE + offset))
+        self.assertEqual(color, pygame.Color(particles.context.PALETTE[particles.context.SPARK_COLOR]))
+        self.assertEqual(changed, [pygame.Rect(2 * constants.WORLD_SCALE, self.cam.height - 3 * constants.WORLD_SCALE,
+                                               particle_renderer.PARTICLE_SIZE, particle_renderer.PARTICLE_SIZE)])
@@ -105,6 +105,24 @@ class ShapeRendererTest(unittest.TestCase):
         self.assertEqual(pos.width, constants.OBJECT_SCALE)
         self.assertEqual(pos.height, constants.OBJECT_SCALE)
 
+    def test__get_visible_region(self):
+        # view covers x in [-1.5, 8.5] and y in [-0.5, 5.5], plus the margin
+        far_platform = self.ctx.create_platform(x=30, y=0, width=3)
+        far_actor = self.ctx.create_actor(3, x=-5, y=2)
+
+        region = self.renderer.get_visible_region()
+        self.assertEqual(len(region.platforms), 4)
+        self.assertNotIn(far_platform, region.platforms)
+        self.assertEqual(len(region.ladders), 1)
+        self.assertEqual(len(region.objects), 1)
+        self.assertEqual(len(region.projectiles), 1)
+        self.assertEqual(region.actors, [self.ctx.actors[0]])
+
+        self.cam.topleft.x = 28
+        region = self.renderer.get_visible_region()
+        self.assertEqual(region.platforms, [far_platform])
+        self.assertNotIn(far_actor, region.actors)
+
     # ------------------------------------------------------------------------------------------------------------------
 
     def test_draw_does_not_raise(self):